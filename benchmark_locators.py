@@ -0,0 +1,157 @@
+"""
+Benchmark de los localizadores registrados por las páginas
+Mide cada localizador (XPath original y forma compilada a CSS) en Chrome/Firefox/Edge
+contra snapshots del DOM guardados en reports/dom_snapshots/*.html
+
+Uso:
+    python benchmark_locators.py --save-snapshot https://nuxqa4.avtest.ink/ --name home
+    python benchmark_locators.py --browsers chrome,firefox --repeat 20
+"""
+import argparse
+import glob
+import importlib
+import json
+import os
+import pathlib
+import pkgutil
+import re
+import statistics
+import time
+from selenium import webdriver
+from utils.config import Config
+from utils.locator_registry import locator_registry
+from utils.logger import logger
+
+# Los scripts de la página no deben ejecutarse al abrir el snapshot desde file://
+SCRIPT_TAG = re.compile(r"<script\b[^>]*>.*?</script\s*>", re.IGNORECASE | re.DOTALL)
+
+
+def load_page_locators():
+    """Importar pages/* para que BasePage.__init_subclass__ registre sus localizadores"""
+    import pages
+    for module in pkgutil.iter_modules(pages.__path__):
+        importlib.import_module(f"pages.{module.name}")
+    return locator_registry.entries
+
+
+def create_driver(browser):
+    """Navegador headless sin espera implícita (se mide el motor de selectores, no el timeout)"""
+    if browser == "chrome":
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        driver = webdriver.Chrome(options=options)
+    elif browser == "firefox":
+        options = webdriver.FirefoxOptions()
+        options.add_argument("-headless")
+        driver = webdriver.Firefox(options=options)
+    elif browser == "edge":
+        options = webdriver.EdgeOptions()
+        options.add_argument("--headless=new")
+        driver = webdriver.Edge(options=options)
+    else:
+        raise ValueError(f"Navegador no soportado: {browser}")
+    driver.implicitly_wait(0)
+    return driver
+
+
+def save_snapshot(url, name, browser="chrome"):
+    """Guardar el DOM renderizado de `url` (sin scripts) como snapshot para el benchmark"""
+    os.makedirs(Config.DOM_SNAPSHOT_DIR, exist_ok=True)
+    driver = create_driver(browser)
+    try:
+        driver.get(url)
+        time.sleep(5)  # Dar tiempo a que la app renderice el contenido dinámico
+        html = SCRIPT_TAG.sub("", driver.execute_script("return document.documentElement.outerHTML"))
+    finally:
+        driver.quit()
+
+    path = os.path.join(Config.DOM_SNAPSHOT_DIR, f"{name}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<!DOCTYPE html>\n" + html)
+    logger.info(f"📄 Snapshot guardado: {path}")
+    return path
+
+
+def time_locator(driver, locator, repeat):
+    """Mediana en ms de find_elements y número de coincidencias"""
+    samples, count = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(driver.find_elements(*locator))
+        samples.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(samples), 2), count
+
+
+def benchmark(browsers, snapshots, repeat):
+    entries = load_page_locators()
+    results = []
+    for browser in browsers:
+        driver = create_driver(browser)
+        try:
+            for snapshot in snapshots:
+                driver.get(pathlib.Path(snapshot).resolve().as_uri())
+                logger.info(f"⏱️  {browser}: {len(entries)} localizadores en {os.path.basename(snapshot)}")
+                for key, entry in entries.items():
+                    result = {"browser": browser, "snapshot": os.path.basename(snapshot), "locator": key,
+                              "original": list(entry["original"])}
+                    result["original_ms"], result["matches"] = time_locator(driver, entry["original"], repeat)
+                    if entry["compiled"] != entry["original"]:
+                        result["compiled"] = list(entry["compiled"])
+                        result["compiled_ms"], compiled_matches = time_locator(driver, entry["compiled"], repeat)
+                        # Una traducción correcta encuentra exactamente los mismos nodos
+                        result["same_matches"] = compiled_matches == result["matches"]
+                    results.append(result)
+        finally:
+            driver.quit()
+    return results
+
+
+def report(results, top):
+    """Localizadores más lentos por navegador y traducciones con resultados distintos"""
+    for browser in sorted({r["browser"] for r in results}):
+        rows = sorted((r for r in results if r["browser"] == browser),
+                      key=lambda r: r["original_ms"], reverse=True)
+        print(f"\n{'=' * 100}\n{browser.upper()}: localizadores más lentos\n{'=' * 100}")
+        print(f"{'ms':>8} {'css ms':>8} {'matches':>7}  localizador")
+        for r in rows[:top]:
+            compiled = f"{r['compiled_ms']:>8}" if "compiled_ms" in r else f"{'-':>8}"
+            print(f"{r['original_ms']:>8} {compiled} {r['matches']:>7}  {r['locator']} ({r['snapshot']})")
+
+    mismatches = [r for r in results if r.get("same_matches") is False]
+    for r in mismatches:
+        logger.warning(f"⚠️  Traducción con resultados distintos: {r['locator']} en {r['browser']} "
+                       f"({r['original'][1]} → {r['compiled'][1]})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de localizadores por navegador")
+    parser.add_argument("--browsers", default="chrome,firefox,edge",
+                        help="Navegadores separados por comas")
+    parser.add_argument("--snapshots", default=os.path.join(Config.DOM_SNAPSHOT_DIR, "*.html"),
+                        help="Glob de snapshots HTML")
+    parser.add_argument("--repeat", type=int, default=10, help="Repeticiones por localizador")
+    parser.add_argument("--top", type=int, default=20, help="Localizadores lentos a listar")
+    parser.add_argument("--save-snapshot", metavar="URL", help="Guardar snapshot de URL y salir")
+    parser.add_argument("--name", default="page", help="Nombre del snapshot a guardar")
+    args = parser.parse_args()
+
+    if args.save_snapshot:
+        save_snapshot(args.save_snapshot, args.name, args.browsers.split(",")[0])
+        return
+
+    snapshots = sorted(glob.glob(args.snapshots))
+    if not snapshots:
+        parser.error(f"No hay snapshots en {args.snapshots} (usar --save-snapshot URL)")
+
+    results = benchmark([b.strip() for b in args.browsers.split(",")], snapshots, args.repeat)
+    report(results, args.top)
+
+    output = os.path.join(Config.REPORT_DIR, "locator_benchmark.json")
+    os.makedirs(Config.REPORT_DIR, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    logger.info(f"📊 Resultados guardados en {output}")
+
+
+if __name__ == "__main__":
+    main()
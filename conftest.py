@@ -1,6 +1,8 @@
 import pytest
 import os
 import sys
+import time
+import uuid
 import logging
 from datetime import datetime
 from selenium import webdriver
@@ -10,6 +12,7 @@ from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.edge.service import Service as EdgeService
+from selenium.common.exceptions import WebDriverException
 
 # Configurar logging
 logging.basicConfig(
@@ -22,7 +25,44 @@ logger = logging.getLogger(__name__)
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from utils.config import Config
 from utils.video_recorder import VideoRecorder
-from utils.screenshot_manager import ScreenshotManager
+from utils.screenshot_manager import ScreenshotManager, screenshot_writer
+from utils.evidence_policy import EvidencePolicy, evidence_policy
+from utils.screenshot_dedupe import ScreenshotHistory
+from utils.screenshot_encoding import FORMATS, screenshot_encoding
+from utils.driver_pool import DriverPool
+from utils.driver_resolver import DriverResolver
+from utils.network_profile import NetworkProfile
+from utils.adaptive_timeouts import AdaptiveTimeouts
+from utils.app_sync import AppSync
+from utils.network_idle import NetworkIdleMonitor
+from utils.browser_profile import ProfileTemplate
+from utils.session_state import SessionStateCache
+from utils.wait_profiler import WaitProfiler
+from utils.session_watchdog import (
+    SessionHungError, SessionWatchdog, register_driver_process, unregister_driver_process,
+    reap_orphaned_drivers
+)
+
+# Resolución de drivers compartida por toda la sesión (una por proceso/worker)
+driver_resolver = DriverResolver()
+
+# Perfil de red de los navegadores (--network-profile)
+network_profile = NetworkProfile()
+
+# Sincronización con Angular para las acciones de las páginas (--sync-mode)
+app_sync = AppSync()
+
+# Perfil plantilla con caché HTTP precalentada (--warm-profile)
+profile_template = ProfileTemplate()
+
+# Estado de login compartido entre tests y workers (fixture logged_in)
+session_state = SessionStateCache()
+
+# Contabilidad de sleeps y esperas por step (--profile-waits)
+wait_profiler = WaitProfiler()
+
+# Historial de duración de las esperas con nombre y timeouts derivados (--adaptive-timeouts)
+adaptive_timeouts = AdaptiveTimeouts()
 
 # ==================== FIXTURES PARA MULTI-NAVEGADOR ====================
 
@@ -34,10 +74,102 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "multi_language: Tests que prueban múltiples idiomas"
     )
+    driver_resolver.offline = config.getoption("--offline-drivers")
+    network_profile.mode = config.getoption("--network-profile")
+    network_profile.block_images = config.getoption("--block-images")
+    app_sync.mode = config.getoption("--sync-mode")
+    NetworkIdleMonitor.performance_logs = config.getoption("--network-idle-logs")
+    adaptive_timeouts.mode = config.getoption("--adaptive-timeouts")
+    evidence_policy.level = config.getoption("--evidence")
+    screenshot_encoding.format = config.getoption("--screenshot-format")
+    screenshot_encoding.quality = config.getoption("--screenshot-quality")
+    screenshot_encoding.scale = config.getoption("--screenshot-scale")
+    screenshot_encoding.grayscale = config.getoption("--screenshot-grayscale")
+    
+    # Todos los workers de xdist comparten testrunuid: la plantilla se calienta una vez por ejecución
+    workerinput = getattr(config, "workerinput", None)
+    profile_template.enabled = config.getoption("--warm-profile")
+    profile_template.run_id = workerinput["testrunuid"] if workerinput else uuid.uuid4().hex
+    
+    if config.getoption("--profile-waits"):
+        wait_profiler.install()
+    
+    # Validar la matriz de navegadores antes de colectar
+    selected_browsers(config)
+    if (config.getoption("--browser-dist") == "pinned" and workerinput is None
+            and config.getoption("numprocesses", None)):
+        # Los grupos xdist_group solo se respetan con --dist=loadgroup ("load" es el de -n por defecto)
+        dist = config.getoption("dist", "no")
+        if dist in ("no", "load"):
+            config.option.dist = "loadgroup"
+            logger.info("📌 --browser-dist=pinned: usando --dist=loadgroup")
+        elif dist != "loadgroup":
+            raise pytest.UsageError(f"--browser-dist=pinned requiere --dist=loadgroup (recibido --dist={dist})")
+
+def selected_browsers(config):
+    """Navegadores pedidos con --browser (lista separada por comas o 'all')"""
+    value = config.getoption("--browser").strip().lower()
+    if value == "all":
+        return list(Config.BROWSERS)
+    
+    browsers = []
+    for name in value.split(","):
+        name = name.strip()
+        if name and name not in browsers:
+            browsers.append(name)
+    
+    invalid = [b for b in browsers if b not in Config.BROWSERS]
+    if invalid or not browsers:
+        raise pytest.UsageError(
+            f"--browser inválido: {value}. Opciones: {', '.join(Config.BROWSERS)} o 'all'"
+        )
+    return browsers
 
-def get_chrome_options(headless=False):
+def pytest_generate_tests(metafunc):
+    """Parametrizar la fixture driver solo con los navegadores seleccionados"""
+    if "driver" in metafunc.fixturenames:
+        metafunc.parametrize("driver", selected_browsers(metafunc.config), indirect=True)
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(session, config, items):
+    """Agrupar tests por navegador y, en modo pinned, fijar cada navegador a sus workers"""
+    browsers = selected_browsers(config)
+    if len(browsers) < 2:
+        return
+    
+    # Orden estable por navegador: el worker no alterna binarios y el pool se reutiliza
+    def browser_of(item):
+        callspec = getattr(item, "callspec", None)
+        return callspec.params.get("driver") if callspec else None
+    
+    items.sort(key=lambda item: browsers.index(browser_of(item)) if browser_of(item) in browsers else -1)
+    
+    if config.getoption("--browser-dist") != "pinned":
+        return
+    
+    # Cada grupo xdist_group se ejecuta completo en un único worker (--dist=loadgroup);
+    # se reparten los workers disponibles entre los navegadores
+    workerinput = getattr(config, "workerinput", None)
+    workers = workerinput["workercount"] if workerinput else 1
+    slots = max(1, workers // len(browsers))
+    counters = {}
+    for item in items:
+        browser = browser_of(item)
+        if browser is None:
+            continue
+        slot = counters.get(browser, 0) % slots
+        counters[browser] = counters.get(browser, 0) + 1
+        item.add_marker(pytest.mark.xdist_group(f"{browser}-{slot}"))
+
+def get_chrome_options(headless=False, page_load_strategy=Config.PAGE_LOAD_STRATEGY,
+                       profile_dir=None):
     """Opciones optimizadas para Chrome"""
     options = ChromeOptions()
+    options.page_load_strategy = page_load_strategy
+    
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        options.add_argument(f"--disk-cache-dir={os.path.join(profile_dir, 'cache')}")
     
     # Configuraciones para velocidad
     options.add_argument("--no-sandbox")
@@ -62,16 +194,29 @@ def get_chrome_options(headless=False):
         "profile.password_manager_enabled": False,
         "profile.default_content_setting_values.images": 1,
     }
+    network_profile.apply_chrome_prefs(prefs)
     options.add_experimental_option("prefs", prefs)
     
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option('useAutomationExtension', False)
     
+    # Eventos Network.* para esperas de red ociosa
+    if NetworkIdleMonitor.performance_logs:
+        NetworkIdleMonitor.enable_logging(options)
+    
     return options
 
-def get_firefox_options(headless=False):
+def get_firefox_options(headless=False, page_load_strategy=Config.PAGE_LOAD_STRATEGY,
+                        profile_dir=None):
     """Opciones optimizadas para Firefox"""
     options = FirefoxOptions()
+    options.page_load_strategy = page_load_strategy
+    
+    if profile_dir:
+        # -profile usa el directorio en sitio (geckodriver no lo copia a un temporal)
+        options.add_argument("-profile")
+        options.add_argument(profile_dir)
+        options.set_preference("browser.cache.disk.parent_directory", profile_dir)
     
     if headless:
         options.add_argument("--headless")
@@ -82,11 +227,19 @@ def get_firefox_options(headless=False):
     options.set_preference("browser.download.folderList", 2)
     options.set_preference("browser.download.manager.showWhenStarting", False)
     
+    network_profile.apply_firefox_options(options)
+    
     return options
 
-def get_edge_options(headless=False):
+def get_edge_options(headless=False, page_load_strategy=Config.PAGE_LOAD_STRATEGY,
+                     profile_dir=None):
     """Opciones optimizadas para Edge"""
     options = EdgeOptions()
+    options.page_load_strategy = page_load_strategy
+    
+    if profile_dir:
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        options.add_argument(f"--disk-cache-dir={os.path.join(profile_dir, 'cache')}")
     
     if headless:
         options.add_argument("--headless")
@@ -100,46 +253,44 @@ def get_edge_options(headless=False):
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option('useAutomationExtension', False)
     
+    if NetworkIdleMonitor.performance_logs:
+        NetworkIdleMonitor.enable_logging(options, vendor="ms")
+    
     return options
 
-def setup_driver(browser_name, headless):
+def setup_driver(browser_name, headless, page_load_strategy=Config.PAGE_LOAD_STRATEGY,
+                 profile_dir=None):
     """Configurar driver según el navegador"""
-    logger.info(f"Configurando driver para {browser_name.upper()} (headless={headless})")
+    logger.info(f"Configurando driver para {browser_name.upper()} "
+                f"(headless={headless}, page_load_strategy={page_load_strategy})")
     
     try:
+        # Clon del perfil plantilla con la caché HTTP ya caliente
+        use_template = profile_template.enabled and profile_dir is None
+        if use_template:
+            profile_dir = profile_template.prepare(
+                browser_name.lower(),
+                lambda template_dir: setup_driver(browser_name, headless,
+                                                  page_load_strategy, template_dir)
+            )
+        
+        # Ruta resuelta una vez por sesión; None = driver de Selenium/PATH
+        driver_path = driver_resolver.resolve(browser_name)
+        
         if browser_name.lower() == "chrome":
-            options = get_chrome_options(headless)
-            
-            # Usar webdriver-manager para manejo automático
-            try:
-                from webdriver_manager.chrome import ChromeDriverManager
-                service = ChromeService(ChromeDriverManager().install())
-                driver = webdriver.Chrome(service=service, options=options)
-            except Exception as e:
-                logger.warning(f"WebDriver Manager falló: {e}. Usando driver local.")
-                driver = webdriver.Chrome(options=options)
+            options = get_chrome_options(headless, page_load_strategy, profile_dir)
+            service = ChromeService(driver_path) if driver_path else ChromeService()
+            driver = webdriver.Chrome(service=service, options=options)
         
         elif browser_name.lower() == "firefox":
-            options = get_firefox_options(headless)
-            
-            try:
-                from webdriver_manager.firefox import GeckoDriverManager
-                service = FirefoxService(GeckoDriverManager().install())
-                driver = webdriver.Firefox(service=service, options=options)
-            except Exception as e:
-                logger.warning(f"WebDriver Manager falló: {e}. Usando driver local.")
-                driver = webdriver.Firefox(options=options)
+            options = get_firefox_options(headless, page_load_strategy, profile_dir)
+            service = FirefoxService(driver_path) if driver_path else FirefoxService()
+            driver = webdriver.Firefox(service=service, options=options)
         
         elif browser_name.lower() == "edge":
-            options = get_edge_options(headless)
-            
-            try:
-                from webdriver_manager.microsoft import EdgeChromiumDriverManager
-                service = EdgeService(EdgeChromiumDriverManager().install())
-                driver = webdriver.Edge(service=service, options=options)
-            except Exception as e:
-                logger.warning(f"WebDriver Manager falló: {e}. Usando driver local.")
-                driver = webdriver.Edge(options=options)
+            options = get_edge_options(headless, page_load_strategy, profile_dir)
+            service = EdgeService(driver_path) if driver_path else EdgeService()
+            driver = webdriver.Edge(service=service, options=options)
         
         else:
             raise ValueError(f"Navegador no soportado: {browser_name}")
@@ -149,6 +300,17 @@ def setup_driver(browser_name, headless):
         driver.set_script_timeout(20)
         driver.implicitly_wait(5)  # Timeout corto para mayor velocidad
         
+        # Bloqueo de recursos y medición de red por página
+        network_profile.attach(driver)
+        app_sync.attach(driver)
+        adaptive_timeouts.attach(driver)
+        
+        # Registrar el proceso del driver para recoger huérfanos de workers caídos
+        register_driver_process(driver)
+        
+        if use_template:
+            driver.profile_template = profile_template
+        
         logger.info(f"Driver {browser_name.upper()} configurado exitosamente")
         return driver
         
@@ -156,21 +318,59 @@ def setup_driver(browser_name, headless):
         logger.error(f"Error configurando driver {browser_name}: {e}")
         raise
 
-@pytest.fixture(scope="function", params=["chrome", "firefox", "edge"])
-def driver(request):
-    """Fixture principal para multi-navegador"""
+@pytest.fixture(scope="session")
+def driver_pool(request):
+    """Pool de sesiones calientes por worker (con --reuse-driver o --prefetch-driver)"""
+    config = request.config
+    if not (config.getoption("--reuse-driver") or config.getoption("--prefetch-driver")):
+        yield None
+        return
+    
+    headless = config.getoption("--headless")
+    page_load_strategy = config.getoption("--page-load-strategy")
+    pool = DriverPool(
+        lambda browser_name: setup_driver(browser_name, headless, page_load_strategy),
+        max_uses=config.getoption("--driver-max-uses"),
+        max_idle=config.getoption("--max-idle-browsers")
+    )
+    
+    yield pool
+    
+    pool.shutdown()
+
+@pytest.fixture(scope="function")
+def driver(request, driver_pool):
+    """Fixture principal para multi-navegador (parametrizada en pytest_generate_tests)"""
     browser_name = request.param
     headless = request.config.getoption("--headless")
     
-    # Iniciar grabación de video
-    video_recorder = VideoRecorder()
+    # Configurar driver (del pool si está activo)
+    if driver_pool:
+        driver = driver_pool.acquire(browser_name)
+        
+        # Pre-lanzar el navegador del siguiente test si no podrá reutilizar este
+        next_browser = getattr(request.node, "next_browser", None)
+        if request.config.getoption("--prefetch-driver") and next_browser and (
+                next_browser != browser_name or driver_pool.will_recycle(driver)):
+            driver_pool.prefetch(next_browser)
+    else:
+        driver = setup_driver(browser_name, headless,
+                              request.config.getoption("--page-load-strategy"))
+    
+    # Iniciar grabación de video (frames del propio navegador, también en headless)
+    video_recorder = VideoRecorder(driver, mode=request.config.getoption("--video"))
     test_name = f"{request.node.name}_{browser_name}"
     video_recorder.start_recording(test_name)
     
-    # Configurar driver
-    driver = setup_driver(browser_name, headless)
+    # Vigilar la sesión para detectar cuelgues del navegador/driver
+    watchdog = None
+    if request.config.getoption("--session-watchdog"):
+        watchdog = SessionWatchdog(driver).start()
+        request.node.session_watchdog = watchdog
     
-    # Configurar screenshot manager
+    # Configurar screenshot manager (deduplicación por test: el driver puede venir del pool)
+    if Config.SCREENSHOT_DEDUPE:
+        driver.screenshot_history = ScreenshotHistory()
     screenshot_manager = ScreenshotManager(driver)
     
     # Pasar contexto al test
@@ -181,18 +381,65 @@ def driver(request):
     
     yield driver
     
-    # Finalizar grabación y adjuntar a Allure
-    video_path = video_recorder.stop_recording()
+    # Screenshots del test escritos a disco antes de reutilizar o cerrar el driver
+    screenshot_writer.flush()
+    history = getattr(driver, "screenshot_history", None)
+    if history and (history.skipped or history.saved):
+        logger.info(f"📸 Screenshots deduplicados: {history.skipped} omitidos, {history.saved} recortados")
+    
+    # Finalizar grabación y adjuntar a Allure (por ruta, sin cargar el MP4 en memoria)
+    video_path = video_recorder.stop_recording(keep=getattr(request.node, "test_failed", False))
     if video_path and os.path.exists(video_path):
         import allure
-        with open(video_path, 'rb') as video_file:
-            allure.attach(video_file.read(), 
-                         name=f"video_{test_name}", 
-                         attachment_type=allure.attachment_type.MP4)
-    
-    # Cerrar driver
-    driver.quit()
-    logger.info(f"Driver {browser_name.upper()} cerrado")
+        allure.attach.file(video_path,
+                           name=f"video_{test_name}",
+                           attachment_type=allure.attachment_type.MP4)
+    
+    if watchdog:
+        watchdog.stop()
+    hung = bool(watchdog and watchdog.tripped)
+    
+    # Devolver al pool o cerrar driver
+    if driver_pool:
+        healthy = not (hung or getattr(request.node, "webdriver_error", False))
+        driver_pool.release(driver, browser_name, healthy=healthy)
+    else:
+        try:
+            driver.quit()
+        except Exception as e:
+            if not hung:
+                raise
+            logger.debug(f"quit() sobre sesión colgada: {e}")
+        finally:
+            unregister_driver_process(driver)
+        logger.info(f"Driver {browser_name.upper()} cerrado")
+
+@pytest.fixture(scope="function", autouse=True)
+def wait_profile(request):
+    """Perfil de esperas del test (setup del driver incluido) con --profile-waits"""
+    if not wait_profiler.enabled:
+        yield None
+        return
+    
+    wait_profiler.start_test(request.node.nodeid)
+    yield wait_profiler
+    wait_profiler.finish_test()
+
+@pytest.fixture(scope="function")
+def logged_in(driver):
+    """Sesión autenticada en LOGIN_URL: restaura el login guardado o lo hace por UI una vez"""
+    from pages.home_page import HomePage
+    home_page = HomePage(driver)
+    
+    assert session_state.ensure_logged_in(
+        driver,
+        Config.LOGIN_URL,
+        Config.TEST_USERNAME,
+        login=lambda: home_page.login(Config.TEST_USERNAME, Config.TEST_PASSWORD),
+        is_logged_in=lambda d: home_page.is_logged_in()
+    ), "No se pudo realizar login"
+    
+    yield driver
 
 @pytest.fixture(scope="function")
 def setup_test(request):
@@ -214,17 +461,93 @@ def setup_test(request):
 def pytest_addoption(parser):
     """Agregar opciones de línea de comandos"""
     parser.addoption("--browser", action="store", default="chrome",
-                     help="Navegador para pruebas: chrome, firefox, edge")
+                     help="Navegador(es) para pruebas: chrome, firefox, edge, "
+                          "lista separada por comas (chrome,firefox) o 'all'")
+    parser.addoption("--browser-dist", action="store", default="load",
+                     choices=["load", "pinned"],
+                     help="Con xdist: 'pinned' fija cada navegador a sus propios workers "
+                          "(sustituye --dist=load por loadgroup; otros modos de --dist son un error)")
     parser.addoption("--headless", action="store_true", default=False,
                      help="Ejecutar en modo headless")
     parser.addoption("--url", action="store", default=Config.BASE_URL_4,
                      help=f"URL base (default: {Config.BASE_URL_4})")
+    parser.addoption("--page-load-strategy", action="store", default=Config.PAGE_LOAD_STRATEGY,
+                     choices=["normal", "eager", "none"],
+                     help="eager/none: la navegación termina cuando la página cumple "
+                          "su predicado de 'lista' en lugar de esperar todos los recursos")
+    parser.addoption("--session-watchdog", action="store_true", default=False,
+                     help="Detectar sesiones colgadas y matar navegador+driver (falla con "
+                          "SessionHungError; combinar con --reruns 1 --only-rerun SessionHungError)")
+    parser.addoption("--warm-profile", action="store_true", default=False,
+                     help="Usar un clon de un perfil plantilla con caché HTTP precalentada "
+                          "(Config.WARM_PROFILE_URLS, una vez por ejecución)")
     parser.addoption("--slow", action="store_true", default=False,
                      help="Ejecutar con timeouts más largos")
-    parser.addoption("--record-video", action="store_true", default=True,
-                     help="Grabar video de las ejecuciones")
     parser.addoption("--clean-reports", action="store_true", default=False,
                      help="Limpiar reportes anteriores")
+    parser.addoption("--reuse-driver", action="store_true", default=False,
+                     help="Reutilizar sesiones del navegador entre tests (pool por worker)")
+    parser.addoption("--driver-max-uses", action="store", type=int,
+                     default=Config.DRIVER_POOL_MAX_USES,
+                     help="Tests por sesión antes de reciclarla (con --reuse-driver)")
+    parser.addoption("--offline-drivers", action="store_true", default=False,
+                     help="Resolver drivers solo desde drivers/ y PATH (sin webdriver-manager)")
+    parser.addoption("--prefetch-driver", action="store_true", default=False,
+                     help="Lanzar en segundo plano el navegador del siguiente test (activa el pool)")
+    parser.addoption("--max-idle-browsers", action="store", type=int,
+                     default=Config.DRIVER_POOL_MAX_IDLE,
+                     help="Máximo de navegadores ociosos/pre-lanzados por worker")
+    parser.addoption("--network-profile", action="store", default="off",
+                     choices=NetworkProfile.MODES,
+                     help="off | baseline (mide bytes/requests por página) | "
+                          "lean (bloquea analítica, tag managers, chats y fuentes y mide el ahorro)")
+    parser.addoption("--block-images", action="store_true",
+                     default=Config.LEAN_NETWORK_BLOCK_IMAGES,
+                     help="Con --network-profile=lean, bloquear también imágenes")
+    parser.addoption("--network-idle-logs", action="store_true", default=Config.PERFORMANCE_LOGS,
+                     help="Esperas de red ociosa con performance logs de Chrome/Edge (más precisas; "
+                          "sin la opción se usa Resource Timing y el navegador no registra eventos Network)")
+    parser.addoption("--sync-mode", action="store", default="dom", choices=AppSync.MODES,
+                     help="dom (esperar a que el DOM deje de mutar) | angular (whenStable de Angular "
+                          "+ XHR/fetch pendientes; DOM como respaldo en páginas no Angular)")
+    parser.addoption("--fresh-login", action="store_true", default=False,
+                     help="Ignorar el estado de login guardado y autenticar de nuevo por UI")
+    parser.addoption("--profile-waits", action="store_true", default=False,
+                     help="Medir sleeps y esperas explícitas por step (reports/waits/<test>.json)")
+    parser.addoption("--adaptive-timeouts", action="store", default="record",
+                     choices=AdaptiveTimeouts.MODES,
+                     help="off | record (guardar la duración de las esperas con nombre) | enforce "
+                          "(además acortar cada timeout a p99 × factor de su historial)")
+    parser.addoption("--evidence", action="store", default=Config.EVIDENCE_LEVEL,
+                     choices=EvidencePolicy.LEVELS,
+                     help="off | on-failure (solo evidencia de fallos) | per-step (además checkpoints) "
+                          "| verbose (además screenshot previo a cada acción, resaltado y pausas)")
+    parser.addoption("--video", action="store", default=Config.VIDEO_MODE,
+                     choices=VideoRecorder.MODES,
+                     help="off | on-failure (últimos segundos en memoria, MP4 solo si el test falla) | always")
+    parser.addoption("--screenshot-format", action="store", default=Config.SCREENSHOT_FORMAT,
+                     choices=list(FORMATS),
+                     help="Formato de los screenshots que no son de fallo (estos siempre en PNG original)")
+    parser.addoption("--screenshot-quality", action="store", type=int, default=Config.SCREENSHOT_QUALITY,
+                     help="Calidad JPEG/WebP de los screenshots (1-100)")
+    parser.addoption("--screenshot-scale", action="store", type=float, default=Config.SCREENSHOT_SCALE,
+                     help="Factor de reducción de los screenshots (ej: 0.5)")
+    parser.addoption("--screenshot-grayscale", action="store_true", default=Config.SCREENSHOT_GRAYSCALE,
+                     help="Guardar los screenshots que no son de fallo en escala de grises")
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Anotar qué navegador pedirá el siguiente test (para --prefetch-driver)"""
+    callspec = getattr(nextitem, "callspec", None)
+    item.next_browser = callspec.params.get("driver") if callspec else None
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Convertir el fallo de un test con sesión colgada en un SessionHungError claro"""
+    outcome = yield
+    watchdog = getattr(item, "session_watchdog", None)
+    if watchdog and watchdog.tripped and outcome.excinfo is not None:
+        outcome.force_exception(SessionHungError(watchdog.tripped))
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -232,7 +555,20 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     report = outcome.get_result()
     
-    if report.when == "call" and report.failed:
+    # pytest-rerunfailures reutiliza el item: las señales se reinician en el setup de cada intento
+    if report.when == "setup":
+        item.webdriver_error = False
+        item.test_failed = False
+    
+    # Señal de sesión no saludable para el pool de drivers
+    if call.excinfo is not None and call.excinfo.errisinstance(WebDriverException):
+        item.webdriver_error = True
+    
+    # El video on-failure solo se codifica si falló el setup o el test
+    if report.failed:
+        item.test_failed = True
+    
+    if report.when == "call" and report.failed and evidence_policy.allows("failure"):
         # Verificar si hay driver disponible
         if hasattr(item.cls, 'driver') and item.cls.driver:
             try:
@@ -240,14 +576,14 @@ def pytest_runtest_makereport(item, call):
                 screenshot_name = f"{item.name}_{timestamp}.png"
                 screenshot_path = os.path.join("screenshots", screenshot_name)
                 
-                item.cls.driver.save_screenshot(screenshot_path)
+                data = item.cls.driver.get_screenshot_as_png()
+                screenshot_writer.submit(screenshot_path, data)
                 logger.info(f"Screenshot de fallo guardado: {screenshot_path}")
                 
                 # Adjuntar a reporte Allure
                 import allure
-                with open(screenshot_path, 'rb') as f:
-                    allure.attach(f.read(), name="screenshot_on_failure",
-                                 attachment_type=allure.attachment_type.PNG)
+                allure.attach(data, name="screenshot_on_failure",
+                             attachment_type=allure.attachment_type.PNG)
                     
             except Exception as e:
                 logger.error(f"Error tomando screenshot: {e}")
@@ -258,6 +594,15 @@ def pytest_sessionstart(session):
     logger.info("INICIANDO SESIÓN DE PRUEBAS AUTOMATIZADAS")
     logger.info("=" * 60)
     
+    # Drivers que dejaron workers caídos en ejecuciones anteriores (solo el controlador)
+    if not hasattr(session.config, "workerinput"):
+        reap_orphaned_drivers()
+        
+        # Forzar login por UI descartando el estado guardado
+        if session.config.getoption("--fresh-login"):
+            import shutil
+            shutil.rmtree(Config.SESSION_STATE_DIR, ignore_errors=True)
+    
     # Limpiar reportes antiguos si se solicita
     if session.config.getoption("--clean-reports"):
         import shutil
@@ -273,6 +618,23 @@ def pytest_sessionfinish(session, exitstatus):
     logger.info(f"Exit status: {exitstatus}")
     logger.info("=" * 60)
     
+    network_profile.save()
+    screenshot_writer.flush()
+    
+    if wait_profiler.enabled:
+        wait_profiler.log_session_summary()
+        wait_profiler.uninstall()
+    
+    adaptive_timeouts.flush()
+    
+    if profile_template.enabled:
+        profile_template.report()
+        profile_template.cleanup()
+    
+    # Drivers de workers que cayeron durante esta ejecución
+    if not hasattr(session.config, "workerinput"):
+        reap_orphaned_drivers()
+    
     # Generar reporte Allure si hay resultados
     allure_dir = "reports/allure-results"
     if os.path.exists(allure_dir) and os.listdir(allure_dir):
@@ -1,43 +1,142 @@
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 import allure
+import os
 import time
+from datetime import datetime
 from utils.action_chains_helper import ActionChainsHelper
 from utils.screenshot_manager import ScreenshotManager
+from utils.evidence_policy import evidence_policy
+from utils.network_idle import NetworkIdleMonitor
+from utils.locator_registry import locator_registry
+from utils.config import Config
 from utils.logger import logger
 
 class BasePage:
     """Clase base con métodos comunes para todas las páginas"""
     
+    # Predicado JS de "página lista" (page load strategy eager/none).
+    # Cada página declara el suyo: botón principal interactuable, tarifas renderizadas, etc.
+    READY_SCRIPT = "return document.readyState !== 'loading';"
+    
+    # Detector de "DOM asentado": MutationObserver sobre `root` + scroll por frame (rAF).
+    # Responde cuando no hubo cambios durante quiet_ms o al llegar a timeout_ms.
+    DOM_SETTLED_SCRIPT = """
+        var timeoutMs = arguments[0], quietMs = arguments[1], root = arguments[2];
+        var done = arguments[arguments.length - 1];
+        if (typeof root === 'string') { root = document.querySelector(root); }
+        root = root || document.documentElement;
+        
+        var start = performance.now(), last = start, finished = false;
+        var scroll = window.scrollX + ',' + window.scrollY;
+        var observer = new MutationObserver(function() { last = performance.now(); });
+        observer.observe(root, {childList: true, subtree: true, attributes: true, characterData: true});
+        
+        function tick() {
+            if (finished) { return; }
+            var now = performance.now();
+            var position = window.scrollX + ',' + window.scrollY;
+            if (position !== scroll) { scroll = position; last = now; }
+            if (now - last >= quietMs || now - start >= timeoutMs) {
+                finished = true;
+                observer.disconnect();
+                clearInterval(fallback);
+                done({settled: now - last >= quietMs, elapsed: Math.round(now - start)});
+                return;
+            }
+            requestAnimationFrame(tick);
+        }
+        // rAF se congela en pestañas ocultas: respaldo con temporizador
+        var fallback = setInterval(tick, 100);
+        requestAnimationFrame(tick);
+    """
+    
+    # Resuelve una lista ordenada de localizadores (By, valor) en una sola llamada.
+    # mode 'first': primer match (opcionalmente visible); 'all': todos los matches con visibilidad.
+    LOCATE_SCRIPT = """
+        var locators = arguments[0], mode = arguments[1], visibleOnly = arguments[2];
+        
+        function query(by, value) {
+            switch (by) {
+                case 'xpath':
+                    var snapshot = document.evaluate(value, document, null,
+                        XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                    var nodes = [];
+                    for (var i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+                    return nodes;
+                case 'css selector': return Array.from(document.querySelectorAll(value));
+                case 'id': return Array.from(document.querySelectorAll('[id="' + CSS.escape(value) + '"]'));
+                case 'name': return Array.from(document.getElementsByName(value));
+                case 'class name': return Array.from(document.getElementsByClassName(value));
+                case 'tag name': return Array.from(document.getElementsByTagName(value));
+                case 'link text':
+                case 'partial link text':
+                    return Array.from(document.getElementsByTagName('a')).filter(function(a) {
+                        var text = (a.innerText || '').trim();
+                        return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+                    });
+            }
+            return [];
+        }
+        
+        function isVisible(el) {
+            if (!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) { return false; }
+            var style = window.getComputedStyle(el);
+            return style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0';
+        }
+        
+        var matches = [];
+        for (var i = 0; i < locators.length; i++) {
+            var nodes;
+            try { nodes = query(locators[i][0], locators[i][1]); } catch (e) { continue; }
+            for (var j = 0; j < nodes.length; j++) {
+                var visible = isVisible(nodes[j]);
+                if (visibleOnly && !visible) { continue; }
+                if (mode === 'first') { return [{index: i, element: nodes[j], visible: visible}]; }
+                matches.push({index: i, element: nodes[j], visible: visible});
+            }
+        }
+        return matches;
+    """
+    
+    def __init_subclass__(cls, **kwargs):
+        # Los localizadores de cada página se registran (y los XPath con equivalente se compilan a CSS)
+        super().__init_subclass__(**kwargs)
+        locator_registry.register_class(cls)
+    
     def __init__(self, driver):
         self.driver = driver
         self.wait = WebDriverWait(driver, 10)
-        self.actions = ActionChainsHelper(driver)
+        self.actions = ActionChainsHelper(driver, self)
         self.screenshots = ScreenshotManager(driver)
     
     # ==================== MÉTODOS COMUNES ====================
     
     @allure.step("Esperar elemento: {element_name}")
-    def wait_for_element(self, locator, element_name="elemento", timeout=10):
-        """Esperar a que un elemento esté presente"""
+    def wait_for_element(self, locator, element_name="elemento", timeout=10, evidence=True):
+        """Esperar a que un elemento esté presente (screenshot al agotar el timeout si `evidence`).
+        
+        Para comprobar si algo existe o dentro de un bucle de sondeo, usar probe().
+        """
         try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.presence_of_element_located(locator)
+            element = self.wait_for_condition(
+                element_name, EC.presence_of_element_located(locator), timeout
             )
             logger.info(f"✅ Elemento encontrado: {element_name}")
             return element
         except TimeoutException:
             logger.error(f"❌ Timeout esperando elemento: {element_name}")
-            self.screenshots.take_screenshot(f"timeout_{element_name}")
+            if evidence:
+                self.screenshots.take_screenshot(f"timeout_{element_name}", kind="failure")
             return None
     
     @allure.step("Esperar elemento clickeable: {element_name}")
     def wait_for_clickable(self, locator, element_name="elemento", timeout=10):
         """Esperar a que un elemento sea clickeable"""
         try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable(locator)
+            element = self.wait_for_condition(
+                f"clickeable {element_name}", EC.element_to_be_clickable(locator), timeout
             )
             logger.info(f"✅ Elemento clickeable: {element_name}")
             return element
@@ -47,17 +146,19 @@ class BasePage:
     
     @allure.step("Click en: {element_name}")
     def click(self, locator, element_name="elemento"):
-        """Click con evidencias"""
-        self.screenshots.take_screenshot(f"before_click_{element_name}")
+        """Click con evidencias (según el nivel de --evidence)"""
+        self.screenshots.take_screenshot(f"before_click_{element_name}", kind="detail")
         success = self.actions.click_with_evidence(locator, element_name)
+        self._sync_after_action()
         self.screenshots.take_screenshot(f"after_click_{element_name}")
         return success
     
     @allure.step("Ingresar texto en: {element_name}")
     def enter_text(self, locator, text, element_name="campo"):
-        """Ingresar texto con evidencias"""
-        self.screenshots.take_screenshot(f"before_text_{element_name}")
+        """Ingresar texto con evidencias (según el nivel de --evidence)"""
+        self.screenshots.take_screenshot(f"before_text_{element_name}", kind="detail")
         success = self.actions.send_keys_with_evidence(locator, text, element_name)
+        self._sync_after_action()
         self.screenshots.take_screenshot(f"after_text_{element_name}")
         return success
     
@@ -71,28 +172,293 @@ class BasePage:
     @allure.step("Esperar página cargada")
     def wait_for_page_load(self, timeout=20):
         """Esperar a que la página cargue completamente"""
+        if self.get_page_load_strategy() != "normal":
+            return self.wait_until_ready(timeout)
+        
         try:
-            WebDriverWait(self.driver, timeout).until(
-                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            self.wait_for_condition(
+                "carga", lambda driver: driver.execute_script("return document.readyState") == "complete",
+                timeout
             )
             logger.info("✅ Página cargada completamente")
-            time.sleep(1)  # Pequeña pausa adicional
+            self.wait_for_dom_settled(timeout=1)
             return True
         except TimeoutException:
             logger.warning("⚠️  Timeout en carga de página")
             return False
     
+    def wait_for_dom_settled(self, timeout=2, quiet_ms=Config.DOM_QUIET_MS, root=None):
+        """Esperar a que el DOM deje de cambiar (reemplazo de pausas fijas).
+        
+        Vuelve en cuanto `root` (WebElement o selector CSS; por defecto todo el documento)
+        pasa quiet_ms sin mutaciones ni scroll, o como máximo tras `timeout` segundos.
+        Devuelve True si el DOM se asentó. Con --sync-mode=angular espera en su lugar a que
+        la app quede ociosa (sin este atajo solo en páginas que no son Angular o si se indica `root`).
+        """
+        app_sync = getattr(self.driver, "app_sync", None)
+        if app_sync and root is None:
+            idle = app_sync.wait_for_idle(self.driver, timeout)
+            if idle is not None:
+                return idle
+        
+        try:
+            result = self.driver.execute_async_script(
+                self.DOM_SETTLED_SCRIPT, int(timeout * 1000), quiet_ms, root
+            )
+        except WebDriverException:
+            # La acción disparó una navegación: el documento se descargó antes de responder
+            try:
+                WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                    lambda driver: driver.execute_script("return document.readyState") != "loading"
+                )
+                return True
+            except (TimeoutException, WebDriverException):
+                return False
+        
+        if not result["settled"]:
+            logger.debug(f"DOM sin asentarse tras {result['elapsed']} ms")
+        return result["settled"]
+    
+    def find_first(self, locators, visible=False):
+        """Primer elemento que coincide, probando los localizadores en orden (un solo round trip).
+        
+        Devuelve (localizador, elemento) o (None, None).
+        """
+        try:
+            matches = self.driver.execute_script(self.LOCATE_SCRIPT, [list(l) for l in locators],
+                                                 "first", visible)
+        except WebDriverException as e:
+            logger.debug(f"Error resolviendo localizadores: {e}")
+            return None, None
+        if not matches:
+            return None, None
+        return locators[matches[0]["index"]], matches[0]["element"]
+    
+    def find_all(self, locators, visible=False):
+        """Todos los elementos de todos los localizadores con su visibilidad (un solo round trip).
+        
+        Devuelve una lista de {"locator", "element", "visible"} en el orden de los localizadores.
+        """
+        try:
+            matches = self.driver.execute_script(self.LOCATE_SCRIPT, [list(l) for l in locators],
+                                                 "all", visible)
+        except WebDriverException as e:
+            logger.debug(f"Error resolviendo localizadores: {e}")
+            return []
+        return [{"locator": locators[m["index"]], "element": m["element"], "visible": m["visible"]}
+                for m in matches]
+    
+    def probe(self, locator, timeout=0, visible=False, poll_frequency=0.25):
+        """Comprobar un localizador sin efectos: sin screenshots, steps de Allure ni logs.
+        
+        Con timeout=0 es un único round trip (sin la espera implícita de find_elements).
+        Devuelve el elemento o None.
+        """
+        end_time = time.time() + timeout
+        while True:
+            _, element = self.find_first([locator], visible)
+            if element is not None or time.time() >= end_time:
+                return element
+            time.sleep(poll_frequency)
+    
+    @allure.step("Esperar primero de {element_name}")
+    def wait_for_first(self, locators, element_name="elementos", timeout=10, visible=False,
+                       poll_frequency=0.5, evidence=False):
+        """Sondear find_first hasta que algún localizador coincida.
+        
+        Devuelve (localizador, elemento) o (None, None) al agotar el timeout; con `evidence`
+        captura entonces una sola vez screenshot y HTML (capture_failure_evidence).
+        """
+        start = time.time()
+        end_time = start + self.timeout_for(element_name, timeout)
+        while True:
+            locator, element = self.find_first(locators, visible)
+            if element is not None:
+                logger.info(f"✅ {element_name} encontrado con: {locator[1]}")
+                self.record_wait(element_name, start, True)
+                return locator, element
+            if time.time() >= end_time:
+                logger.error(f"❌ Timeout esperando {element_name} ({len(locators)} localizadores)")
+                self.record_wait(element_name, start, False)
+                if evidence:
+                    self.capture_failure_evidence(f"timeout_{element_name}")
+                return None, None
+            time.sleep(poll_frequency)
+    
+    def wait_for_app_idle(self, timeout=Config.APP_IDLE_TIMEOUT):
+        """Esperar a que Angular esté estable y sin XHR/fetch pendientes.
+        
+        Sin --sync-mode=angular, o en páginas que no son Angular, equivale a wait_for_dom_settled.
+        """
+        app_sync = getattr(self.driver, "app_sync", None)
+        if app_sync:
+            idle = app_sync.wait_for_idle(self.driver, timeout)
+            if idle is not None:
+                return idle
+        return self.wait_for_dom_settled(timeout=timeout)
+    
+    @allure.step("Esperar red ociosa")
+    def wait_for_network_idle(self, url_pattern=None, timeout=25, idle_ms=Config.NETWORK_IDLE_MS):
+        """Esperar a que no queden requests en vuelo (solo los que coinciden con url_pattern)
+        durante idle_ms. Devuelve False si la red sigue activa al llegar a timeout.
+        """
+        name = f"red {url_pattern or '*'}"
+        start = time.time()
+        idle = NetworkIdleMonitor.for_driver(self.driver).wait_for_idle(
+            idle_ms, self.timeout_for(name, timeout), url_pattern
+        )
+        self.record_wait(name, start, idle)
+        return idle
+    
+    def wait_for_condition(self, name, condition, timeout=10, poll_frequency=0.5):
+        """WebDriverWait.until con timeout adaptativo: registra la duración de la espera `name`
+        y, con --adaptive-timeouts=enforce, la acorta según su historial (`timeout` es el techo).
+        
+        Lanza TimeoutException igual que until.
+        """
+        start = time.time()
+        try:
+            result = WebDriverWait(self.driver, self.timeout_for(name, timeout),
+                                   poll_frequency=poll_frequency).until(condition)
+        except TimeoutException:
+            self.record_wait(name, start, False)
+            raise
+        self.record_wait(name, start, True)
+        return result
+    
+    def timeout_for(self, name, default):
+        """Timeout de la espera `name` de esta página (historial o `default`)"""
+        adaptive = getattr(self.driver, "adaptive_timeouts", None)
+        return adaptive.timeout_for(self._wait_key(name), default) if adaptive else default
+    
+    def record_wait(self, name, started, ok):
+        """Registrar cuánto tardó la espera `name` desde `started` y si se cumplió"""
+        adaptive = getattr(self.driver, "adaptive_timeouts", None)
+        if adaptive:
+            adaptive.record(self._wait_key(name), time.time() - started, ok)
+    
+    def _wait_key(self, name):
+        return f"{type(self).__name__}.{name}"
+    
+    def _sync_after_action(self):
+        # Con --sync-mode=angular las acciones bloquean hasta que la app queda ociosa
+        if getattr(self.driver, "app_sync", None):
+            self.wait_for_app_idle()
+    
+    def scroll_into_view(self, element, block="center"):
+        """Centrar `element`; el scroll suave (y su espera) solo con --evidence=verbose"""
+        behavior = "smooth" if evidence_policy.highlight else "instant"
+        self.driver.execute_script(
+            "arguments[0].scrollIntoView({behavior: arguments[1], block: arguments[2]});",
+            element, behavior, block
+        )
+    
+    def highlight(self, element, style="border: 3px solid red"):
+        """Resaltar `element` para screenshots/video (solo con --evidence=verbose).
+        
+        Devuelve el estilo original para remove_highlight, o None si no se resaltó.
+        """
+        if not evidence_policy.highlight:
+            return None
+        try:
+            original_style = element.get_attribute("style") or ""
+            self.driver.execute_script("arguments[0].style.cssText += ';' + arguments[1];", element, style)
+            return original_style
+        except WebDriverException:
+            return None
+    
+    def remove_highlight(self, element, original_style):
+        """Restaurar el estilo guardado por highlight (tolera elementos stale)"""
+        if original_style is None:
+            return
+        try:
+            self.driver.execute_script("arguments[0].style.cssText = arguments[1];", element, original_style)
+        except WebDriverException as e:
+            logger.debug(f"No se pudo quitar el resaltado: {e}")
+    
+    def visual_pause(self, seconds):
+        """Pausa para que una acción se vea en screenshots/video (solo con --evidence=verbose)"""
+        if evidence_policy.highlight:
+            time.sleep(seconds)
+    
+    def visual_delay(self, seconds):
+        """Duración de una pausa visual dentro de ActionChains (0 salvo con --evidence=verbose)"""
+        return seconds if evidence_policy.highlight else 0
+    
+    def get_page_load_strategy(self):
+        """Estrategia de carga de la sesión (normal, eager o none)"""
+        return self.driver.capabilities.get("pageLoadStrategy", "normal")
+    
+    def is_ready(self):
+        """Evaluar el predicado READY_SCRIPT de la página"""
+        try:
+            return bool(self.driver.execute_script(self.READY_SCRIPT))
+        except WebDriverException:
+            return False
+    
+    @allure.step("Esperar página lista")
+    def wait_until_ready(self, timeout=20):
+        """Esperar solo hasta que la página cumpla su predicado de 'lista'"""
+        try:
+            self.wait_for_condition("lista", lambda driver: self.is_ready(), timeout, poll_frequency=0.1)
+            logger.info(f"✅ Página lista: {type(self).__name__}")
+            return True
+        except TimeoutException:
+            logger.warning(f"⚠️  Timeout esperando página lista: {type(self).__name__}")
+            return False
+    
     @allure.step("Navegar a URL")
     def navigate_to(self, url):
         """Navegar a una URL"""
         logger.info(f"🌐 Navegando a: {url}")
+        start = time.time()
         self.driver.get(url)
-        return self.wait_for_page_load()
+        
+        # Medir la primera navegación de sesiones con perfil precalentado
+        profile_template = getattr(self.driver, "profile_template", None)
+        if profile_template:
+            profile_template.record_navigation(self.driver, url, time.time() - start)
+        
+        loaded = self.wait_for_page_load()
+        self.record_network_usage()
+        return loaded
+    
+    def record_network_usage(self, label=None):
+        """Registrar bytes/requests de la página si hay perfil de red activo"""
+        network_profile = getattr(self.driver, "network_profile", None)
+        if network_profile:
+            return network_profile.record_page(self.driver, label)
+        return None
+    
+    def take_screenshot(self, name, kind="step"):
+        """Tomar screenshot de checkpoint (desde --evidence=per-step); kind="failure" para rutas de error"""
+        return self.screenshots.take_screenshot(name, kind=kind)
     
-    @allure.step("Tomar screenshot")
-    def take_screenshot(self, name):
-        """Tomar screenshot"""
-        return self.screenshots.take_screenshot(name)
+    @allure.step("Capturar evidencia de fallo: {name}")
+    def capture_failure_evidence(self, name, html=True):
+        """Screenshot y volcado HTML de la página adjuntos a Allure (una vez por espera fallida).
+        
+        Con --evidence=off no captura nada.
+        """
+        if not evidence_policy.allows("failure"):
+            return None
+        
+        screenshot = self.screenshots.take_screenshot(name, kind="failure")
+        if not html:
+            return screenshot
+        
+        try:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filepath = os.path.join(Config.SCREENSHOT_DIR, f"{name}_{timestamp}.html")
+            os.makedirs(Config.SCREENSHOT_DIR, exist_ok=True)
+            page_source = self.driver.page_source
+            with open(filepath, 'w', encoding='utf-8') as f:
+                f.write(page_source)
+            allure.attach(page_source, name=f"{name}_html", attachment_type=allure.attachment_type.HTML)
+            logger.info(f"Volcado HTML guardado: {filepath}")
+        except Exception as e:
+            logger.error(f"Error guardando volcado HTML: {e}")
+        return screenshot
     
     @allure.step("Obtener título de página")
     def get_page_title(self):
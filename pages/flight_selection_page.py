@@ -8,10 +8,18 @@ from selenium.webdriver.support import expected_conditions as EC
 import allure
 from pages.base_page import BasePage
 from utils.logger import logger
+from utils.config import Config
 
 class FlightSelectionPage(BasePage):
     """Página de selección de vuelos - MEJORADA CON ACTIONCHAINS"""
     
+    # Lista cuando hay controles de tarifa renderizados
+    READY_SCRIPT = """
+        return document.querySelectorAll(
+            "fare-control, button[class*='fare_button'], div[class*='journey_price']"
+        ).length > 0;
+    """
+    
     # ==================== SELECTORES BASADOS EN CSV ====================
     
     # Paso 2: Select fare label
@@ -71,18 +79,22 @@ class FlightSelectionPage(BasePage):
             "//button[contains(., 'Select')]",
         ]
 
-        end_time = time.time() + 25
-        found = False
+        # Primero la respuesta de disponibilidad; luego basta confirmar que se renderizó
+        start = time.time()
+        timeout = self.timeout_for("Resultados de vuelos", 25)
+        end_time = start + timeout
+        self.wait_for_network_idle(Config.NETWORK_IDLE_PATTERNS["flight_search"], timeout=timeout)
+
+        locators = [(By.XPATH, xpath) for xpath in selectors]
         while time.time() < end_time:
-            for xpath in selectors:
-                try:
-                    elems = self.driver.find_elements(By.XPATH, xpath)
-                    if elems and len(elems) > 0:
-                        logger.info(f"✓ Resultados de vuelos detectados usando: {xpath}")
-                        time.sleep(1.2)
-                        return True
-                except Exception:
-                    continue
+            # Todos los selectores en un solo round trip
+            locator, _ = self.find_first(locators)
+            if locator:
+                logger.info(f"✓ Resultados de vuelos detectados usando: {locator[1]}")
+                self.record_wait("Resultados de vuelos", start, True)
+                self.wait_for_dom_settled(timeout=1.2)
+                self.record_network_usage("Resultados de vuelos")
+                return True
 
             # pequeño scroll para forzar carga lazy
             try:
@@ -91,8 +103,9 @@ class FlightSelectionPage(BasePage):
                 pass
             time.sleep(0.6)
 
+        self.record_wait("Resultados de vuelos", start, False)
         logger.warning("No se detectaron resultados de vuelos en el tiempo esperado")
-        self.take_screenshot("flights_no_results")
+        self.take_screenshot("flights_no_results", kind="failure")
         # Dump HTML de contenedores relevantes para depuración
         try:
             self.dump_flight_results_html(prefix="no_results")
@@ -195,12 +208,12 @@ class FlightSelectionPage(BasePage):
 
             # 4. Scroll y Click Robusto (JS)
             self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", target_el)
-            time.sleep(1) # Esperar al scroll
+            self.wait_for_dom_settled(timeout=1) # Esperar al scroll
             
             # Intentar click JS (es lo que mejor funciona en Avianca para evitar intercepciones)
             self.driver.execute_script("arguments[0].click();", target_el)
             logger.info(f"✅ Click JS exitoso en {fare_name} (Leg {leg_index})")
-            time.sleep(2) # Esperar reacción de la página
+            self.wait_for_dom_settled(timeout=2) # Esperar reacción de la página
             return True
 
         except Exception as e:
@@ -221,14 +234,14 @@ class FlightSelectionPage(BasePage):
                     "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", 
                     select_fare_label
                 )
-                time.sleep(1)
+                self.wait_for_dom_settled(timeout=1)
                 
                 # Usar ActionChains para hover y click
                 actions = ActionChains(self.driver)
                 actions.move_to_element(select_fare_label).pause(0.5).click().perform()
                 
                 logger.info("✓ Click en Select fare label realizado con ActionChains")
-                time.sleep(1)
+                self.wait_for_dom_settled(timeout=1)
                 return True
             
             return False
@@ -252,14 +265,14 @@ class FlightSelectionPage(BasePage):
                 time.sleep(0.3)
             
             logger.info("✓ Scroll down realizado")
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             return True
             
         except Exception as e:
             # Fallback: JavaScript scroll
             self.driver.execute_script("window.scrollBy(0, 300);")
             logger.info("✓ Scroll down realizado (JavaScript)")
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             return True
     
     @allure.step("PASO 4: Seleccionar tarifa Basic con ActionChains - DESTACADO")
@@ -276,15 +289,16 @@ class FlightSelectionPage(BasePage):
             
             # Intento 1: Selector específico de Basic
             try:
-                select_button = self.wait_for_element(self.SELECT_BASIC_FARE_BUTTON, timeout=5)
-                logger.info("✓ Botón Basic fare encontrado (selector específico)")
+                select_button = self.probe(self.SELECT_BASIC_FARE_BUTTON, timeout=5)
+                if select_button:
+                    logger.info("✓ Botón Basic fare encontrado (selector específico)")
             except:
                 pass
             
             # Intento 2: Por aria-label
             if not select_button:
                 try:
-                    select_button = self.wait_for_element(self.BASIC_FARE_CARD, timeout=5)
+                    select_button = self.probe(self.BASIC_FARE_CARD, timeout=5)
                     # Buscar el botón dentro de la card
                     if select_button:
                         buttons = select_button.find_elements(By.XPATH, ".//button | .//div[@class='fare_button_label']")
@@ -296,20 +310,18 @@ class FlightSelectionPage(BasePage):
             
             # Intento 3: Primer Select disponible
             if not select_button:
-                try:
-                    select_button = self.wait_for_element(self.FIRST_SELECT_BUTTON, timeout=5)
+                select_button = self.probe(self.FIRST_SELECT_BUTTON, timeout=5)
+                if select_button:
                     logger.info("✓ Primer botón Select encontrado (fallback)")
-                except:
+                else:
                     logger.error("❌ No se encontró ningún botón Select")
+                    self.capture_failure_evidence("fare_select_button_not_found")
                     return False
             
             if select_button:
-                # Scroll al botón con comportamiento suave
-                self.driver.execute_script(
-                    "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", 
-                    select_button
-                )
-                time.sleep(1)
+                # Scroll al botón (suave solo con --evidence=verbose)
+                self.scroll_into_view(select_button)
+                self.wait_for_dom_settled(timeout=1)
                 
                 # ===== ACTIONCHAINS PARA DESTACAR LA SELECCIÓN =====
                 actions = ActionChains(self.driver)
@@ -317,46 +329,32 @@ class FlightSelectionPage(BasePage):
                 # 1. Mover el mouse al botón (hover)
                 logger.info("  → Moviendo cursor a tarifa Basic (hover)...")
                 actions.move_to_element(select_button).perform()
-                time.sleep(1)  # Pausa para que se vea el hover
+                self.visual_pause(1)  # Pausa para que se vea el hover
                 
-                # 2. Resaltar el elemento con JavaScript (borde destacado)
-                try:
-                    original_style = select_button.get_attribute("style")
-                    self.driver.execute_script(
-                        "arguments[0].style.border = '3px solid #00FF00';"
-                        "arguments[0].style.boxShadow = '0 0 10px #00FF00';",
-                        select_button
-                    )
+                # 2. Resaltar el elemento (borde destacado, según --evidence)
+                original_style = self.highlight(select_button, "border: 3px solid #00FF00; box-shadow: 0 0 10px #00FF00")
+                if original_style is not None:
                     logger.info("  → Tarifa Basic resaltada visualmente")
-                    time.sleep(1)  # Pausa para que se vea el resaltado
-                except:
-                    pass
+                    self.visual_pause(1)  # Pausa para que se vea el resaltado
                 
                 # 3. Click con ActionChains
                 logger.info("  → Haciendo click en tarifa Basic...")
                 actions.click(select_button).perform()
-                time.sleep(0.5)
+                self.wait_for_dom_settled(timeout=0.5)
                 
                 # 4. Restaurar estilo original (si se pudo cambiar)
-                try:
-                    if original_style:
-                        self.driver.execute_script(
-                            f"arguments[0].style = '{original_style}';",
-                            select_button
-                        )
-                except:
-                    pass
+                self.remove_highlight(select_button, original_style)
                 
                 logger.info("✅ Tarifa Basic seleccionada con ActionChains (DESTACADO)")
                 self.take_screenshot("basic_fare_selected")
-                time.sleep(2)
+                self.wait_for_dom_settled(timeout=2)
                 return True
             
             return False
             
         except Exception as e:
             logger.error(f"Error seleccionando tarifa con ActionChains: {e}")
-            self.take_screenshot("fare_selection_error")
+            self.take_screenshot("fare_selection_error", kind="failure")
             return False
     
     @allure.step("PASO 5: Scroll up suave")
@@ -374,14 +372,14 @@ class FlightSelectionPage(BasePage):
                 time.sleep(0.3)
             
             logger.info("✓ Scroll up realizado")
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             return True
             
         except Exception as e:
             # Fallback: JavaScript scroll
             self.driver.execute_script("window.scrollBy(0, -200);")
             logger.info("✓ Scroll up realizado (JavaScript)")
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             return True
     
     @allure.step("Seleccionar tarifa Basic - FLUJO COMPLETO CON ACTIONCHAINS")
@@ -538,7 +536,7 @@ class FlightSelectionPage(BasePage):
         try:
             btn = WebDriverWait(self.driver, 10).until(EC.element_to_be_clickable((By.XPATH, xpath_csv)))
             self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", btn)
-            time.sleep(0.5)
+            self.wait_for_dom_settled(timeout=0.5)
             btn.click()
             return True
         except Exception:
@@ -601,52 +599,36 @@ class FlightSelectionPage(BasePage):
             # Buscar tarifa Basic
             select_button = None
             
-            for selector in [self.SELECT_BASIC_FARE_BUTTON, self.FIRST_SELECT_BUTTON]:
-                try:
-                    select_button = self.wait_for_element(selector, timeout=5)
-                    if select_button:
-                        break
-                except:
-                    continue
+            _, select_button = self.wait_for_first([self.SELECT_BASIC_FARE_BUTTON, self.FIRST_SELECT_BUTTON],
+                                                   "Botón de tarifa", timeout=5, evidence=True)
             
             if not select_button:
                 logger.error("❌ No se encontró botón de tarifa")
                 return False
             
             # Scroll
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", 
-                select_button
-            )
-            time.sleep(1)
+            self.scroll_into_view(select_button)
+            self.wait_for_dom_settled(timeout=1)
             
-            # 1. Resaltar con animación
+            # 1. Resaltar con animación (solo con --evidence=verbose)
             logger.info("  🎨 Resaltando tarifa Basic...")
-            self.driver.execute_script("""
-                arguments[0].style.border = '5px solid #FF0000';
-                arguments[0].style.boxShadow = '0 0 20px #FF0000';
-                arguments[0].style.backgroundColor = 'rgba(255, 255, 0, 0.3)';
-                arguments[0].style.transition = 'all 0.5s';
-            """, select_button)
-            time.sleep(2)  # Pausa larga para ver el resaltado
+            original_style = self.highlight(select_button, "border: 5px solid #FF0000; box-shadow: 0 0 20px #FF0000; "
+                                                           "background-color: rgba(255, 255, 0, 0.3); transition: all 0.5s")
+            self.visual_pause(2)  # Pausa larga para ver el resaltado
             
             # 2. Hover con ActionChains
             logger.info("  👆 Hover sobre tarifa Basic...")
             actions = ActionChains(self.driver)
-            actions.move_to_element(select_button).pause(1).perform()
-            time.sleep(1)
+            actions.move_to_element(select_button).pause(self.visual_delay(1)).perform()
+            self.visual_pause(1)
             
             # 3. Click
             logger.info("  🖱️  Click en tarifa Basic...")
             actions.click(select_button).perform()
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             
             # 4. Restaurar estilo
-            self.driver.execute_script("""
-                arguments[0].style.border = '';
-                arguments[0].style.boxShadow = '';
-                arguments[0].style.backgroundColor = '';
-            """, select_button)
+            self.remove_highlight(select_button, original_style)
             
             logger.info("✅ Tarifa seleccionada con MÁXIMA VISIBILIDAD")
             self.take_screenshot("basic_fare_highlighted")
@@ -670,7 +652,7 @@ class FlightSelectionPage(BasePage):
             # PASO 1: Hacer scroll para ver la tarifa
             logger.info(f"  → Scroll down para visualizar tarifa '{fare_type}'...")
             self.driver.execute_script("window.scrollBy(0, 300);")
-            time.sleep(1.5)
+            self.wait_for_dom_settled(timeout=1.5)
             
             # PASO 2: Buscar el botón de tarifa usando múltiples estrategias
             # Estrategia 1: Buscar por aria-label exact (del CSV)
@@ -689,11 +671,9 @@ class FlightSelectionPage(BasePage):
             
             # Intentar estrategia 1
             logger.info(f"  Intento 1: Buscando por aria-label exacto...")
-            try:
-                select_button = self.wait_for_element((By.XPATH, xpath_by_aria), timeout=5)
+            select_button = self.probe((By.XPATH, xpath_by_aria), timeout=5)
+            if select_button:
                 logger.info(f"  ✓ Encontrado por aria-label exacto")
-            except Exception as e:
-                logger.debug(f"    No encontrado: {e}")
             
             # Intentar estrategia 2
             if not select_button:
@@ -760,7 +740,7 @@ class FlightSelectionPage(BasePage):
             
             if not select_button:
                 logger.error(f"❌ No se encontró botón para seleccionar tarifa '{fare_type}' (tramo {leg_index})")
-                self.take_screenshot(f"error_select_{fare_type}_leg_{leg_index}")
+                self.take_screenshot(f"error_select_{fare_type}_leg_{leg_index}", kind="failure")
                 try:
                     self.dump_flight_results_html(prefix=f"error_select_{fare_type}_leg_{leg_index}")
                 except Exception:
@@ -770,13 +750,13 @@ class FlightSelectionPage(BasePage):
             # PASO 3: Hacer scroll al botón y clickearlo
             logger.info(f"  → Scrolling al botón Select...")
             self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", select_button)
-            time.sleep(0.8)
+            self.wait_for_dom_settled(timeout=0.8)
             
             # Click con ActionChains (más confiable)
             logger.info(f"  → Haciendo click en Select button...")
             actions = ActionChains(self.driver)
             actions.move_to_element(select_button).pause(0.3).click().perform()
-            time.sleep(1.0)
+            self.wait_for_dom_settled(timeout=1.0)
             
             logger.info(f"✅ Tarifa '{fare_type}' seleccionada exitosamente (tramo {leg_index})")
             self.take_screenshot(f"selected_{fare_type}_leg_{leg_index}")
@@ -785,7 +765,7 @@ class FlightSelectionPage(BasePage):
         except Exception as e:
             logger.error(f"❌ Error seleccionando tarifa '{fare_type}' para tramo {leg_index}: {e}")
             try:
-                self.take_screenshot(f"error_fare_{fare_type}_{leg_index}")
+                self.take_screenshot(f"error_fare_{fare_type}_{leg_index}", kind="failure")
             except:
                 pass
             return False
\ No newline at end of file
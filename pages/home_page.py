@@ -5,6 +5,7 @@ from selenium.webdriver.support import expected_conditions as EC
 import allure
 from pages.base_page import BasePage
 from utils.config import Config
+from utils.locator_registry import xpath_literal
 from utils.logger import logger
 from selenium.webdriver import ActionChains
 
@@ -17,6 +18,12 @@ from selenium.common.exceptions import (
 class HomePage(BasePage):
     """Página de inicio de Avianca"""
     
+    # Lista cuando el botón de búsqueda es interactuable
+    READY_SCRIPT = """
+        var button = document.getElementById('searchButton');
+        return !!button && !button.disabled && button.offsetParent !== null;
+    """
+    
     # ==================== SELECTORES  ====================
     
     # Idioma 
@@ -108,6 +115,33 @@ class HomePage(BasePage):
         "Información legal": (By.XPATH, "//*[@id='footerNavListId-3']/li[1]/a")
     }
 
+    # Login LifeMiles (candidatos en orden de preferencia)
+    LOGIN_OPEN_BUTTONS = [
+        (By.XPATH, "//button[contains(@class, 'login')]"),
+        (By.XPATH, "//button[contains(., 'Iniciar sesión') or contains(., 'Log in') "
+                   "or contains(., 'Se connecter') or contains(., 'Entrar')]"),
+    ]
+    LOGIN_USERNAME_FIELDS = [
+        (By.ID, "username"),
+        (By.CSS_SELECTOR, "input[name='username']"),
+        (By.CSS_SELECTOR, "input[autocomplete='username']"),
+    ]
+    LOGIN_PASSWORD_FIELDS = [
+        (By.ID, "password"),
+        (By.CSS_SELECTOR, "input[type='password']"),
+    ]
+    LOGIN_SUBMIT_BUTTONS = [
+        (By.CSS_SELECTOR, "button[type='submit']"),
+        (By.XPATH, "//button[contains(., 'Continuar') or contains(., 'Continue') or contains(., 'Ingresar')]"),
+    ]
+    # Solo se renderizan cuando el servidor acepta la sesión (menú de usuario / cerrar sesión)
+    LOGGED_IN_INDICATORS = [
+        (By.XPATH, "//*[contains(@class, 'user-info') or contains(@class, 'user-name') "
+                   "or contains(@class, 'logged-in')]"),
+        (By.XPATH, "//button[contains(., 'Cerrar sesión') or contains(., 'Log out') "
+                   "or contains(., 'Se déconnecter') or contains(., 'Sair')]"),
+    ]
+
     def __init__(self, driver):
         super().__init__(driver)
     
@@ -161,20 +195,15 @@ class HomePage(BasePage):
         if not element:
             return False
         try:
-            # Scroll al centro y borde rojo visible
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({behavior:'smooth', block:'center'});", element
-            )
-            self.driver.execute_script("arguments[0].style.border='3px solid #e00';", element)
-            time.sleep(0.25)
+            # Scroll al centro y borde rojo visible (según --evidence)
+            self.scroll_into_view(element)
+            original_style = self.highlight(element, "border: 3px solid #e00")
+            self.visual_pause(0.25)
 
-            ActionChains(self.driver).move_to_element(element).pause(0.2).click().perform()
+            ActionChains(self.driver).move_to_element(element).pause(self.visual_delay(0.2)).click().perform()
 
             # Limpieza del borde
-            try:
-                self.driver.execute_script("arguments[0].style.border='0px';", element)
-            except Exception:
-                pass
+            self.remove_highlight(element, original_style)
 
             return True
         except Exception as e:
@@ -194,22 +223,21 @@ class HomePage(BasePage):
     def click_with_highlight(self, xpath, description):
         success = False
         element = None
+        original_style = None
         try:
             # Esperar a que sea clickeable
-            element = WebDriverWait(self.driver, 12).until(
-                EC.element_to_be_clickable((By.XPATH, xpath))
+            element = self.wait_for_condition(
+                f"clickeable {description}", EC.element_to_be_clickable((By.XPATH, xpath)), 12
             )
             # Scroll al centro
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({behavior:'smooth', block:'center'});", element
-            )
-            time.sleep(0.3)
-            # Borde rojo
-            self.driver.execute_script("arguments[0].style.border='3px solid red';", element)
-            time.sleep(0.2)
+            self.scroll_into_view(element)
+            self.visual_pause(0.3)
+            # Borde rojo (según --evidence)
+            original_style = self.highlight(element)
+            self.visual_pause(0.2)
             # Intento 1: ActionChains
             try:
-                ActionChains(self.driver).move_to_element(element).pause(0.2).click().perform()
+                ActionChains(self.driver).move_to_element(element).pause(self.visual_delay(0.2)).click().perform()
             except ElementClickInterceptedException:
                 # Intento 2: click directo
                 try:
@@ -224,12 +252,7 @@ class HomePage(BasePage):
 
         # Limpieza de borde (segura ante elemento stale)
         if element:
-            try:
-                self.driver.execute_script("arguments[0].style.border='0px';", element)
-            except StaleElementReferenceException:
-                logger.info("Elemento quedó 'stale' tras el clic; se omite limpieza del borde.")
-            except Exception as e:
-                logger.debug(f"Error de limpieza de borde: {e}")
+            self.remove_highlight(element, original_style)
         return success
 
     @allure.step("Ejecutar scroll: {direction}")
@@ -237,7 +260,7 @@ class HomePage(BasePage):
         try:
             scroll_amount = 500 if direction == "down" else -500
             self.driver.execute_script(f"window.scrollBy(0, {scroll_amount});")
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             return True
         except Exception as e:
             return False
@@ -294,7 +317,7 @@ class HomePage(BasePage):
                 self.driver.execute_script("arguments[0].click();", opt)
 
             # --- 2.4 Esperar actualización ---
-            time.sleep(1.5)
+            self.wait_for_dom_settled(timeout=1.5)
 
             # Si el sitio "abrió" otra pestaña, mantenernos en una válida
             current_handles = self.driver.window_handles
@@ -315,7 +338,7 @@ class HomePage(BasePage):
 
         except Exception as e:
             logger.error(f"Error seleccionando idioma: {e}")
-            self.take_screenshot("language_selection_error")
+            self.take_screenshot("language_selection_error", kind="failure")
             return False  # Asegúrate de retornar False en caso de error
 
     
@@ -341,23 +364,104 @@ class HomePage(BasePage):
                 element = self.wait_for_element(selector, f"Footer link: {link_name}")
                 if element:
                     self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
-                    time.sleep(0.5)
+                    self.wait_for_dom_settled(timeout=0.5)
                 
                 # Click
                 self.click(selector, f"Footer: {link_name}")
-                time.sleep(2)  # Esperar redirección
+                self.wait_for_dom_settled(timeout=2)  # Esperar redirección
                 return True
             return False
         except Exception as e:
             logger.warning(f"No se pudo clickear {link_name}: {e}")
             return False
     
+    @allure.step("Verificar links del footer por HTTP")
+    def verify_footer_links(self, verifier):
+        """Verificar los links del footer sin navegar; los manejados por JS quedan con method='click'"""
+        return verifier.verify(self.driver, self.FOOTER_LINKS)
+    
+    # ==================== LOGIN ====================
+    
+    @allure.step("Login con usuario {username}")
+    def login(self, username, password, timeout=30):
+        """Login por UI (el driver ya está en la página de login).
+        
+        Devuelve True cuando el sitio muestra la sesión autenticada (cookies ya emitidas).
+        """
+        _, button = self.wait_for_first(self.LOGIN_OPEN_BUTTONS, "Botón de login", visible=True, evidence=True)
+        if button is None:
+            return False
+        button.click()
+        
+        _, username_field = self.wait_for_first(self.LOGIN_USERNAME_FIELDS, "Campo usuario",
+                                                timeout=15, visible=True, evidence=True)
+        if username_field is None:
+            return False
+        username_field.clear()
+        username_field.send_keys(username)
+        
+        _, password_field = self.wait_for_first(self.LOGIN_PASSWORD_FIELDS, "Campo contraseña",
+                                                visible=True, evidence=True)
+        if password_field is None:
+            return False
+        password_field.clear()
+        password_field.send_keys(password)
+        
+        _, submit = self.wait_for_first(self.LOGIN_SUBMIT_BUTTONS, "Botón enviar login",
+                                        visible=True, evidence=True)
+        if submit is None:
+            return False
+        submit.click()
+        
+        if not self.is_logged_in(timeout):
+            self.capture_failure_evidence("login_sin_sesion")
+            return False
+        logger.info(f"🔑 Login completado: {username}")
+        return True
+    
+    def is_logged_in(self, timeout=10):
+        """True si la página muestra elementos que solo aparecen con sesión válida en el servidor"""
+        _, indicator = self.wait_for_first(self.LOGGED_IN_INDICATORS, "Sesión autenticada",
+                                           timeout=timeout, visible=True)
+        return indicator is not None
+    
+    @staticmethod
+    def header_text_locator(text):
+        """Localizador del primer elemento del header con `text` (el verificador sube hasta su <a>)"""
+        return (By.XPATH, f"//*[contains(text(), {xpath_literal(text)})]")
+    
+    @allure.step("Verificar links del header por HTTP")
+    def verify_header_links(self, verifier, texts):
+        """Verificar por HTTP los links del header {clave: texto}; los manejados por JS quedan con method='click'"""
+        return verifier.verify(self.driver, {key: self.header_text_locator(text) for key, text in texts.items()})
+    
+    @allure.step("Click en header: {text}")
+    def click_header_text(self, text):
+        """Click en el primer elemento visible con `text` (menús y links manejados por JS)"""
+        for element in self.driver.find_elements(*self.header_text_locator(text)):
+            try:
+                if not (element.is_displayed() and element.is_enabled()):
+                    continue
+                self.scroll_into_view(element)
+                original_style = self.highlight(element)
+                self.visual_pause(0.3)
+                try:
+                    element.click()
+                except Exception:
+                    self.driver.execute_script("arguments[0].click();", element)
+                self.remove_highlight(element, original_style)
+                self.wait_for_dom_settled(timeout=1)
+                return True
+            except Exception as e:
+                logger.debug(f"Error con elemento '{text}': {e}")
+        return False
+    
     @allure.step("Hacer scroll al footer")
     def scroll_to_footer(self):
         """Hacer scroll al final de la página"""
         try:
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             return True
         except:
             return False
@@ -384,7 +488,7 @@ class HomePage(BasePage):
             if not opened:
                 elem = self.wait_for_clickable(HEADER_POS_TRIGGER, "Header POS trigger", timeout=10)
                 if not elem:
-                    self.take_screenshot("pos_header_trigger_not_found")
+                    self.take_screenshot("pos_header_trigger_not_found", kind="failure")
                     return False
                 self.driver.execute_script("arguments[0].click();", elem)
             self.take_screenshot("pos_popup_open")
@@ -399,7 +503,7 @@ class HomePage(BasePage):
                     self.driver.execute_script("arguments[0].click();", opt)
                 time.sleep(0.3)
                 self._hover_click_with_actions(APPLY_SPAN, "Aplicar")
-                time.sleep(1.2)
+                self.wait_for_dom_settled(timeout=1.2)
                 self.take_screenshot("pos_otros_paises_applied")
                 return True
 
@@ -411,7 +515,7 @@ class HomePage(BasePage):
                     self.driver.execute_script("arguments[0].click();", opt)
                 time.sleep(0.3)
                 self._hover_click_with_actions(APPLY_SPAN, "Aplicar")
-                time.sleep(1.2)
+                self.wait_for_dom_settled(timeout=1.2)
                 self.take_screenshot("pos_espana_applied")
 
                 # CSV luego usa un click en "€" para abrir el popup de moneda/país
@@ -436,7 +540,7 @@ class HomePage(BasePage):
                     self.driver.execute_script("arguments[0].click();", opt)
                 time.sleep(0.3)
                 self._hover_click_with_actions(APPLY_SPAN, "Aplicar")
-                time.sleep(1.2)
+                self.wait_for_dom_settled(timeout=1.2)
                 self.take_screenshot("pos_chile_applied")
                 return True
 
@@ -446,7 +550,7 @@ class HomePage(BasePage):
 
         except Exception as e:
             logger.error(f"Error en select_pos_from_csv({target_pos}): {e}")
-            self.take_screenshot(f"pos_csv_error_{target_pos}")
+            self.take_screenshot(f"pos_csv_error_{target_pos}", kind="failure")
             return
             
     #====================== TEST CASE 1 =====================================  #
@@ -482,7 +586,7 @@ class HomePage(BasePage):
             if not opened:
                 elem = self.wait_for_clickable((By.XPATH, LANG_DROPDOWN_XPATH), "Idioma - dropdown", timeout=10)
                 if not elem:
-                    self.take_screenshot("csv_language_dropdown_not_found")
+                    self.take_screenshot("csv_language_dropdown_not_found", kind="failure")
                     return False
                 self.driver.execute_script("arguments[0].click();", elem)
 
@@ -517,19 +621,14 @@ class HomePage(BasePage):
                         continue
 
                     # Evidencia visual + clic (ActionChains)
-                    self.driver.execute_script(
-                        "arguments[0].scrollIntoView({behavior:'smooth',block:'center'});", target
-                    )
-                    self.driver.execute_script("arguments[0].style.border='3px solid #e00';", target)
-                    time.sleep(0.2)
+                    self.scroll_into_view(target)
+                    original_style = self.highlight(target, "border: 3px solid #e00")
+                    self.visual_pause(0.2)
 
                     try:
-                        ActionChains(self.driver).move_to_element(target).pause(0.2).click().perform()
+                        ActionChains(self.driver).move_to_element(target).pause(self.visual_delay(0.2)).click().perform()
                     finally:
-                        try:
-                            self.driver.execute_script("arguments[0].style.border='0';", target)
-                        except Exception:
-                            pass
+                        self.remove_highlight(target, original_style)
 
                     clicked = True
                     logger.info("✓ Idioma 'English' seleccionado (por botón/rol/id).")
@@ -553,15 +652,15 @@ class HomePage(BasePage):
 
             if not clicked:
                 logger.error(f"No fue posible clicar 'English'. Último error: {last_error}")
-                self.take_screenshot("csv_language_english_click_failed")
+                self.take_screenshot("csv_language_english_click_failed", kind="failure")
                 return False
 
-            time.sleep(0.8)
+            self.wait_for_dom_settled(timeout=0.8)
             return True
 
         except Exception as e:
             logger.error(f"Error en select_language_from_csv: {e}")
-            self.take_screenshot("csv_language_selection_error")
+            self.take_screenshot("csv_language_selection_error", kind="failure")
 
 
     @allure.step("CSV: Seleccionar POS -> Colombia COP y Aplicar")
@@ -592,12 +691,12 @@ class HomePage(BasePage):
             if not self.click_xpath_with_actions(HEADER_POS_TRIGGER, "Header POS trigger (Colombia COP)"):
                 elem = self.wait_for_clickable((By.XPATH, HEADER_POS_TRIGGER), "Header POS trigger", timeout=10)
                 if not elem: 
-                    self.take_screenshot("pos_header_trigger_not_found")
+                    self.take_screenshot("pos_header_trigger_not_found", kind="failure")
                     return False
                 self.driver.execute_script("arguments[0].click();", elem)
             
             self.take_screenshot("csv_pos_popup_open")
-            time.sleep(1.5)  # Esperar a que el popup se abra completamente
+            self.wait_for_dom_settled(timeout=1.5)  # Esperar a que el popup se abra completamente
             
             # --- Seleccionar COP ---
             logger.info("Seleccionando COP...")
@@ -608,7 +707,7 @@ class HomePage(BasePage):
                 else:
                     self.driver.execute_script("arguments[0].click();", elem)
             
-            time.sleep(1)  # Esperar a que se seleccione COP
+            self.wait_for_dom_settled(timeout=1)  # Esperar a que se seleccione COP
             
             # --- Buscar y hacer click en Apply (intentar todas las variantes) ---
             logger.info("Buscando botón Apply...")
@@ -629,7 +728,7 @@ class HomePage(BasePage):
                             "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", 
                             apply_element
                         )
-                        time.sleep(0.5)
+                        self.wait_for_dom_settled(timeout=0.5)
                         
                         # Intentar click con ActionChains primero
                         try:
@@ -666,18 +765,18 @@ class HomePage(BasePage):
                     pass
             
             if apply_found:
-                time.sleep(2)  # Esperar a que se aplique el cambio
+                self.wait_for_dom_settled(timeout=2)  # Esperar a que se aplique el cambio
                 self.take_screenshot("csv_pos_cop_applied")
                 logger.info("✅ POS Colombia COP aplicado exitosamente")
                 return True
             else:
                 logger.error("❌ No se encontró ningún botón Apply/Aplicar")
-                self.take_screenshot("apply_button_not_found")
+                self.take_screenshot("apply_button_not_found", kind="failure")
                 return False
 
         except Exception as e:
             logger.error(f"Error en select_pos_cop_apply_from_csv: {e}")
-            self.take_screenshot(f"pos_csv_error_{str(e)[:50]}")
+            self.take_screenshot(f"pos_csv_error_{str(e)[:50]}", kind="failure")
             return False
 
     @allure.step("CSV: Seleccionar One way (por ID)")
@@ -685,8 +784,8 @@ class HomePage(BasePage):
         """Paso 8 del CSV: click en #journeytypeId_1."""
         # Usar el selector CSS_SELECTOR definido en la clase, que es más robusto
         try:
-            element = WebDriverWait(self.driver, 12).until(
-                EC.element_to_be_clickable(self.ONE_WAY_LABEL)
+            element = self.wait_for_condition(
+                "clickeable One way", EC.element_to_be_clickable(self.ONE_WAY_LABEL), 12
             )
             self.driver.execute_script(
                 "arguments[0].scrollIntoView({behavior:'smooth', block:'center'});", element
@@ -702,7 +801,7 @@ class HomePage(BasePage):
                 except Exception:
                     # Intento 3: JavaScript click
                     self.driver.execute_script("arguments[0].click();", element)
-            time.sleep(0.5)
+            self.wait_for_dom_settled(timeout=0.5)
             return True
         except Exception as e:
             logger.error(f"Error seleccionando One Way: {e}")
@@ -726,7 +825,7 @@ class HomePage(BasePage):
         dest_input = self.wait_for_element((By.XPATH, DEST_INPUT), "Destino - input", timeout=8)
         if not dest_input: return False
         dest_input.click(); time.sleep(0.2)
-        dest_input.clear(); dest_input.send_keys("MDE"); time.sleep(1.5)
+        dest_input.clear(); dest_input.send_keys("MDE"); self.wait_for_dom_settled(timeout=1.5)
 
         # click opción Medellin
         return self.click_xpath_with_actions(OPTION_MEDELLIN, "Destino - Medellin")
@@ -738,7 +837,7 @@ class HomePage(BasePage):
         """Paso 12 del CSV: click en //span[contains(text(),'17')]"""
         DAY_XPATH = f"//span[contains(text(),'{day_text}')]"
         ok = self.click_xpath_with_actions(DAY_XPATH, f"Calendario - día {day_text}")
-        time.sleep(0.6)
+        self.wait_for_dom_settled(timeout=0.6)
         return ok
 
     @allure.step("CSV: Agregar pasajeros por íconos '+' y confirmar")
@@ -755,7 +854,7 @@ class HomePage(BasePage):
         ok1 = self.click_xpath_with_actions(PLUS_YOUTH_ABS, "Pasajeros: Youth +")
         ok2 = self.click_xpath_with_actions(PLUS_CHILD_ABS, "Pasajeros: Child +")
         ok3 = self.click_xpath_with_actions(PLUS_INFANT_ABS, "Pasajeros: Infant +")
-        time.sleep(0.5)
+        self.wait_for_dom_settled(timeout=0.5)
 
         # Confirm (si el absoluto falla, usa confirm genérico)
         ok4 = self.click_xpath_with_actions(CONFIRM_ABS, "Pasajeros: Confirm")
@@ -801,29 +900,31 @@ class HomePage(BasePage):
                 "//div[contains(@aria-label,'Click to select')]",
             ]
 
+            # La búsqueda termina cuando la API de disponibilidad deja de tener requests en vuelo
+            search_start = time.time()
+            search_timeout = self.timeout_for("Resultados de vuelos", 25)
+            wait_until = search_start + search_timeout
+            self.wait_for_network_idle(Config.NETWORK_IDLE_PATTERNS["flight_search"], timeout=search_timeout)
+
+            result_locators = [(By.XPATH, sel) for sel in result_selectors]
             found = False
-            wait_until = time.time() + 25
             while time.time() < wait_until and not found:
-                for sel in result_selectors:
-                    try:
-                        elems = self.driver.find_elements(By.XPATH, sel)
-                        if elems and len(elems) > 0:
-                            logger.info(f"✓ Resultados detectados con selector: {sel}")
-                            found = True
-                            break
-                    except Exception:
-                        continue
-                if not found:
+                locator, _ = self.find_first(result_locators)
+                if locator:
+                    logger.info(f"✓ Resultados detectados con selector: {locator[1]}")
+                    found = True
+                else:
                     # forzar scroll para cargar resultados lazy
                     try:
                         self.driver.execute_script("window.scrollBy(0,300);")
                     except Exception:
                         pass
                     time.sleep(0.6)
+            self.record_wait("Resultados de vuelos", search_start, found)
 
             if not found:
                 logger.warning("No se detectaron resultados de vuelos tras Search")
-                self.take_screenshot("csv_search_no_results")
+                self.take_screenshot("csv_search_no_results", kind="failure")
                 # continuar de todos modos (algunos flujos muestran select después)
 
             self.take_screenshot("csv_search_clicked")
@@ -858,7 +959,7 @@ class HomePage(BasePage):
                         el = elements[0]
                         # Scroll y click
                         self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", el)
-                        time.sleep(0.5)
+                        self.wait_for_dom_settled(timeout=0.5)
                         actions = ActionChains(self.driver)
                         actions.move_to_element(el).pause(0.3).click().perform()
                         price_clicked = True
@@ -872,7 +973,7 @@ class HomePage(BasePage):
                 logger.warning("⚠️ No se pudo hacer clic en precio, intentando continuación directa...")
                 # Continuar de todas formas
                 
-            time.sleep(2.0)
+            self.wait_for_dom_settled(timeout=2.0)
             self.take_screenshot("csv_fare_selected")
 
             # Paso 20: Click en Select (Basic) - también ser más flexible
@@ -896,7 +997,7 @@ class HomePage(BasePage):
                         logger.info(f"    ✓ Encontrado {len(elements)} elemento(s)")
                         el = elements[0]
                         self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", el)
-                        time.sleep(0.5)
+                        self.wait_for_dom_settled(timeout=0.5)
                         actions = ActionChains(self.driver)
                         actions.move_to_element(el).pause(0.3).click().perform()
                         basic_clicked = True
@@ -909,7 +1010,7 @@ class HomePage(BasePage):
             if not basic_clicked:
                 logger.warning("⚠️ No se pudo seleccionar tarifa Basic, continuando...")
                 
-            time.sleep(2.0)
+            self.wait_for_dom_settled(timeout=2.0)
             self.take_screenshot("csv_fare_selected_after_click")
 
             # Paso 22: Continue - también flexibilizar
@@ -933,7 +1034,7 @@ class HomePage(BasePage):
                         logger.info(f"    ✓ Encontrado {len(elements)} elemento(s)")
                         el = elements[0]
                         self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", el)
-                        time.sleep(0.5)
+                        self.wait_for_dom_settled(timeout=0.5)
                         actions = ActionChains(self.driver)
                         actions.move_to_element(el).pause(0.3).click().perform()
                         continue_clicked = True
@@ -947,7 +1048,7 @@ class HomePage(BasePage):
                 logger.error("No se pudo encontrar botón Continue")
                 return False
                 
-            time.sleep(2.0)
+            self.wait_for_dom_settled(timeout=2.0)
             self.take_screenshot("csv_continue_clicked")
             
             logger.info("✅ Búsqueda, selección de tarifa y continuar completados exitosamente")
@@ -955,7 +1056,7 @@ class HomePage(BasePage):
             
         except Exception as e:
             logger.error(f"Error en search_select_fare_and_continue_from_csv: {e}")
-            self.take_screenshot(f"error_search_fare_{str(e)[:50]}")
+            self.take_screenshot(f"error_search_fare_{str(e)[:50]}", kind="failure")
             return False
     
 
@@ -967,11 +1068,11 @@ class HomePage(BasePage):
         try:
             self.click(self.ONE_WAY_LABEL)
             logger.info("One Way seleccionado por CSS selector")
-            time.sleep(2)
+            self.wait_for_dom_settled(timeout=2)
             return True
         except Exception as e:
             logger.error(f"Error crítico en select_one_way: {e}")
-            self.take_screenshot("one_way_critical_error")
+            self.take_screenshot("one_way_critical_error", kind="failure")
             return False
     
     @allure.step("Seleccionar Destino: {city} ({code})")
@@ -985,12 +1086,12 @@ class HomePage(BasePage):
             destination_field = self.wait_for_element(self.DESTINATION_INPUT, timeout=10)
             
             destination_field.click()
-            time.sleep(0.5)
+            self.wait_for_dom_settled(timeout=0.5)
             
             # 2. Limpiar y escribir
             destination_field.clear()
             destination_field.send_keys(code)
-            time.sleep(2)  # Esperar resultados
+            self.wait_for_dom_settled(timeout=2)  # Esperar resultados
             
             # 3. Buscar la opción
             # CSV sugiere: //span[contains(text(),'Medellin')]
@@ -1008,7 +1109,7 @@ class HomePage(BasePage):
                 
                 # Hacer clic
                 self.driver.execute_script("arguments[0].click();", option_element)
-                time.sleep(1)
+                self.wait_for_dom_settled(timeout=1)
                 
                 # Verificar
                 current_value = destination_field.get_attribute('value')
@@ -1026,7 +1127,7 @@ class HomePage(BasePage):
                     )
                     logger.info(f"Opción alternativa encontrada: {alt_option.text}")
                     alt_option.click()
-                    time.sleep(1)
+                    self.wait_for_dom_settled(timeout=1)
                     return True
                 except Exception as e2:
                     logger.error(f"No se encontró ninguna opción para {city} o {code}: {e2}")
@@ -1034,7 +1135,7 @@ class HomePage(BasePage):
                 
         except Exception as e:
             logger.error(f"Error seleccionando destino: {e}")
-            self.take_screenshot("destination_selection_error")
+            self.take_screenshot("destination_selection_error", kind="failure")
             return False
 
     @allure.step("Seleccionar Fecha: día {day}")
@@ -1057,7 +1158,7 @@ class HomePage(BasePage):
                 logger.info(f"Seleccionando día específico: {day}")
 
             # Esperar a que el calendario esté visible
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
 
             # Buscar el día usando el selector basado en la estructura HTML
             # Según la imagen: span._ngcontent-hic-c18 class="custom-day_day"
@@ -1089,19 +1190,19 @@ class HomePage(BasePage):
                         if 'disabled' not in parent_class and 'ng-star-inserted' in parent_class:
                             # Hacer scroll al elemento
                             self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", d)
-                            time.sleep(0.5)
+                            self.wait_for_dom_settled(timeout=0.5)
 
                             # Intentar clic normal
                             try:
                                 d.click()
                                 logger.info(f"✓ Fecha seleccionada: Día {day}")
-                                time.sleep(1)
+                                self.wait_for_dom_settled(timeout=1)
                                 return True
                             except:
                                 # Intentar con JavaScript
                                 self.driver.execute_script("arguments[0].click();", d)
                                 logger.info(f"✓ Fecha seleccionada con JavaScript: Día {day}")
-                                time.sleep(1)
+                                self.wait_for_dom_settled(timeout=1)
                                 return True
                 except Exception as e:
                     logger.debug(f"Día no clickeable: {e}")
@@ -1112,7 +1213,7 @@ class HomePage(BasePage):
 
         except Exception as e:
             logger.error(f"Error seleccionando fecha {day}: {e}")
-            self.take_screenshot("date_selection_error")
+            self.take_screenshot("date_selection_error", kind="failure")
             return False
     
     @allure.step("Configurar pasajeros")
@@ -1159,7 +1260,7 @@ class HomePage(BasePage):
                 logger.error(f"Error abriendo dropdown: {e}")
                 return False
             
-            time.sleep(2)
+            self.wait_for_dom_settled(timeout=2)
             self.take_screenshot("passengers_dropdown_open")
             
             # ==================== PASO 2: VERIFICAR MODAL ABIERTO ====================
@@ -1188,7 +1289,7 @@ class HomePage(BasePage):
                 # Intentar abrir de nuevo
                 try:
                     passenger_btn.click()
-                    time.sleep(2)
+                    self.wait_for_dom_settled(timeout=2)
                 except:
                     pass
             
@@ -1260,14 +1361,14 @@ class HomePage(BasePage):
                         actions = ActionChains(self.driver)
                         actions.send_keys(Keys.ENTER).perform()
                         logger.info("✓ ENTER presionado")
-                        time.sleep(1)
+                        self.wait_for_dom_settled(timeout=1)
                     except:
                         pass
             
             # ==================== PASO 5: VERIFICAR RESULTADO ====================
             logger.info("=== PASO 5: Verificando resultado ===")
             
-            time.sleep(2)
+            self.wait_for_dom_settled(timeout=2)
             self.take_screenshot("passengers_final")
             
             # Verificar que el modal se cerró
@@ -1288,7 +1389,7 @@ class HomePage(BasePage):
                     logger.warning("Modal aún visible, intentando cerrar con ESC...")
                     actions = ActionChains(self.driver)
                     actions.send_keys(Keys.ESCAPE).perform()
-                    time.sleep(1)
+                    self.wait_for_dom_settled(timeout=1)
             except:
                 pass
             
@@ -1327,7 +1428,7 @@ class HomePage(BasePage):
             
         except Exception as e:
             logger.error(f"❌ Error crítico: {e}")
-            self.take_screenshot("passengers_critical_error")
+            self.take_screenshot("passengers_critical_error", kind="failure")
             return False
 
     def _add_passenger_type(self, position, ptype, count):
@@ -1348,7 +1449,7 @@ class HomePage(BasePage):
                 self.driver.execute_script("arguments[0].click();", plus_btn)
                 logger.info(f"✓ +{ptype} ({i+1}/{count})")
                 added += 1
-                time.sleep(0.5)
+                self.wait_for_dom_settled(timeout=0.5)
                 
             except Exception as e:
                 logger.warning(f"✗ No se pudo agregar {ptype} {i+1}: {e}")
@@ -1440,7 +1541,7 @@ class HomePage(BasePage):
             pass
 
         # Si llegamos aquí, no se pudo iniciar búsqueda
-        self.take_screenshot("search_button_click_failed")
+        self.take_screenshot("search_button_click_failed", kind="failure")
         return False
     
     @allure.step("Seleccionar origen - {city} ({code})")
@@ -1452,12 +1553,12 @@ class HomePage(BasePage):
             # Localizar y hacer clic en el campo de origen
             origin_field = self.wait_for_element(self.ORIGIN_INPUT, timeout=10)
             origin_field.click()
-            time.sleep(0.5)
+            self.wait_for_dom_settled(timeout=0.5)
 
             # Limpiar y escribir
             origin_field.clear()
             origin_field.send_keys(code)
-            time.sleep(2)  # Esperar resultados
+            self.wait_for_dom_settled(timeout=2)  # Esperar resultados
 
             # Buscar la opción
             option_xpath = f"//span[contains(text(), '{city}') or contains(text(), '{code}')]"
@@ -1465,7 +1566,7 @@ class HomePage(BasePage):
             try:
                 option_element = self.wait_for_element((By.XPATH, option_xpath), timeout=5)
                 self.driver.execute_script("arguments[0].click();", option_element)
-                time.sleep(1)
+                self.wait_for_dom_settled(timeout=1)
                 logger.info(f"✓ Origen {city} seleccionado")
                 return True
             except:
@@ -1518,7 +1619,7 @@ class HomePage(BasePage):
                 logger.error("No se encontró el control para abrir el selector de POS")
                 return False
 
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
 
             # 4) Seleccionar país por nombre (span normalizado)
             country_locator = (By.XPATH, f"//span[normalize-space()='{pos}']")
@@ -1541,10 +1642,10 @@ class HomePage(BasePage):
 
             if not selected:
                 logger.error(f"No se encontró la opción POS para: {pos}")
-                self.take_screenshot("pos_option_not_found")
+                self.take_screenshot("pos_option_not_found", kind="failure")
                 return False
 
-            time.sleep(0.6)
+            self.wait_for_dom_settled(timeout=0.6)
 
             # 5) Pulsar Apply (varias alternativas)
             apply_locator = (By.XPATH, "//span[contains(text(),'Apply')]")
@@ -1564,13 +1665,13 @@ class HomePage(BasePage):
                 except Exception as e:
                     logger.error(f"Error intentando pulsar Apply: {e}")
 
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             logger.info(f"POS '{pos}' seleccionado correctamente")
             return True
 
         except Exception as e:
             logger.error(f"Error seleccionando POS: {e}")
-            self.take_screenshot("pos_selection_error")
+            self.take_screenshot("pos_selection_error", kind="failure")
             return False
 
     @allure.step("Complete home page configuration")
@@ -1591,38 +1692,38 @@ class HomePage(BasePage):
         # 1. Seleccionar idioma
         with allure.step(f"1. Seleccionar idioma: {language}"):
             success &= self.select_language(language)
-            time.sleep(2)
+            self.wait_for_dom_settled(timeout=2)
 
         # 2. Seleccionar POS
         with allure.step(f"2. Seleccionar POS: {pos}"):
             success &= self.select_pos_simple(pos)
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
 
         # 3. Seleccionar tipo de viaje: One way
         with allure.step("3. Seleccionar One Way"):
             success &= self.select_one_way()
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
 
         # 4. Seleccionar origen
         with allure.step(f"4. Seleccionar origen: {origin_city}"):
             success &= self.select_origin(origin_city, origin_code)
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
 
         # 5. Seleccionar destino
         with allure.step(f"5. Seleccionar destino: {dest_city}"):
             success &= self.select_destination_simple(dest_city, dest_code)
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
 
         # 6. Seleccionar fecha (2 días después de hoy si no se especifica)
         date_str = "automática (2 días después)" if day is None else f"día {day}"
         with allure.step(f"6. Seleccionar fecha: {date_str}"):
             success &= self.select_date(day)
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
 
         # 7. Configurar pasajeros (1 Adulto, 1 Joven, 1 Niño, 1 Infante)
         with allure.step("7. Configurar pasajeros: 1 Adulto, 1 Joven, 1 Niño, 1 Infante"):
             success &= self.configure_passengers(adults=1, youths=1, children=1, infants=1)
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
 
         # 8. Buscar vuelos
         with allure.step("8. Buscar vuelos"):
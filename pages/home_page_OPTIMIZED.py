@@ -81,14 +81,8 @@ class HomePage(BasePage):
             # PASO 1: Abrir dropdown de idiomas con ActionChains
             logger.info("PASO 1: Abriendo dropdown de idiomas con ActionChains")
             
-            dropdown = None
-            for selector in [self.LANGUAGE_DROPDOWN, self.LANGUAGE_DROPDOWN_BUTTON]:
-                try:
-                    dropdown = self.wait_for_element(selector, timeout=5)
-                    if dropdown:
-                        break
-                except:
-                    continue
+            _, dropdown = self.wait_for_first([self.LANGUAGE_DROPDOWN, self.LANGUAGE_DROPDOWN_BUTTON],
+                                              "Dropdown de idiomas", timeout=5, evidence=True)
             
             if not dropdown:
                 logger.error("❌ Dropdown de idiomas no encontrado")
@@ -99,31 +93,24 @@ class HomePage(BasePage):
                 "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", 
                 dropdown
             )
-            time.sleep(0.5)
+            self.wait_for_dom_settled(timeout=0.5)
             
             # ActionChains: hover + click en dropdown
             actions = ActionChains(self.driver)
             
             logger.info("  → Moviendo cursor al dropdown de idiomas...")
-            actions.move_to_element(dropdown).pause(0.5).perform()
-            time.sleep(0.5)
+            actions.move_to_element(dropdown).pause(self.visual_delay(0.5)).perform()
+            self.wait_for_dom_settled(timeout=0.5)
             
             # Resaltar dropdown
-            try:
-                self.driver.execute_script(
-                    "arguments[0].style.border = '2px solid #00BFFF';"
-                    "arguments[0].style.boxShadow = '0 0 8px #00BFFF';",
-                    dropdown
-                )
-                time.sleep(0.5)
-            except:
-                pass
+            self.highlight(dropdown, "border: 2px solid #00BFFF; box-shadow: 0 0 8px #00BFFF")
+            self.visual_pause(0.5)
             
             logger.info("  → Haciendo click en dropdown...")
             actions.click(dropdown).perform()
             
             logger.info("✓ Dropdown abierto con ActionChains")
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             
             # PASO 2: Seleccionar idioma específico con ActionChains
             logger.info(f"PASO 2: Seleccionando {language_info['display']} con ActionChains")
@@ -139,25 +126,18 @@ class HomePage(BasePage):
                 "arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", 
                 language_option
             )
-            time.sleep(0.5)
+            self.wait_for_dom_settled(timeout=0.5)
             
             # ActionChains: hover + resaltar + click
             logger.info(f"  → Moviendo cursor a {language_info['display']}...")
-            actions.move_to_element(language_option).pause(0.5).perform()
-            time.sleep(0.5)
+            actions.move_to_element(language_option).pause(self.visual_delay(0.5)).perform()
+            self.wait_for_dom_settled(timeout=0.5)
             
             # Resaltar opción de idioma
-            try:
-                self.driver.execute_script(
-                    "arguments[0].style.border = '3px solid #00FF00';"
-                    "arguments[0].style.boxShadow = '0 0 10px #00FF00';"
-                    "arguments[0].style.backgroundColor = 'rgba(0, 255, 0, 0.1)';",
-                    language_option
-                )
+            if self.highlight(language_option, "border: 3px solid #00FF00; box-shadow: 0 0 10px #00FF00; "
+                                               "background-color: rgba(0, 255, 0, 0.1)") is not None:
                 logger.info(f"  → {language_info['display']} resaltado visualmente")
-                time.sleep(1)
-            except:
-                pass
+                self.visual_pause(1)
             
             logger.info(f"  → Haciendo click en {language_info['display']}...")
             actions.click(language_option).perform()
@@ -166,13 +146,13 @@ class HomePage(BasePage):
             self.take_screenshot(f"language_selected_{language_normalized}")
             
             logger.info(f"✅ Idioma {language_info['display']} seleccionado con ActionChains")
-            time.sleep(2)  # Esperar que se aplique el cambio
+            self.wait_for_dom_settled(timeout=2)  # Esperar que se aplique el cambio
             
             return True
             
         except Exception as e:
             logger.error(f"Error seleccionando idioma: {e}")
-            self.take_screenshot(f"language_error_{language_normalized}")
+            self.take_screenshot(f"language_error_{language_normalized}", kind="failure")
             return False
     
     @allure.step("Verificar cambio de idioma: {expected_language}")
@@ -226,7 +206,7 @@ class HomePage(BasePage):
                 
                 # Verificación adicional: verificar el dropdown de idiomas
                 try:
-                    dropdown = self.wait_for_element(self.LANGUAGE_DROPDOWN, timeout=3)
+                    dropdown = self.probe(self.LANGUAGE_DROPDOWN, timeout=3)
                     if dropdown:
                         dropdown_text = dropdown.text.lower().strip()
                         logger.info(f"Texto del dropdown: '{dropdown_text}'")
@@ -293,7 +273,7 @@ class HomePage(BasePage):
             # Intentos para abrir POS
             for selector in [self.POS_HEADER_SELECTOR, self.POS_DROPDOWN, self.POS_LIST_BUTTON]:
                 try:
-                    if self.wait_for_element(selector, timeout=5):
+                    if self.probe(selector, timeout=5):
                         self.click(selector, "POS selector")
                         opened = True
                         logger.info("✓ POS selector abierto")
@@ -305,7 +285,7 @@ class HomePage(BasePage):
                 logger.warning(f"No se encontró el control para abrir el selector de POS, continuando sin seleccionar...")
                 return True
             
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             
             # Seleccionar país
             country_locator = (By.XPATH, f"//span[normalize-space()='{pos}']")
@@ -317,7 +297,7 @@ class HomePage(BasePage):
             selected = False
             for loc in try_list:
                 try:
-                    if self.wait_for_element(loc, timeout=5):
+                    if self.probe(loc, timeout=5):
                         self.click(loc, f"POS option {pos}")
                         selected = True
                         logger.info(f"✓ POS {pos} seleccionado")
@@ -329,12 +309,12 @@ class HomePage(BasePage):
                 logger.warning(f"No se encontró la opción POS para: {pos}, continuando...")
                 return True
             
-            time.sleep(0.6)
+            self.wait_for_dom_settled(timeout=0.6)
             
             # Apply
             apply_locator = (By.XPATH, "//span[contains(text(),'Apply')]")
             try:
-                if self.wait_for_element(apply_locator, timeout=5):
+                if self.probe(apply_locator, timeout=5):
                     self.click(apply_locator, "Apply button")
                     logger.info("✓ Apply presionado")
                 else:
@@ -348,7 +328,7 @@ class HomePage(BasePage):
             except Exception as e:
                 logger.warning(f"Error pulsando Apply: {e}")
             
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             logger.info(f"✓ POS '{pos}' configurado correctamente")
             return True
         
@@ -362,7 +342,7 @@ class HomePage(BasePage):
         try:
             self.click(self.ONE_WAY_LABEL, "One Way")
             logger.info("✓ One Way seleccionado")
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             return True
         except Exception as e:
             logger.error(f"Error en select_one_way: {e}")
@@ -376,13 +356,13 @@ class HomePage(BasePage):
         try:
             origin_field = self.wait_for_element(self.ORIGIN_INPUT, timeout=10)
             self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", origin_field)
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             self.driver.execute_script("arguments[0].click();", origin_field)
-            time.sleep(0.5)
+            self.wait_for_dom_settled(timeout=0.5)
             origin_field.clear()
             time.sleep(0.3)
             origin_field.send_keys(code)
-            time.sleep(2)
+            self.wait_for_dom_settled(timeout=2)
             
             option_xpath = f"//span[contains(text(), '{city}') or contains(text(), '{code}')]"
             try:
@@ -390,12 +370,12 @@ class HomePage(BasePage):
                     EC.element_to_be_clickable((By.XPATH, option_xpath))
                 )
                 self.driver.execute_script("arguments[0].click();", option_element)
-                time.sleep(1)
+                self.wait_for_dom_settled(timeout=1)
                 logger.info(f"✓ Origen {city} ({code}) seleccionado")
                 return True
             except:
                 origin_field.send_keys(Keys.ENTER)
-                time.sleep(1)
+                self.wait_for_dom_settled(timeout=1)
                 logger.info("✓ Origen seleccionado con ENTER")
                 return True
         except Exception as e:
@@ -410,15 +390,15 @@ class HomePage(BasePage):
         try:
             destination_field = self.wait_for_element(self.DESTINATION_INPUT, timeout=10)
             self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", destination_field)
-            time.sleep(0.5)
+            self.wait_for_dom_settled(timeout=0.5)
             
             actions = ActionChains(self.driver)
             actions.move_to_element(destination_field).click().perform()
-            time.sleep(0.5)
+            self.wait_for_dom_settled(timeout=0.5)
             actions.click(destination_field).key_down(Keys.CONTROL).send_keys('a').key_up(Keys.CONTROL).send_keys(Keys.DELETE).perform()
             time.sleep(0.3)
             actions.send_keys(code).perform()
-            time.sleep(2)
+            self.wait_for_dom_settled(timeout=2)
             
             option_xpath = f"//span[contains(text(), '{city}')]"
             try:
@@ -426,12 +406,12 @@ class HomePage(BasePage):
                     EC.element_to_be_clickable((By.XPATH, option_xpath))
                 )
                 actions.move_to_element(option_element).click().perform()
-                time.sleep(1)
+                self.wait_for_dom_settled(timeout=1)
                 logger.info(f"✓ Destino {city} ({code}) seleccionado con ActionChains")
                 return True
             except:
                 actions.send_keys(Keys.ENTER).perform()
-                time.sleep(1)
+                self.wait_for_dom_settled(timeout=1)
                 logger.info("✓ Destino seleccionado con ENTER (ActionChains)")
                 return True
         except Exception as e:
@@ -449,7 +429,7 @@ class HomePage(BasePage):
                 day = str(target_date.day)
                 logger.info(f"Seleccionando fecha automática con ActionChains: {target_date.strftime('%d/%m/%Y')}")
             
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             xpath_day = f"//span[contains(@class, 'custom-day_day') and normalize-space(text())='{day}']"
             
             WebDriverWait(self.driver, 10).until(
@@ -465,16 +445,16 @@ class HomePage(BasePage):
                         parent_class = d.find_element(By.XPATH, "./ancestor::div[contains(@class, 'ngb-dp-day')]").get_attribute('class')
                         if 'disabled' not in parent_class:
                             self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", d)
-                            time.sleep(0.5)
+                            self.wait_for_dom_settled(timeout=0.5)
                             try:
                                 actions.move_to_element(d).click().perform()
                                 logger.info(f"✓ Fecha seleccionada con ActionChains: Día {day}")
-                                time.sleep(1)
+                                self.wait_for_dom_settled(timeout=1)
                                 return True
                             except:
                                 self.driver.execute_script("arguments[0].click();", d)
                                 logger.info(f"✓ Fecha seleccionada con JavaScript: Día {day}")
-                                time.sleep(1)
+                                self.wait_for_dom_settled(timeout=1)
                                 return True
                 except:
                     continue
@@ -513,7 +493,7 @@ class HomePage(BasePage):
                 return False
             
             self.driver.execute_script("arguments[0].click();", passenger_btn)
-            time.sleep(2)
+            self.wait_for_dom_settled(timeout=2)
             
             passenger_map = {
                 'youths': {'position': 2, 'count': youths},
@@ -529,7 +509,7 @@ class HomePage(BasePage):
                 self._add_passenger_type(1, "Adultos", adults - 1)
             
             self._confirm_passenger_selection()
-            time.sleep(2)
+            self.wait_for_dom_settled(timeout=2)
             
             logger.info(f"✅ Configuración de pasajeros completada")
             return True
@@ -548,7 +528,7 @@ class HomePage(BasePage):
                 )
                 self.driver.execute_script("arguments[0].click();", plus_btn)
                 added += 1
-                time.sleep(0.5)
+                self.wait_for_dom_settled(timeout=0.5)
             except:
                 break
         return added
@@ -578,7 +558,7 @@ class HomePage(BasePage):
         result = self.click(self.SEARCH_BUTTON, "Search flights")
         if result:
             logger.info("✓ Búsqueda iniciada")
-            time.sleep(3)
+            self.wait_for_dom_settled(timeout=3)
         return result
     
     @allure.step("Configuración completa de Home Page")
@@ -594,42 +574,42 @@ class HomePage(BasePage):
         with allure.step(f"1. Seleccionar idioma: {language}"):
             if not self.select_language(language):
                 logger.warning("⚠️ Error en idioma, continuando...")
-            time.sleep(2)
+            self.wait_for_dom_settled(timeout=2)
         
         if pos:
             with allure.step(f"2. Seleccionar POS: {pos}"):
                 self.select_pos_simple(pos)
-                time.sleep(1)
+                self.wait_for_dom_settled(timeout=1)
         
         with allure.step("3. Seleccionar One Way"):
             if not self.select_one_way():
                 logger.error("❌ Error en One Way")
                 success = False
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
         
         with allure.step(f"4. Seleccionar origen: {origin_city} ({origin_code})"):
             if not self.select_origin(origin_city, origin_code):
                 logger.error("❌ Error en origen")
                 success = False
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
         
         with allure.step(f"5. Seleccionar destino: {dest_city} ({dest_code})"):
             if not self.select_destination_simple(dest_city, dest_code):
                 logger.error("❌ Error en destino")
                 success = False
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
         
         date_str = "automática (2 días después)" if day is None else f"día {day}"
         with allure.step(f"6. Seleccionar fecha: {date_str}"):
             if not self.select_date(day):
                 logger.error("❌ Error en fecha")
                 success = False
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
         
         with allure.step("7. Configurar pasajeros"):
             if not self.configure_passengers(adults=1, youths=1, children=1, infants=1):
                 logger.warning("⚠️ Error en pasajeros, continuando...")
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
         
         with allure.step("8. Buscar vuelos"):
             if not self.search_flights():
@@ -17,6 +17,14 @@ class PassengersPage(BasePage):
     Incluye helpers para trabajar por 'anchor' (IDs dinámicos del CSV).
     """
 
+    # Lista cuando aparece el bloque de contacto o el título de pasajeros
+    READY_SCRIPT = """
+        if (document.querySelector('booking-contact-custom')) { return true; }
+        return Array.prototype.some.call(document.querySelectorAll('h1'), function (h) {
+            return /Passengers|Pasajeros/.test(h.textContent);
+        });
+    """
+
     # ==================== Espera de carga ====================
 
     @allure.step("Passengers: esperar carga")
@@ -49,7 +57,7 @@ class PassengersPage(BasePage):
         self.driver.execute_script("arguments[0].scrollIntoView({behavior:'instant',block:'center'});", el)
         el.clear()
         el.send_keys(value)
-        time.sleep(0.3)  # Pequeña pausa para permitir visualización de entrada
+        self.visual_pause(0.3)  # Pequeña pausa para permitir visualización de entrada
         return el
 
     def _click_option_text(self, text, timeout=6):
@@ -182,10 +190,10 @@ class PassengersPage(BasePage):
         self._click_by_id(f"IdDocNationality_{a['anchor']}"); self._click_option_text(a["nat"])
         logger.info("  Customer Program: Not applicable")
         self._click_customer_program_in_container(a["anchor"])
-        time.sleep(0.5)
+        self.wait_for_dom_settled(timeout=0.5)
         logger.info("✅ ADULTO completado")
         self.take_screenshot("03_passengers_adult_completed")
-        time.sleep(1.0)  # Pausa para validación visual
+        self.visual_pause(1.0)  # Pausa para validación visual
 
         # ---- 2) Youth (E31) ----
         logger.info("\n=== Llenando YOUTH ===")
@@ -202,10 +210,10 @@ class PassengersPage(BasePage):
         self._click_by_id(f"IdDocNationality_{y['anchor']}"); self._click_option_text(y["nat"])
         logger.info("  Customer Program: Not applicable")
         self._click_customer_program_in_container(y["anchor"])
-        time.sleep(0.5)
+        self.wait_for_dom_settled(timeout=0.5)
         logger.info("✅ YOUTH completado")
         self.take_screenshot("03_passengers_youth_completed")
-        time.sleep(1.0)  # Pausa para validación visual
+        self.visual_pause(1.0)  # Pausa para validación visual
 
         # ---- 3) Child (E33) ----
         logger.info("\n=== Llenando CHILD ===")
@@ -222,10 +230,10 @@ class PassengersPage(BasePage):
         self._click_by_id(f"IdDocNationality_{c['anchor']}"); self._click_option_text(c["nat"])
         logger.info("  Customer Program: Not applicable")
         self._click_customer_program_in_container(c["anchor"])
-        time.sleep(0.5)
+        self.wait_for_dom_settled(timeout=0.5)
         logger.info("✅ CHILD completado")
         self.take_screenshot("03_passengers_child_completed")
-        time.sleep(1.0)  # Pausa para validación visual
+        self.visual_pause(1.0)  # Pausa para validación visual
 
         # ---- 4) Infant (E34) ----
         logger.info("\n=== Llenando INFANT ===")
@@ -242,10 +250,10 @@ class PassengersPage(BasePage):
         self._click_by_id(f"IdDocNationality_{i['anchor']}"); self._click_option_text(i["nat"])
         logger.info("  Customer Program: Not applicable")
         self._click_customer_program_in_container(i["anchor"])
-        time.sleep(0.5)
+        self.wait_for_dom_settled(timeout=0.5)
         logger.info("✅ INFANT completado")
         self.take_screenshot("03_passengers_infant_completed")
-        time.sleep(1.0)  # Pausa para validación visual
+        self.visual_pause(1.0)  # Pausa para validación visual
 
         # ---- 5) Contacto (global) ----
         logger.info("\n=== Llenando CONTACTO ===")
@@ -266,10 +274,10 @@ class PassengersPage(BasePage):
             except Exception:
                 pass
 
-        time.sleep(0.5)
+        self.wait_for_dom_settled(timeout=0.5)
         logger.info("✅ CONTACTO completado")
         self.take_screenshot("passengers_csv_static_filled")
-        time.sleep(1.0)  # Pausa final antes de continuar
+        self.wait_for_dom_settled(timeout=1.0)  # Pausa final antes de continuar
         return True
 
     # ==================== Continuar a Services ====================
@@ -283,8 +291,8 @@ class PassengersPage(BasePage):
                 ))
             )
             self._js_click(cont)
-            time.sleep(2.0)
+            self.wait_for_dom_settled(timeout=2.0)
             return True
         except Exception as e:
             logger.error(f"No se pudo continuar a Services: {e}")
-            self.take_screenshot("continue_services_error")
+            self.take_screenshot("continue_services_error", kind="failure")
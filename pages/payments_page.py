@@ -3,7 +3,6 @@ Page Object para página de pagos
 """
 from selenium.webdriver.common.by import By
 import allure
-import time
 from pages.base_page import BasePage
 from utils.logger import logger
 
@@ -140,7 +139,7 @@ class PaymentsPage(BasePage):
         
         # Aceptar términos primero
         self.accept_terms()
-        time.sleep(0.5)
+        self.wait_for_dom_settled(timeout=0.5)
         
         # Realizar pago
         return self.click(self.PAY_NOW_BUTTON, "Pagar ahora")
@@ -185,16 +184,16 @@ class PaymentsPage(BasePage):
     def verify_payment_summary(self):
         """Verificar el resumen de pago"""
         try:
-            summary = self.wait_for_element(self.PAYMENT_SUMMARY, "Resumen de pago", timeout=5)
-            if summary:
-                summary_text = summary.text
+            # Resumen o, si no aparece, el total (una sola espera y una sola evidencia)
+            locator, element = self.wait_for_first([self.PAYMENT_SUMMARY, self.TOTAL_AMOUNT],
+                                                   "Resumen de pago", timeout=5, evidence=True)
+            if locator == self.PAYMENT_SUMMARY:
+                summary_text = element.text
                 logger.info(f"Resumen de pago: {summary_text}")
                 return summary_text
             
-            # También verificar el total
-            total = self.wait_for_element(self.TOTAL_AMOUNT, "Total a pagar", timeout=5)
-            if total:
-                total_text = total.text
+            if locator == self.TOTAL_AMOUNT:
+                total_text = element.text
                 logger.info(f"Total a pagar: {total_text}")
                 return total_text
             
@@ -208,16 +207,15 @@ class PaymentsPage(BasePage):
     def verify_payment_message(self):
         """Verificar mensaje de pago"""
         try:
-            # Verificar mensaje de éxito
-            success_msg = self.wait_for_element(self.SUCCESS_MESSAGE, "Mensaje éxito", timeout=10)
-            if success_msg:
-                logger.info(f"Mensaje de éxito: {success_msg.text}")
+            # El primero que aparezca: mensaje de éxito o de error
+            locator, message = self.wait_for_first([self.SUCCESS_MESSAGE, self.ERROR_MESSAGE],
+                                                   "Mensaje de pago", timeout=10, evidence=True)
+            if locator == self.SUCCESS_MESSAGE:
+                logger.info(f"Mensaje de éxito: {message.text}")
                 return "success"
             
-            # Verificar mensaje de error
-            error_msg = self.wait_for_element(self.ERROR_MESSAGE, "Mensaje error", timeout=10)
-            if error_msg:
-                logger.info(f"Mensaje de error: {error_msg.text}")
+            if locator == self.ERROR_MESSAGE:
+                logger.info(f"Mensaje de error: {message.text}")
                 return "error"
             
             logger.warning("No se encontró mensaje de pago")
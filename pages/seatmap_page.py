@@ -4,8 +4,6 @@ Page Object para selección de asientos
 from selenium.webdriver.common.by import By
 import allure
 import time
-import os
-from datetime import datetime
 from pages.base_page import BasePage
 from utils.logger import logger
 from utils.config import Config
@@ -13,6 +11,11 @@ from utils.config import Config
 class SeatmapPage(BasePage):
     """Página de selección de asientos"""
     
+    # Lista cuando el contenedor del mapa de asientos está en el DOM
+    READY_SCRIPT = """
+        return !!document.querySelector("#seatmap-container, [id*='seatmap'], [class*='seatmap']");
+    """
+    
     # ==================== LOCATORS ====================
     
     # Mapa de asientos
@@ -40,7 +43,7 @@ class SeatmapPage(BasePage):
 
         - Amplía el timeout por defecto a 35s.
         - Añade detectores alternativos (`iframe`, `canvas`).
-        - En caso de timeout, guarda un volcado HTML para diagnóstico.
+        - En caso de timeout, captura una sola vez screenshot y volcado HTML para diagnóstico.
         """
         logger.info("Esperando carga del mapa de asientos")
 
@@ -56,39 +59,15 @@ class SeatmapPage(BasePage):
             (By.XPATH, "//*[contains(@class,'seat') and contains(@class,'available')]")
         ]
 
-        end_time = time.time() + timeout
-        while time.time() < end_time:
-            for loc in candidate_locators:
-                try:
-                    el = self.wait_for_element(loc, "Mapa de asientos (chequeo rápido)", timeout=1)
-                    if el:
-                        logger.info(f"✓ Mapa detectado con selector: {loc}")
-                        return el
-                except Exception:
-                    # seguir intentando con otros selectores
-                    continue
-            time.sleep(0.5)
-
-        # En caso de timeout, capturar evidencia adicional (screenshot ya lo hace wait_for_element);
-        # además volcar page_source para ayudar al diagnóstico.
-        logger.error("❌ Timeout esperando elemento: Mapa de asientos")
-        try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"timeout_seatmap_{timestamp}.html"
-            filepath = os.path.join(Config.SCREENSHOT_DIR, filename)
-            os.makedirs(Config.SCREENSHOT_DIR, exist_ok=True)
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(self.driver.page_source)
-            logger.info(f"Volcado HTML guardado: {filepath}")
-            # Adjuntar a Allure si es posible
-            try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    allure.attach(f.read(), name="timeout_seatmap_html", attachment_type=allure.attachment_type.HTML)
-            except Exception:
-                pass
-        except Exception as e:
-            logger.error(f"Error guardando volcado HTML: {e}")
-
+        start = time.time()
+        deadline = start + self.timeout_for("Carga mapa de asientos", timeout)
+        self.wait_for_network_idle(Config.NETWORK_IDLE_PATTERNS["seatmap"], timeout=deadline - time.time())
+        locator, el = self.wait_for_first(candidate_locators, "Mapa de asientos",
+                                          timeout=max(deadline - time.time(), 1), evidence=True)
+        self.record_wait("Carga mapa de asientos", start, el is not None)
+        if el:
+            logger.info(f"✓ Mapa detectado con selector: {locator}")
+            return el
         return None
     
     @allure.step("Seleccionar asiento tipo: {seat_type}")
@@ -118,7 +97,7 @@ class SeatmapPage(BasePage):
             logger.warning(f"No se encontró asiento {seat_type} disponible")
             
             # Intentar auto-selección
-            if self.wait_for_element(self.AUTO_SELECT_BUTTON, "Auto-select", timeout=3):
+            if self.probe(self.AUTO_SELECT_BUTTON, timeout=3):
                 logger.info("Usando auto-selección")
                 return self.click(self.AUTO_SELECT_BUTTON, "Auto-selectar asientos")
         
@@ -133,7 +112,7 @@ class SeatmapPage(BasePage):
         
         for seat_type in seat_types:
             # Esperar un momento entre selecciones
-            time.sleep(1)
+            self.wait_for_dom_settled(timeout=1)
             
             # Seleccionar asiento
             seat_success = self.select_seat_type(seat_type)
@@ -180,12 +159,12 @@ class SeatmapPage(BasePage):
         logger.info("Continuando a pagos")
         
         # Primero confirmar asientos si está disponible
-        if self.wait_for_element(self.CONFIRM_SEATS_BUTTON, "Confirmar", timeout=3):
+        if self.probe(self.CONFIRM_SEATS_BUTTON, timeout=3):
             return self.confirm_seats()
         
         # Si no hay confirmación, verificar si hay botón de continuar genérico
         continue_button = (By.XPATH, "//button[contains(text(), 'Continue') or contains(text(), 'Continuar')]")
-        if self.wait_for_element(continue_button, "Continuar", timeout=3):
+        if self.probe(continue_button, timeout=3):
             return self.click(continue_button, "Continuar")
         
         logger.warning("No se encontró botón para continuar")
@@ -4,8 +4,6 @@ Page Object para selección de servicios adicionales
 from selenium.webdriver.common.by import By
 import allure
 import time
-import os
-from datetime import datetime
 from pages.base_page import BasePage
 from utils.logger import logger
 from utils.config import Config
@@ -13,6 +11,13 @@ from utils.config import Config
 class ServicesPage(BasePage):
     """Página de servicios adicionales"""
     
+    # Lista cuando hay tarjetas de servicio o el botón Continue del flujo
+    READY_SCRIPT = """
+        return document.querySelectorAll(
+            "[class*='service-card'], button.page_button-primary-flow"
+        ).length > 0;
+    """
+    
     # ==================== LOCATORS ====================
     
     # Lounges
@@ -53,7 +58,7 @@ class ServicesPage(BasePage):
         success = self.click(self.LOUNGE_CHECKBOX, "Checkbox Lounge")
         
         if success:
-            time.sleep(0.5)
+            self.wait_for_dom_settled(timeout=0.5)
             success = self.click(self.LOUNGE_OPTION, "Opción Avianca Lounge")
         
         return success
@@ -66,7 +71,7 @@ class ServicesPage(BasePage):
         success = self.click(self.EXTRA_BAGGAGE_CHECKBOX, "Checkbox equipaje")
         
         if success:
-            time.sleep(0.5)
+            self.wait_for_dom_settled(timeout=0.5)
             if weight == 20:
                 success = self.click(self.BAGGAGE_OPTION_20KG, "20kg equipaje")
             elif weight == 30:
@@ -118,7 +123,7 @@ class ServicesPage(BasePage):
         logger.info("Saltando todos los servicios")
         
         # Intentar click en botón skip si existe
-        if self.wait_for_element(self.SKIP_SERVICES_BUTTON, "Botón skip", timeout=3):
+        if self.probe(self.SKIP_SERVICES_BUTTON, timeout=3):
             return self.click(self.SKIP_SERVICES_BUTTON, "Saltar servicios")
         
         # Si no hay botón skip, simplemente continuar
@@ -140,19 +145,13 @@ class ServicesPage(BasePage):
                 self.CONTINUE_BUTTON_ALT4,
             ]
             
-            continue_btn = None
-            for selector in continue_selectors:
-                try:
-                    continue_btn = self.driver.find_element(*selector)
-                    if continue_btn:
-                        logger.info(f"✓ Botón Continue encontrado con selector: {selector[1]}")
-                        break
-                except:
-                    continue
+            selector, continue_btn = self.find_first(continue_selectors)
+            if continue_btn:
+                logger.info(f"✓ Botón Continue encontrado con selector: {selector[1]}")
             
             if not continue_btn:
                 logger.error("No se encontró botón Continue en la página de servicios")
-                self.take_screenshot("error_continue_button_not_found_services")
+                self.take_screenshot("error_continue_button_not_found_services", kind="failure")
                 return False
             
             # Scroll al botón
@@ -176,7 +175,7 @@ class ServicesPage(BasePage):
 
             if not clicked:
                 logger.error("No se pudo hacer click en Continue")
-                self.take_screenshot("error_click_continue_to_seatmap")
+                self.take_screenshot("error_click_continue_to_seatmap", kind="failure")
                 return False
 
             logger.info("✓ Continue button clicked - Navegando a asientos")
@@ -192,46 +191,21 @@ class ServicesPage(BasePage):
             ]
 
             # Aumentar tiempo de espera para la carga dinámica del seatmap
-            end = time.time() + 45
-            found = False
-            while time.time() < end:
-                for chk in seatmap_checks:
-                    try:
-                        el = self.driver.find_element(*chk)
-                        if el and el.is_displayed():
-                            logger.info(f"✓ Mapa de asientos detectado con selector: {chk}")
-                            found = True
-                            break
-                    except:
-                        continue
-                if found:
-                    break
-                time.sleep(0.5)
-
-            if not found:
-                logger.error("❌ Timeout esperando elemento: Mapa de asientos")
-                # Capturar screenshot y volcado HTML para diagnóstico
-                self.take_screenshot("timeout_Mapa de asientos")
-                try:
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"timeout_services_seatmap_{timestamp}.html"
-                    filepath = os.path.join(Config.SCREENSHOT_DIR, filename)
-                    os.makedirs(Config.SCREENSHOT_DIR, exist_ok=True)
-                    with open(filepath, 'w', encoding='utf-8') as f:
-                        f.write(self.driver.page_source)
-                    logger.info(f"Volcado HTML guardado: {filepath}")
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            allure.attach(f.read(), name="timeout_services_seatmap_html", attachment_type=allure.attachment_type.HTML)
-                    except Exception:
-                        pass
-                except Exception as e:
-                    logger.error(f"Error guardando volcado HTML: {e}")
+            start = time.time()
+            deadline = start + self.timeout_for("Carga mapa de asientos", 45)
+            self.wait_for_network_idle(Config.NETWORK_IDLE_PATTERNS["seatmap"], timeout=deadline - time.time())
+            chk, el = self.wait_for_first(seatmap_checks, "Mapa de asientos",
+                                          timeout=max(deadline - time.time(), 1), visible=True,
+                                          evidence=True)
+            self.record_wait("Carga mapa de asientos", start, el is not None)
+            if el:
+                logger.info(f"✓ Mapa de asientos detectado con selector: {chk}")
+            else:
                 return False
 
             return True
             
         except Exception as e:
             logger.error(f"Error en click continuar a asientos: {e}")
-            self.take_screenshot("error_click_continue_to_seatmap")
+            self.take_screenshot("error_click_continue_to_seatmap", kind="failure")
             return False
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""
+Timeouts adaptativos derivados del historial de esperas (sin navegador)
+Comprueba el percentil × factor, los límites y la vuelta al timeout fijo tras un fallo
+"""
+import pytest
+import allure
+from utils.adaptive_timeouts import AdaptiveTimeouts
+
+
+def _history(db_path, durations, name="HomePage.Search"):
+    """Historial guardado por una ejecución anterior en modo record"""
+    recorder = AdaptiveTimeouts(mode="record", db_path=str(db_path))
+    for elapsed in durations:
+        recorder.record(name, elapsed, True)
+    recorder.flush()
+
+
+@allure.epic("FLYR Automation Suite")
+@allure.feature("Infraestructura")
+@allure.story("Timeouts adaptativos")
+class TestAdaptiveTimeouts:
+    """Historial SQLite de las esperas con nombre de las páginas"""
+
+    @allure.title("Acorta el timeout a p99 × factor del historial")
+    def test_derives_timeout_from_history(self, tmp_path):
+        db_path = tmp_path / "waits.sqlite3"
+        _history(db_path, [0.3] * 19 + [1.5])
+
+        adaptive = AdaptiveTimeouts(mode="enforce", db_path=str(db_path), factor=2.0, min_timeout=1)
+        assert adaptive.timeout_for("HomePage.Search", 12) == pytest.approx(3.0)
+
+    @allure.title("Respeta el mínimo, el timeout fijo y las muestras mínimas")
+    def test_clamps_and_requires_samples(self, tmp_path):
+        db_path = tmp_path / "waits.sqlite3"
+        _history(db_path, [0.1] * 10)
+        _history(db_path, [20.0] * 10, name="SeatmapPage.Mapa")
+        _history(db_path, [0.1] * 3, name="HomePage.Nuevo")
+
+        adaptive = AdaptiveTimeouts(mode="enforce", db_path=str(db_path), min_timeout=2, min_samples=10)
+        assert adaptive.timeout_for("HomePage.Search", 12) == 2
+        assert adaptive.timeout_for("SeatmapPage.Mapa", 35) == 35
+        assert adaptive.timeout_for("HomePage.Nuevo", 12) == 12
+
+    @allure.title("Tras un fallo vuelve al timeout fijo hasta el siguiente éxito")
+    def test_failure_restores_fixed_timeout(self, tmp_path):
+        db_path = tmp_path / "waits.sqlite3"
+        _history(db_path, [0.3] * 20)
+
+        adaptive = AdaptiveTimeouts(mode="enforce", db_path=str(db_path), min_timeout=1)
+        assert adaptive.timeout_for("HomePage.Search", 12) < 12
+        adaptive.record("HomePage.Search", 1.0, False)
+        assert adaptive.timeout_for("HomePage.Search", 12) == 12
+        adaptive.flush()
+
+        # La siguiente ejecución también parte del timeout fijo
+        assert AdaptiveTimeouts(mode="enforce", db_path=str(db_path)).timeout_for("HomePage.Search", 12) == 12
+        adaptive.record("HomePage.Search", 4.0, True)
+        assert adaptive.timeout_for("HomePage.Search", 12) < 12
+
+    @allure.title("En modo record no cambia ningún timeout")
+    def test_record_mode_keeps_fixed_timeouts(self, tmp_path):
+        db_path = tmp_path / "waits.sqlite3"
+        _history(db_path, [0.3] * 20)
+
+        assert AdaptiveTimeouts(mode="record", db_path=str(db_path)).timeout_for("HomePage.Search", 12) == 12
+
+    @allure.title("Las esperas registradas antes de cargar el historial cuentan en el percentil")
+    def test_records_before_load_are_kept(self, tmp_path):
+        db_path = tmp_path / "waits.sqlite3"
+        _history(db_path, [0.3] * 5)
+
+        adaptive = AdaptiveTimeouts(mode="enforce", db_path=str(db_path), min_timeout=1, min_samples=10)
+        for _ in range(5):
+            adaptive.record("HomePage.Search", 0.3, True)
+        assert adaptive.timeout_for("HomePage.Search", 12) < 12
@@ -1,17 +1,56 @@
 import pytest
 import allure
-import time
-from selenium.webdriver.common.by import By  # ¡IMPORTANTE! Falta este import
 from pages.home_page import HomePage
+from utils.link_verifier import LinkVerifier
 from utils.logger import logger
 
 LANGUAGES = ["Español", "English", "Português", "Français"]
 
+# Textos del header por idioma: menús que se abren con click y links a verificar
+HEADER_TEXTS = {
+    "Español": {
+        "Reservar": "Reservar",
+        "Ofertas y destinos": "Ofertas y destinos",
+        "Destinos": "Destinos",
+        "Información y ayuda": "Información y ayuda",
+        "Tipos de tarifas": "Tipos de tarifas",
+    },
+    "English": {
+        "Reservar": "Book",
+        "Ofertas y destinos": "Offers and destinations",
+        "Destinos": "Our destinations",
+        "Información y ayuda": "Information and help",
+        "Tipos de tarifas": "Types of fares",
+    },
+    "Português": {
+        "Reservar": "Reservar",
+        "Ofertas y destinos": "Ofertas e destinos",
+        "Destinos": "Nossos destinos",
+        "Información y ayuda": "Informação e assistência",
+        "Tipos de tarifas": "Tipos de taxas",
+    },
+    "Français": {
+        "Reservar": "Réserver",
+        "Ofertas y destinos": "Offres et destinations",
+        "Destinos": "Destinations",
+        "Información y ayuda": "Information et aide",
+        "Tipos de tarifas": "Types de tarifs",
+    },
+}
+
+# Link del header → menú que hay que abrir antes de clickearlo (si no se verifica por HTTP)
+HEADER_LINKS = {
+    "Reservar": None,
+    "Destinos": "Ofertas y destinos",
+    "Tipos de tarifas": "Información y ayuda",
+}
+
 @allure.epic("FLYR Automation Suite")
 @allure.feature("Navigation Tests")
 class TestCase6HeaderRedirects:
 
     @allure.title("Test Header Navigation por idioma")
+    @allure.description("HTTP para links con href, click real para links manejados por JS")
     @pytest.mark.parametrize("language", LANGUAGES)
     def test_csv_header_navigation(self, driver, setup_test, language):
         home = HomePage(driver)
@@ -26,121 +65,64 @@ class TestCase6HeaderRedirects:
             except Exception as e:
                 logger.error(f"Error con método select_language: {e}")
 
-        steps = [
-            {"action": "click", "key": "Reservar", "desc": "Click en Reservar/Book"},
-            {"action": "scroll", "direction": "down", "desc": "Scroll Down"},
-            {"action": "scroll", "direction": "up", "desc": "Scroll Up"},
-            {"action": "click", "key": "Ofertas y destinos", "desc": "Click en Ofertas y destinos"},
-            {"action": "click", "key": "Destinos", "desc": "Click en Destinos"},
-            {"action": "scroll", "direction": "down", "desc": "Scroll Down"},
-            {"action": "click", "key": "Información y ayuda", "desc": "Click en Información y ayuda"},
-            {"action": "click", "key": "Tipos de tarifas", "desc": "Click en Tipos de tarifas"},
-        ]
-        
-        failures = []
-        
-        for i, step in enumerate(steps, 1):
-            with allure.step(f"Paso {i}: {step['desc']}"):
-                try:
-                    if step["action"] == "click":
-                        # Intentar diferentes textos según el idioma
-                        if language == "English":
-                            text_map = {
-                                "Reservar": "Book",
-                                "Ofertas y destinos": "Offers and destinations",
-                                "Destinos": "Our destinations",
-                                "Información y ayuda": "Information and help",
-                                "Tipos de tarifas": "Types of fares"
-                            }
-                        elif language == "Português":
-                            text_map = {
-                                "Reservar": "Reservar",
-                                "Ofertas y destinos": "Ofertas e destinos",
-                                "Destinos": "Nossos destinos",
-                                "Información y ayuda": "Informação e assistência",
-                                "Tipos de tarifas": "Tipos de taxas"
-                            }
-                        elif language == "Français":
-                            text_map = {
-                                "Reservar": "Réserver",
-                                "Ofertas y destinos": "Offres et destinations",
-                                "Destinos": "Destinations",
-                                "Información y ayuda": "Information et aide",
-                                "Tipos de tarifas": "Types de tarifs"
-                            }
-                        else:  # Español
-                            text_map = {
-                                "Reservar": "Reservar",
-                                "Ofertas y destinos": "Ofertas y destinos",
-                                "Destinos": "Destinos",
-                                "Información y ayuda": "Información y ayuda",
-                                "Tipos de tarifas": "Tipos de tarifas"
-                            }
-                        
-                        text = text_map.get(step["key"], step["key"])
-                        
-                        # Método simple de click por texto
-                        xpath = f"//*[contains(text(), '{text}')]"
-                        elements = driver.find_elements(By.XPATH, xpath)
-                        
-                        clicked = False
-                        for element in elements:
-                            try:
-                                if element.is_displayed() and element.is_enabled():
-                                    # Resaltar el elemento
-                                    driver.execute_script("arguments[0].style.border='3px solid red';", element)
-                                    time.sleep(0.3)
-                                    
-                                    # Scroll al elemento
-                                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", element)
-                                    time.sleep(0.5)
-                                    
-                                    # Intentar click
-                                    try:
-                                        element.click()
-                                    except:
-                                        driver.execute_script("arguments[0].click();", element)
-                                    
-                                    # Quitar resaltado
-                                    driver.execute_script("arguments[0].style.border='none';", element)
-                                    
-                                    clicked = True
-                                    logger.info(f"✓ Click en '{text}' ({step['key']})")
-                                    break
-                            except Exception as e:
-                                logger.debug(f"Error con elemento: {e}")
-                                continue
-                        
-                        if not clicked:
-                            failures.append(f"No se pudo hacer click en: {step['key']}")
-                            logger.warning(f"❌ No se pudo hacer click en: {step['key']}")
-                    
-                    elif step["action"] == "scroll":
-                        pixels = 500 if step["direction"] == "down" else -500
-                        driver.execute_script(f"window.scrollBy(0, {pixels});")
-                        logger.info(f"✓ Scroll {step['direction']}")
-                    
-                    # Tomar screenshot después de cada paso
-                    try:
-                        home.take_screenshot(f"paso_{i}_{step['key'].replace(' ', '_')}")
-                    except:
-                        pass
-                    
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    failures.append(f"Error en paso {step['desc']}: {str(e)}")
-                    logger.error(f"Error en paso {step['desc']}: {e}")
-        
+        texts = HEADER_TEXTS[language]
+
+        # Links con href navegable: verificación HTTP en paralelo (sin salir de la página)
+        verified = home.verify_header_links(LinkVerifier(), {key: texts[key] for key in HEADER_LINKS})
+
+        results = []
+        for i, (key, menu) in enumerate(HEADER_LINKS.items(), 1):
+            result = verified[key]
+            if result["method"] == "http":
+                results.append(result)
+                continue
+
+            # Links manejados por JavaScript (o no presentes hasta abrir su menú): click real
+            with allure.step(f"Link {i}: {key} (click)"):
+                results.append(self._click_and_verify(driver, home, key, texts[key],
+                                                      texts[menu] if menu else None))
+
         # Reporte final
+        failures = [f"{r['link']} [{r['method']}]: {r.get('error') or r.get('final_url')}"
+                    for r in results if not r.get("ok")]
         if failures:
             failure_msg = f"Fallos en idioma '{language}':\n" + "\n".join(failures)
             allure.attach(failure_msg, name=f"Fallos {language}", attachment_type=allure.attachment_type.TEXT)
-            
-            # Si hay demasiados fallos, marcar como fallido
-            if len(failures) > 3:
+
+            # Mínimo 2 de 3 links OK por idioma
+            if len(failures) > 1:
                 pytest.fail(f"Demasiados fallos en idioma '{language}': {len(failures)}")
             else:
                 logger.warning(f"Algunos fallos en '{language}' pero continuando: {failures}")
-    
-   
\ No newline at end of file
+
+    def _click_and_verify(self, driver, home, key, text, menu_text):
+        """Click real en un link del header: OK solo si navega (URL nueva o pestaña nueva)"""
+        try:
+            if menu_text and not home.click_header_text(menu_text):
+                return {"link": key, "method": "click", "ok": False, "error": f"No se abrió el menú {menu_text}"}
+
+            url_before = driver.current_url
+            handles_before = driver.window_handles
+            if not home.click_header_text(text):
+                logger.warning(f"❌ No se pudo hacer click en: {key}")
+                return {"link": key, "method": "click", "ok": False, "error": "Click falló"}
+
+            url_after = driver.current_url
+            new_handles = [h for h in driver.window_handles if h not in handles_before]
+            if new_handles:
+                # El link abrió otra pestaña: comprobar su URL y volver
+                driver.switch_to.window(new_handles[-1])
+                url_after = driver.current_url
+                driver.close()
+                driver.switch_to.window(handles_before[0])
+
+            url_changed = url_after != url_before
+            home.take_screenshot(f"header_{key.replace(' ', '_')}")
+            logger.info(f"{'✓' if url_changed else '✗'} {key}: {'URL cambió' if url_changed else 'URL igual'}")
+            return {"link": key, "method": "click", "ok": url_changed,
+                    "url_changed": url_changed, "final_url": url_after,
+                    "error": None if url_changed else "El click no navegó"}
+
+        except Exception as e:
+            logger.error(f"Error en link {key}: {e}")
+            return {"link": key, "method": "click", "ok": False, "error": str(e)}
@@ -0,0 +1,67 @@
+"""
+Lock entre procesos basado en archivo (sin navegador)
+"""
+import os
+import time
+import pytest
+import allure
+from utils.file_lock import FileLock
+
+
+@allure.epic("FLYR Automation Suite")
+@allure.feature("Infraestructura")
+@allure.story("Lock entre workers")
+class TestFileLock:
+    """Stale solo para locks de procesos muertos"""
+
+    @allure.title("Un lock retenido más de stale_after no se rompe mientras su dueño vive")
+    def test_held_lock_is_not_stale(self, tmp_path):
+        path = str(tmp_path / "slow.lock")
+        with FileLock(path, stale_after=0.2):
+            time.sleep(0.6)
+            with pytest.raises(TimeoutError):
+                FileLock(path, timeout=0.4, stale_after=0.2).acquire()
+        assert not os.path.exists(path)
+
+    @allure.title("El lock de un proceso que murió se recupera")
+    def test_abandoned_lock_is_broken(self, tmp_path):
+        path = str(tmp_path / "dead.lock")
+        with open(path, "w") as f:
+            f.write("99999")
+        old = time.time() - 10
+        os.utime(path, (old, old))
+
+        lock = FileLock(path, timeout=1, stale_after=1)
+        lock.acquire()
+        lock.release()
+        assert not os.path.exists(path)
+
+    @allure.title("Liberar no borra un lock que ya tomó otro proceso")
+    def test_release_keeps_foreign_lock(self, tmp_path):
+        path = str(tmp_path / "taken.lock")
+        lock = FileLock(path, timeout=1)
+        lock.acquire()
+        with open(path, "w") as f:
+            f.write("12345:otro")
+
+        lock.release()
+        assert os.path.exists(path)
+
+    @allure.title("Romper un lock abandonado no borra el lock vivo que lo reemplazó")
+    def test_breaking_stale_lock_keeps_new_owner(self, tmp_path):
+        path = str(tmp_path / "race.lock")
+        with open(path, "w") as f:
+            f.write("99999")
+        old = time.time() - 10
+        os.utime(path, (old, old))
+
+        # A rompe el lock abandonado y toma uno nuevo; B llega tarde con la comprobación ya hecha
+        owner = FileLock(path, timeout=1, stale_after=1)
+        owner.acquire()
+        late = FileLock(path, timeout=1, stale_after=1)
+        late._break_stale("2_late")
+
+        assert owner._owned()
+        assert os.listdir(tmp_path) == ["race.lock"]
+        owner.release()
+        assert not os.path.exists(path)
@@ -0,0 +1,99 @@
+"""
+Verificador HTTP de enlaces contra un servidor local (sin navegador)
+Comprueba status, URL final, redirecciones y latencia
+"""
+import threading
+import pytest
+import allure
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.link_verifier import LinkVerifier
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Servidor sustituto: /redirect → /middle → /final, /missing devuelve 404"""
+
+    ROUTES = {
+        "/redirect": (302, "/middle"),
+        "/middle": (301, "/final"),
+        "/final": (200, None),
+        "/missing": (404, None),
+    }
+
+    def do_GET(self):
+        status, location = self.ROUTES.get(self.path, (404, None))
+        self.send_response(status)
+        if location:
+            self.send_header("Location", location)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def stand_in_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@allure.epic("FLYR Automation Suite")
+@allure.feature("Navigation Tests")
+@allure.story("Verificación HTTP de redirecciones")
+@pytest.mark.redirects
+class TestLinkVerifier:
+    """Verificador HTTP usado por los tests de header/footer"""
+
+    @allure.title("Sigue la cadena de redirecciones hasta la URL final")
+    def test_follows_redirect_chain(self, stand_in_server):
+        result = LinkVerifier().check(f"{stand_in_server}/redirect")
+
+        assert result["ok"]
+        assert result["status"] == 200
+        assert result["final_url"].endswith("/final")
+        assert result["redirects"] == 2
+        assert result["latency_ms"] >= 0
+
+    @allure.title("Una cadena que agota las redirecciones no es un enlace válido")
+    def test_exhausted_redirects_fail(self, stand_in_server):
+        result = LinkVerifier(max_redirects=1).check(f"{stand_in_server}/redirect")
+
+        assert result["status"] == 301
+        assert not result["ok"]
+        assert "error" in result
+
+    @allure.title("Reporta enlaces rotos y servidores caídos sin lanzar excepción")
+    def test_reports_broken_links(self, stand_in_server):
+        verifier = LinkVerifier(timeout=2)
+        missing, unreachable = verifier.check_all([f"{stand_in_server}/missing",
+                                                   "http://127.0.0.1:9/down"])
+
+        assert missing["status"] == 404 and not missing["ok"]
+        assert unreachable["status"] is None and not unreachable["ok"]
+        assert "error" in unreachable
+
+    @allure.title("Verifica varias URLs en paralelo conservando el orden")
+    def test_check_all_keeps_order(self, stand_in_server):
+        paths = ["/final", "/redirect", "/missing", "/middle"]
+        results = LinkVerifier(max_workers=4).check_all([stand_in_server + p for p in paths])
+
+        assert [r["url"] for r in results] == [stand_in_server + p for p in paths]
+        assert [r["status"] for r in results] == [200, 200, 404, 200]
+
+    @allure.title("Detecta links manejados por JavaScript (requieren click real)")
+    @pytest.mark.parametrize("raw_href, href, onclick, expected", [
+        ("https://www.avianca.com/es/", "https://www.avianca.com/es/", False, False),
+        ("/es/sostenibilidad/", "https://nuxqa4.avtest.ink/es/sostenibilidad/", False, False),
+        ("#", "https://nuxqa4.avtest.ink/#", False, True),
+        ("", "", False, True),
+        ("javascript:void(0)", "javascript:void(0)", False, True),
+        ("https://www.avianca.com/es/", "https://www.avianca.com/es/", True, True),
+    ])
+    def test_is_js_driven(self, raw_href, href, onclick, expected):
+        link = {"raw_href": raw_href, "href": href, "has_onclick": onclick}
+        assert LinkVerifier.is_js_driven(link) is expected
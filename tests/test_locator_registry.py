@@ -0,0 +1,77 @@
+"""
+Registro de localizadores y traducción XPath → CSS (sin navegador)
+"""
+import pytest
+import allure
+from selenium.webdriver.common.by import By
+from utils.locator_registry import LocatorRegistry, xpath_literal, xpath_to_css
+
+
+@allure.epic("FLYR Automation Suite")
+@allure.feature("Infraestructura")
+@allure.story("Registro de localizadores")
+class TestLocatorRegistry:
+    """Compilación a CSS de los XPath declarados por las páginas"""
+
+    @allure.title("Traduce los XPath con equivalente CSS exacto")
+    @pytest.mark.parametrize("xpath, css", [
+        ("//button-container//button", "button-container button"),
+        ("//*[@id='maincontent']//button-container//button", "#maincontent button-container button"),
+        ("//button[@id='continue-services']", "button#continue-services"),
+        ("//div[contains(@class, 'fare-price')]", "div[class*='fare-price']"),
+        ("//div[@aria-label='Click to select Basic fare']//div[@class='fare_button_label']",
+         "div[aria-label='Click to select Basic fare'] div[class='fare_button_label']"),
+        ("//ul/li[starts-with(@id, 'pos-')]", "ul > li[id^='pos-']"),
+        ("//*[contains(@class,'seatmap') or contains(@id,'seatmap')]", "[class*='seatmap'], [id*='seatmap']"),
+        ("//div[contains(@class,'seat') and (@data-free or @data-open='1')]",
+         "div[class*='seat'][data-free], div[class*='seat'][data-open='1']"),
+        ("//input[@placeholder=\"Origin's city\"]", "input[placeholder='Origin\\'s city']"),
+        ("//*", "*"),
+    ])
+    def test_translates_css_equivalents(self, xpath, css):
+        assert xpath_to_css(xpath) == css
+
+    @allure.title("Deja como XPath lo que CSS no puede expresar")
+    @pytest.mark.parametrize("xpath", [
+        "//button[contains(text(), 'Continue')]",
+        "//button[contains(., 'Select')]",
+        "//div[contains(@class, 'fare-card')][1]",
+        "(//div[@class='fare_button_label'])[1]",
+        "//button[contains(@class, 'x')]//span/..",
+        "//span[contains(text(),'English')] | //span[contains(text(),'Inglés')]",
+        "//button[not(contains(@class, 'disabled'))]",
+        "//em[text()='Spain']/ancestor::button",
+        "//div[contains(@class, '')]",
+        ".//button",
+        "/html/body",
+    ])
+    def test_keeps_untranslatable_xpath(self, xpath):
+        assert xpath_to_css(xpath) is None
+
+    @allure.title("Los textos con comillas se escapan como literal XPath válido")
+    @pytest.mark.parametrize("text, literal", [
+        ("Reservar", "'Reservar'"),
+        ("Types d'avions", '"Types d\'avions"'),
+        ("a'b\"c", "concat('a', \"'\", 'b\"c')"),
+    ])
+    def test_xpath_literal(self, text, literal):
+        assert xpath_literal(text) == literal
+
+    @allure.title("Registra el original y devuelve la forma compilada")
+    def test_register_class_compiles_locators(self):
+        class FakePage:
+            CONTINUE = (By.XPATH, "//button[@id='continue']")
+            CONFIRM = (By.XPATH, "//button[contains(text(), 'Confirm')]")
+            SEARCH = (By.ID, "searchButton")
+            timeout = (By.XPATH, "//ignored")
+
+        registry = LocatorRegistry(compile_xpath=True)
+        registry.register_class(FakePage)
+
+        assert FakePage.CONTINUE == (By.CSS_SELECTOR, "button#continue")
+        assert FakePage.CONFIRM == (By.XPATH, "//button[contains(text(), 'Confirm')]")
+        assert FakePage.SEARCH == (By.ID, "searchButton")
+        assert len(registry.entries) == 3
+        assert [e["name"] for e in registry.translated()] == ["CONTINUE"]
+        assert registry.entries[f"{FakePage.__module__}.{FakePage.__qualname__}.CONTINUE"]["original"] == \
+            (By.XPATH, "//button[@id='continue']")
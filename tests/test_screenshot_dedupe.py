@@ -0,0 +1,56 @@
+"""
+Deduplicación perceptual de screenshots (sin navegador)
+"""
+import allure
+import cv2
+import numpy as np
+from utils.screenshot_dedupe import (
+    DUPLICATE, NEAR_DUPLICATE, NEW, ScreenshotHistory, crop_png
+)
+
+
+def page_png(popup=False, layout=0):
+    """Página sintética de 1280x720: cabecera, tarjetas y opcionalmente un desplegable"""
+    image = np.full((720, 1280, 3), 245, np.uint8)
+    cv2.rectangle(image, (0, 0), (1280, 80), (40, 40, 120), -1)
+    for i in range(4):
+        left = 60 + i * 300 + layout
+        cv2.rectangle(image, (left, 200), (left + 240, 500), (90, 140, 60), -1)
+    if popup:
+        cv2.rectangle(image, (900, 90), (1150, 260), (20, 20, 20), -1)
+    return cv2.imencode(".png", image)[1].tobytes()
+
+
+@allure.epic("FLYR Automation Suite")
+@allure.feature("Infraestructura")
+@allure.story("Screenshots deduplicados")
+class TestScreenshotDedupe:
+    """Comparación de cada screenshot con la referencia del test"""
+
+    @allure.title("El primero es referencia y uno idéntico se omite")
+    def test_identical_is_duplicate(self):
+        history = ScreenshotHistory()
+        assert history.classify("a.png", page_png()) == (NEW, None, None)
+        assert history.classify("b.png", page_png()) == (DUPLICATE, "a.png", None)
+        assert history.skipped == 1
+
+    @allure.title("Un cambio localizado se guarda como recorte sobre la referencia")
+    def test_local_change_is_near_duplicate(self):
+        history = ScreenshotHistory()
+        history.classify("a.png", page_png())
+        result, reference, bbox = history.classify("b.png", page_png(popup=True))
+
+        assert (result, reference) == (NEAR_DUPLICATE, "a.png")
+        x, y, w, h = bbox
+        # El recorte contiene el desplegable y es mucho menor que la página
+        assert x <= 900 and y <= 90 and x + w >= 1150 and y + h >= 260
+        assert w * h < 0.1 * 1280 * 720
+        crop = cv2.imdecode(np.frombuffer(crop_png(page_png(popup=True), bbox), np.uint8), cv2.IMREAD_COLOR)
+        assert crop.shape[:2] == (h, w)
+
+    @allure.title("Un cambio de maquetación pasa a ser la nueva referencia")
+    def test_layout_change_is_new(self):
+        history = ScreenshotHistory()
+        history.classify("a.png", page_png())
+        assert history.classify("b.png", page_png(layout=150))[0] == NEW
+        assert history.classify("c.png", page_png(layout=150)) == (DUPLICATE, "b.png", None)
@@ -0,0 +1,41 @@
+"""
+Codificación de screenshots (sin navegador)
+"""
+import pytest
+import allure
+import cv2
+import numpy as np
+from utils.screenshot_encoding import ScreenshotEncoding
+
+
+def browser_png():
+    image = np.full((1080, 1920, 3), 245, np.uint8)
+    cv2.rectangle(image, (0, 0), (1920, 120), (40, 40, 120), -1)
+    cv2.putText(image, "Avianca", (80, 600), cv2.FONT_HERSHEY_SIMPLEX, 6, (20, 20, 20), 12)
+    return cv2.imencode(".png", image)[1].tobytes()
+
+
+@allure.epic("FLYR Automation Suite")
+@allure.feature("Infraestructura")
+@allure.story("Codificación de screenshots")
+class TestScreenshotEncoding:
+    """Formato, escala y color configurables de los screenshots"""
+
+    @allure.title("Por defecto el PNG del navegador se guarda tal cual")
+    def test_default_keeps_original(self):
+        png = browser_png()
+        assert ScreenshotEncoding(format="png", scale=1, grayscale=False).encode(png) is png
+
+    @allure.title("Recodifica con formato, escala y escala de grises")
+    @pytest.mark.parametrize("format, magic", [("jpeg", b"\xff\xd8"), ("webp", b"RIFF"), ("png", b"\x89PNG")])
+    def test_encodes_downscaled(self, format, magic):
+        png = browser_png()
+        data = ScreenshotEncoding(format=format, quality=70, scale=0.5, grayscale=True).encode(png)
+
+        assert data.startswith(magic)
+        image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_UNCHANGED)
+        assert image.shape[:2] == (540, 960)
+        # WebP siempre se decodifica en color; los canales quedan prácticamente iguales
+        assert image.ndim == 2 or np.ptp(image.astype(int), axis=2).max() <= 2
+        if format != "png":
+            assert len(data) < len(png)
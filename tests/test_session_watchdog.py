@@ -0,0 +1,77 @@
+"""
+Recogida de drivers huérfanos por archivo de pid (sin navegador)
+"""
+import os
+import subprocess
+import sys
+import pytest
+import allure
+from utils import session_watchdog
+from utils.config import Config
+
+
+class FakeService:
+    def __init__(self, process):
+        self.process = process
+
+
+class FakeDriver:
+    def __init__(self, process):
+        self.service = FakeService(process)
+
+
+@pytest.fixture
+def pid_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "DRIVER_PID_DIR", str(tmp_path / "pids"))
+    return tmp_path / "pids"
+
+
+@pytest.fixture
+def sleeper():
+    process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    yield process
+    process.kill()
+    process.wait()
+
+
+def dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+@allure.epic("FLYR Automation Suite")
+@allure.feature("Infraestructura")
+@allure.story("Watchdog de sesión")
+@pytest.mark.skipif(sys.platform == "win32", reason="usa señales POSIX")
+class TestOrphanedDrivers:
+    """Solo se mata el driver anotado si sigue siendo el mismo proceso"""
+
+    @allure.title("Cerrar el driver borra su archivo de pid")
+    def test_unregister_removes_pid_file(self, pid_dir, sleeper):
+        driver = FakeDriver(sleeper)
+        session_watchdog.register_driver_process(driver)
+        assert os.listdir(pid_dir) == [f"{os.getpid()}_{sleeper.pid}"]
+
+        session_watchdog.unregister_driver_process(driver)
+        assert os.listdir(pid_dir) == []
+
+    @allure.title("El driver de un worker muerto se termina")
+    def test_orphan_is_reaped(self, pid_dir, sleeper):
+        os.makedirs(pid_dir)
+        (pid_dir / f"{dead_pid()}_{sleeper.pid}").write_text(
+            session_watchdog.process_identity(sleeper.pid), encoding="utf-8")
+
+        assert session_watchdog.reap_orphaned_drivers() == 1
+        assert sleeper.wait(timeout=5) is not None
+        assert os.listdir(pid_dir) == []
+
+    @allure.title("Un pid reutilizado por otro proceso no se mata")
+    def test_reused_pid_is_not_killed(self, pid_dir, sleeper):
+        os.makedirs(pid_dir)
+        (pid_dir / f"{dead_pid()}_{sleeper.pid}").write_text(
+            "Thu Jan  1 00:00:00 1970 chromedriver", encoding="utf-8")
+
+        assert session_watchdog.reap_orphaned_drivers() == 0
+        assert sleeper.poll() is None
+        assert os.listdir(pid_dir) == []
@@ -0,0 +1,165 @@
+"""
+Grabación de video con frames sintéticos (sin navegador)
+"""
+import shutil
+import subprocess
+import cv2
+import numpy as np
+import pytest
+import allure
+from utils.video_recorder import VideoRecorder
+
+FPS = 10
+
+
+def frame(value, ext=".png", size=(120, 160)):
+    """Imagen de un solo color codificada como PNG/JPEG"""
+    image = np.full(size + (3,), value, np.uint8)
+    return cv2.imencode(ext, image)[1].tobytes()
+
+
+def read_video(path):
+    """Valor medio de cada frame del MP4"""
+    capture = cv2.VideoCapture(path)
+    means = []
+    while True:
+        ok, image = capture.read()
+        if not ok:
+            break
+        means.append(image.mean())
+    capture.release()
+    return means
+
+
+@pytest.fixture
+def recorder(tmp_path):
+    recorder = VideoRecorder(mode="on-failure", fps=FPS, buffer_seconds=2, vfr=False)
+    recorder.filename = str(tmp_path / "test.mp4")
+    return recorder
+
+
+@allure.epic("FLYR Automation Suite")
+@allure.feature("Infraestructura")
+@allure.story("Video de evidencias")
+class TestVideoCapture:
+    """Frames conservados: solo cambios, uno por tick y solo la ventana del buffer"""
+
+    @allure.title("Los frames sin cambios se descartan (PNG y JPEG)")
+    @pytest.mark.parametrize("ext", [".png", ".jpg"])
+    def test_unchanged_frames_are_skipped(self, ext):
+        recorder = VideoRecorder(mode="always", fps=FPS)
+        for value in [50, 50, 52, 200, 200]:
+            recorder._push(frame(value, ext), is_jpeg=ext == ".jpg")
+
+        # 52 queda dentro de VIDEO_CHANGE_THRESHOLD respecto a 50
+        assert recorder.frames.qsize() == 2
+        assert recorder.frames_skipped == 3
+
+    @allure.title("En el mismo tick se conserva solo el estado más reciente")
+    def test_same_tick_replaces_last_frame(self, recorder):
+        recorder._buffer(100.0, b"a")
+        recorder._buffer(100.05, b"b")
+        recorder._buffer(100.2, b"c")
+
+        assert list(recorder.buffer) == [(100.0, b"b"), (100.2, b"c")]
+
+    @allure.title("El buffer solo guarda los últimos buffer_seconds")
+    def test_window_is_trimmed(self, recorder):
+        for i in range(60):
+            recorder._buffer(100 + i / FPS, bytes([i]))
+
+        now = recorder.buffer[-1][0]
+        assert recorder.buffer[0][0] <= now - recorder.buffer_seconds < recorder.buffer[1][0]
+        assert len(recorder.buffer) <= recorder.buffer.maxlen
+
+    @allure.title("Se conserva el frame visible al inicio de la ventana aunque sea más antiguo")
+    def test_start_frame_is_kept(self, recorder):
+        recorder._buffer(100.0, b"old")
+        recorder._buffer(110.0, b"new")
+
+        assert [data for _, data in recorder.buffer] == [b"old", b"new"]
+
+
+@allure.epic("FLYR Automation Suite")
+@allure.feature("Infraestructura")
+@allure.story("Video de evidencias")
+class TestVideoEncoding:
+    """El video dura lo mismo que la grabación, con cada frame hasta el siguiente"""
+
+    @allure.title("_hold repite el frame hasta el tick indicado")
+    def test_hold_fills_until_tick(self, recorder):
+        image = cv2.imdecode(np.frombuffer(frame(80), np.uint8), cv2.IMREAD_COLOR)
+        recorder._hold(image, 100.0, 100.55)
+        assert recorder.frames_written == 5
+
+        recorder._hold(image, 100.0, 101.0)
+        assert recorder.frames_written == 10
+        recorder.writer.release()
+
+    @allure.title("El buffer de un test fallido cubre buffer_seconds de tiempo real")
+    def test_encode_buffer_matches_wall_clock(self, recorder):
+        recorder._buffer(100.0, frame(30, ".jpg"))
+        recorder._buffer(110.0, frame(220, ".jpg"))
+        recorder.stopped_at = 110.5
+        recorder._encode_buffer()
+        recorder.writer.release()
+
+        means = read_video(recorder.filename)
+        # Ventana de 2s (desde 108.5) más el tick final
+        assert len(means) == recorder.frames_written == int((2 + 1 / FPS) * FPS)
+        # 108.5-110: frame anterior a la ventana; 110-110.6: frame nuevo
+        assert all(mean < 60 for mean in means[:15])
+        assert all(mean > 190 for mean in means[15:])
+
+    @allure.title("En modo always el video dura lo mismo que el test")
+    def test_encode_matches_wall_clock(self, tmp_path):
+        recorder = VideoRecorder(mode="always", fps=FPS, vfr=False)
+        recorder.filename = str(tmp_path / "always.mp4")
+        recorder.frames.put((100.0, frame(30)))
+        recorder.frames.put((100.5, frame(220)))
+        recorder.stopped_at = 101.2
+        recorder.stop_event.set()
+        recorder._encode()
+
+        assert recorder.writer is None
+        means = read_video(recorder.filename)
+        assert len(means) == int((1.2 + 1 / FPS) * FPS)
+        assert all(mean < 60 for mean in means[:5])
+        assert all(mean > 190 for mean in means[5:])
+
+
+@allure.epic("FLYR Automation Suite")
+@allure.feature("Infraestructura")
+@allure.story("Video de evidencias")
+class TestVariableFrameRate:
+    """Con ffmpeg cada frame conservado se guarda una sola vez con su duración"""
+
+    @allure.title("Una pantalla estática se guarda como un único frame")
+    def test_held_frame_is_stored_once(self, recorder):
+        recorder.vfr = True
+        image = cv2.imdecode(np.frombuffer(frame(80), np.uint8), cv2.IMREAD_COLOR)
+        recorder._hold(image, 100.0, 105.0)
+        recorder._hold(image, 100.0, 105.0)
+
+        assert recorder.frames_written == 50
+        assert [ticks for _, ticks in recorder.stills] == [50]
+        shutil.rmtree(recorder.stills_dir)
+
+    @allure.title("El MP4 de frame rate variable dura lo mismo que la grabación")
+    @pytest.mark.skipif(not (shutil.which("ffmpeg") and shutil.which("ffprobe")),
+                        reason="ffmpeg/ffprobe no están en el PATH")
+    def test_vfr_video_matches_wall_clock(self, tmp_path):
+        recorder = VideoRecorder(mode="on-failure", fps=FPS, buffer_seconds=2)
+        recorder.filename = str(tmp_path / "vfr.mp4")
+        recorder._buffer(100.0, frame(30, ".jpg"))
+        recorder._buffer(110.0, frame(220, ".jpg"))
+        recorder.stopped_at = 110.5
+        recorder._encode_buffer()
+        recorder._mux()
+
+        duration = float(subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0",
+             recorder.filename], capture_output=True, text=True, check=True).stdout)
+        assert len(recorder.stills) == 2
+        assert duration == pytest.approx(2 + 1 / FPS, abs=0.2)
+        shutil.rmtree(recorder.stills_dir)
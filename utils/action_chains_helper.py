@@ -3,19 +3,22 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 import allure
+from utils.evidence_policy import evidence_policy
 from utils.logger import logger
 
 class ActionChainsHelper:
     """Helper para ActionChains con evidencias visuales"""
     
-    def __init__(self, driver):
+    def __init__(self, driver, page):
         self.driver = driver
+        # Página dueña: highlight/remove_highlight/visual_pause respetan --evidence
+        self.page = page
         self.wait = WebDriverWait(driver, 10)
         self.actions = ActionChains(driver)
     
     @allure.step("Click con evidencias visuales en: {element_name}")
     def click_with_evidence(self, locator, element_name):
-        """Click con highlight y evidencias"""
+        """Click con highlight y pausas visuales (solo con --evidence=verbose)"""
         try:
             # Esperar elemento
             element = self.wait.until(
@@ -27,31 +30,22 @@ class ActionChainsHelper:
                 "arguments[0].scrollIntoView({block: 'center', inline: 'center'});",
                 element
             )
-            time.sleep(0.2)
+            
+            self.page.visual_pause(0.2)
             
             # Highlight temporal
-            original_style = element.get_attribute("style") or ""
-            self.driver.execute_script(
-                """
-                arguments[0].style.border = '3px solid #FF0000';
-                arguments[0].style.boxShadow = '0 0 10px #FF0000';
-                arguments[0].style.transition = 'all 0.3s';
-                """,
-                element
+            original_style = self.page.highlight(
+                element, "border: 3px solid #FF0000; box-shadow: 0 0 10px #FF0000; transition: all 0.3s"
             )
             
             # Pausa para evidenciar
-            time.sleep(0.3)
+            self.page.visual_pause(0.3)
             
             # Hover sobre el elemento
             self.actions.move_to_element(element).perform()
-            time.sleep(0.2)
             
-            # Restaurar estilo
-            self.driver.execute_script(
-                f"arguments[0].style = '{original_style}';",
-                element
-            )
+            self.page.visual_pause(0.2)
+            self.page.remove_highlight(element, original_style)
             
             # Click con ActionChains (primera opción)
             try:
@@ -79,11 +73,12 @@ class ActionChainsHelper:
             
         except Exception as e:
             logger.error(f"❌ Error en click con evidencias: {e}")
-            allure.attach(
-                self.driver.get_screenshot_as_png(),
-                name=f"error_click_{element_name}",
-                attachment_type=allure.attachment_type.PNG
-            )
+            if evidence_policy.allows("failure"):
+                allure.attach(
+                    self.driver.get_screenshot_as_png(),
+                    name=f"error_click_{element_name}",
+                    attachment_type=allure.attachment_type.PNG
+                )
             return False
     
     @allure.step("Mover y hacer click en: {element_name}")
@@ -123,22 +118,15 @@ class ActionChainsHelper:
             )
             
             # Highlight
-            original_style = element.get_attribute("style") or ""
-            self.driver.execute_script(
-                "arguments[0].style.border = '2px solid #00FF00';",
-                element
-            )
+            original_style = self.page.highlight(element, "border: 2px solid #00FF00")
             
             # Limpiar y enviar texto
             element.clear()
             element.send_keys(text)
             
             # Restaurar estilo
-            time.sleep(0.2)
-            self.driver.execute_script(
-                f"arguments[0].style = '{original_style}';",
-                element
-            )
+            self.page.visual_pause(0.2)
+            self.page.remove_highlight(element, original_style)
             
             logger.info(f"✅ Texto ingresado en {element_name}: {text}")
             return True
@@ -153,7 +141,8 @@ class ActionChainsHelper:
         try:
             # Abrir dropdown
             self.click_with_evidence(dropdown_locator, "dropdown")
-            time.sleep(0.5)
+            # La opción se espera clickable en click_with_evidence: la pausa es solo visual
+            self.page.visual_pause(0.5)
             
             # Seleccionar opción
             success = self.click_with_evidence(option_locator, option_name)
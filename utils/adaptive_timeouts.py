@@ -0,0 +1,164 @@
+import contextlib
+import math
+import os
+import sqlite3
+import threading
+import time
+from utils.config import Config
+from utils.logger import logger
+
+class AdaptiveTimeouts:
+    """Timeouts por espera con nombre derivados de su historial (percentil × factor, acotado)"""
+
+    MODES = ["off", "record", "enforce"]
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS waits (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            elapsed REAL NOT NULL,
+            ok INTEGER NOT NULL,
+            recorded_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS waits_name ON waits (name, id);
+    """
+
+    def __init__(self, mode="record", db_path=Config.ADAPTIVE_TIMEOUTS_DB,
+                 percentile=Config.ADAPTIVE_TIMEOUT_PERCENTILE, factor=Config.ADAPTIVE_TIMEOUT_FACTOR,
+                 min_timeout=Config.ADAPTIVE_TIMEOUT_MIN, min_samples=Config.ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+                 window=Config.ADAPTIVE_TIMEOUT_WINDOW):
+        self.mode = mode
+        self.db_path = db_path
+        self.percentile = percentile
+        self.factor = factor
+        self.min_timeout = min_timeout
+        self.min_samples = min_samples
+        self.window = window
+        self.history = None
+        self.failed = set()
+        self.pending = []
+        self.lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    def attach(self, driver):
+        """Marcar el driver para que las páginas registren y ajusten sus esperas"""
+        if self.enabled:
+            driver.adaptive_timeouts = self
+        return driver
+
+    # ==================== TIMEOUTS ====================
+
+    def timeout_for(self, name, default):
+        """Timeout de la espera `name`.
+
+        Con mode=enforce y al menos min_samples éxitos: percentil × factor, acotado entre
+        min_timeout y `default` (el valor fijo del sitio de llamada es el techo). Si no, `default`.
+        Una espera cuya última ejecución falló vuelve a `default` hasta el siguiente éxito, para
+        que una carga que se volvió más lenta pueda volver a registrarse.
+        """
+        if self.mode != "enforce":
+            return default
+
+        samples = self._load().get(name, [])
+        if name in self.failed or len(samples) < self.min_samples:
+            return default
+
+        adaptive = self._percentile(samples) * self.factor
+        timeout = min(max(adaptive, self.min_timeout), default)
+        if timeout < default:
+            logger.debug(f"⏳ Timeout adaptativo {name}: {timeout:.1f}s (fijo {default}s)")
+        return timeout
+
+    def _percentile(self, samples):
+        # Rango más cercano sobre la ventana de éxitos recientes
+        ordered = sorted(samples)
+        rank = math.ceil(self.percentile / 100 * len(ordered))
+        return ordered[min(max(rank, 1), len(ordered)) - 1]
+
+    # ==================== HISTORIAL ====================
+
+    def record(self, name, elapsed, ok):
+        """Anotar la duración de una espera; solo los éxitos alimentan el percentil"""
+        if not self.enabled:
+            return
+        # Cargar antes el historial: si se cargara después, no incluiría las esperas sin guardar
+        history = self._load()
+        with self.lock:
+            self.pending.append((name, float(elapsed), int(bool(ok)), time.time()))
+            if not ok:
+                self.failed.add(name)
+                return
+            self.failed.discard(name)
+            samples = history.setdefault(name, [])
+            samples.append(float(elapsed))
+            del samples[:-self.window]
+
+    def _load(self):
+        """Éxitos recientes de todas las esperas (una lectura por sesión)"""
+        with self.lock:
+            if self.history is not None:
+                return self.history
+
+            self.history = {}
+            if not os.path.exists(self.db_path):
+                return self.history
+            try:
+                with self._connect() as conn:
+                    rows = conn.execute(
+                        "SELECT name, elapsed FROM ("
+                        " SELECT name, elapsed, ROW_NUMBER() OVER (PARTITION BY name ORDER BY id DESC) AS n"
+                        " FROM waits WHERE ok = 1"
+                        ") WHERE n <= ? ORDER BY name, n DESC",
+                        (self.window,)
+                    ).fetchall()
+                    failed = conn.execute(
+                        "SELECT name FROM waits AS w"
+                        " WHERE id = (SELECT MAX(id) FROM waits WHERE name = w.name) AND ok = 0"
+                    ).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️  No se pudo leer el historial de esperas: {e}")
+                return self.history
+
+            for name, elapsed in rows:
+                self.history.setdefault(name, []).append(elapsed)
+            self.failed.update(name for name, in failed)
+            return self.history
+
+    def flush(self):
+        """Guardar las esperas del worker y recortar el historial a la ventana por nombre"""
+        with self.lock:
+            pending, self.pending = self.pending, []
+        if not pending:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            with self._connect() as conn:
+                conn.executescript(self.SCHEMA)
+                conn.executemany(
+                    "INSERT INTO waits (name, elapsed, ok, recorded_at) VALUES (?, ?, ?, ?)", pending
+                )
+                conn.execute(
+                    "DELETE FROM waits WHERE id IN ("
+                    " SELECT id FROM ("
+                    "  SELECT id, ROW_NUMBER() OVER (PARTITION BY name ORDER BY id DESC) AS n FROM waits"
+                    " ) WHERE n > ?"
+                    ")",
+                    (self.window * 2,)
+                )
+            logger.info(f"⏳ {len(pending)} esperas registradas en {self.db_path}")
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️  No se pudo guardar el historial de esperas: {e}")
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # Varios workers de xdist escriben al terminar: esperar el lock de SQLite
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
@@ -0,0 +1,124 @@
+import json
+from selenium.common.exceptions import WebDriverException
+from utils.config import Config
+from utils.logger import logger
+
+class AppSync:
+    """Sincronización con la app Angular: testabilities.whenStable + XHR/fetch pendientes"""
+
+    MODES = ["dom", "angular"]
+
+    # Cuenta XHR/fetch en curso (ignora analítica y beacons que nunca "terminan" para la app)
+    REQUEST_SHIM = """
+        (function(ignored) {
+            if (window.__appSync) { return; }
+            var sync = window.__appSync = {pending: 0};
+            function tracked(url) {
+                url = String(url || '');
+                for (var i = 0; i < ignored.length; i++) {
+                    if (url.indexOf(ignored[i]) !== -1) { return false; }
+                }
+                return true;
+            }
+
+            var open = XMLHttpRequest.prototype.open;
+            var send = XMLHttpRequest.prototype.send;
+            XMLHttpRequest.prototype.open = function(method, url) {
+                this.__appSyncTracked = tracked(url);
+                return open.apply(this, arguments);
+            };
+            XMLHttpRequest.prototype.send = function() {
+                if (this.__appSyncTracked) {
+                    var finished = false;
+                    sync.pending++;
+                    this.addEventListener('loadend', function() {
+                        if (!finished) { finished = true; sync.pending--; }
+                    });
+                }
+                return send.apply(this, arguments);
+            };
+
+            if (window.fetch) {
+                var fetch = window.fetch;
+                window.fetch = function(input) {
+                    if (!tracked(input && input.url ? input.url : input)) { return fetch.apply(this, arguments); }
+                    sync.pending++;
+                    var release = function() { sync.pending--; };
+                    try {
+                        var request = fetch.apply(this, arguments);
+                        request.then(release, release);
+                        return request;
+                    } catch (e) {
+                        release();
+                        throw e;
+                    }
+                };
+            }
+        })(%s);
+    """
+
+    # Responde cuando todas las testabilities están estables y no hay requests pendientes
+    IDLE_SCRIPT = """
+        var timeoutMs = arguments[0], done = arguments[arguments.length - 1];
+        var testabilities = window.getAllAngularTestabilities ? window.getAllAngularTestabilities() : [];
+        if (!testabilities.length) { done({angular: false}); return; }
+
+        var start = performance.now(), finished = false;
+        function finish(idle) {
+            if (finished) { return; }
+            finished = true;
+            done({angular: true, idle: idle, elapsed: Math.round(performance.now() - start),
+                  pending: window.__appSync.pending});
+        }
+        function round() {
+            if (finished) { return; }
+            var stable = 0;
+            testabilities.forEach(function(t) {
+                t.whenStable(function() {
+                    if (++stable < testabilities.length) { return; }
+                    // Zona estable; requests fuera de la zona las cuenta el shim
+                    if (window.__appSync.pending <= 0) { finish(true); } else { setTimeout(round, 50); }
+                });
+            });
+        }
+        setTimeout(function() { finish(false); }, timeoutMs);
+        round();
+    """
+
+    def __init__(self, mode="dom", ignored_urls=None):
+        self.mode = mode
+        self.ignored_urls = list(ignored_urls or Config.APP_SYNC_IGNORED_URLS)
+
+    @property
+    def enabled(self):
+        return self.mode == "angular"
+
+    @property
+    def shim(self):
+        return self.REQUEST_SHIM % json.dumps(self.ignored_urls)
+
+    def attach(self, driver):
+        """Instalar el shim antes de que cargue cada documento (Chromium) y marcar el driver"""
+        if not self.enabled:
+            return driver
+
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": self.shim})
+        driver.app_sync = self
+        return driver
+
+    def wait_for_idle(self, driver, timeout):
+        """True/False si la app quedó ociosa antes del timeout; None si la página no es Angular"""
+        try:
+            # Firefox (o shim perdido): se instala aquí; solo verá requests posteriores
+            result = driver.execute_async_script(self.shim + self.IDLE_SCRIPT, int(timeout * 1000))
+        except WebDriverException as e:
+            # Navegación en curso: el documento se descargó antes de responder
+            logger.debug(f"Sincronización Angular interrumpida: {e}")
+            return None
+
+        if not result["angular"]:
+            return None
+        if not result["idle"]:
+            logger.debug(f"App no ociosa tras {result['elapsed']} ms ({result['pending']} requests pendientes)")
+        return result["idle"]
@@ -0,0 +1,141 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from utils.config import Config
+from utils.file_lock import FileLock
+from utils.logger import logger
+from utils.session_watchdog import unregister_driver_process
+
+class ProfileTemplate:
+    """Perfil plantilla con caché HTTP precalentada; cada sesión usa un clon limpio"""
+
+    # Estado que no debe heredarse de la plantilla (cookies, storage y sesiones)
+    CHROMIUM_STATE = [
+        "Default/Cookies", "Default/Cookies-journal",
+        "Default/Network/Cookies", "Default/Network/Cookies-journal",
+        "Default/Local Storage", "Default/Session Storage", "Default/IndexedDB",
+        "Default/Service Worker", "Default/Sessions",
+        "Default/Current Session", "Default/Current Tabs",
+        "Default/Last Session", "Default/Last Tabs",
+    ]
+    FIREFOX_STATE = [
+        "cookies.sqlite", "cookies.sqlite-wal", "cookies.sqlite-shm",
+        "webappsstore.sqlite", "storage", "sessionstore.jsonlz4", "sessionstore-backups",
+    ]
+    LOCK_FILES = ["SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile",
+                  "lock", ".parentlock", "parent.lock"]
+
+    def __init__(self, root=Config.PROFILE_DIR, urls=None):
+        self.root = root
+        self.urls = list(urls or Config.WARM_PROFILE_URLS)
+        self.enabled = False
+        self.run_id = None
+        self.clones = []
+        self.first_navigations = []
+        self._navigated = set()
+
+    def template_dir(self, browser_name):
+        return os.path.join(self.root, f"{browser_name}_template")
+
+    def prepare(self, browser_name, launch):
+        """Calentar la plantilla (una vez por ejecución) y devolver un clon para la sesión.
+
+        launch(profile_dir) debe crear un driver que use ese directorio de perfil.
+        """
+        browser_name = browser_name.lower()
+        with FileLock(os.path.join(self.root, f".{browser_name}.lock"), timeout=300):
+            if self._read_marker(browser_name).get("run_id") != self.run_id:
+                self._warm(browser_name, launch)
+            return self._clone(browser_name)
+
+    def record_navigation(self, driver, url, seconds):
+        """Registrar la primera navegación de cada sesión (caché precalentada)"""
+        if id(driver) in self._navigated:
+            return
+        self._navigated.add(id(driver))
+        self.first_navigations.append({"url": url, "seconds": round(seconds, 2)})
+        logger.info(f"🔥 Primera navegación con caché precalentada: {url} en {seconds:.2f}s")
+
+    def report(self):
+        """Comparar primeras navegaciones en frío (calentamiento) vs con caché precalentada"""
+        cold = {}
+        for browser_name in Config.BROWSERS:
+            for entry in self._read_marker(browser_name).get("cold_navigations", []):
+                cold.setdefault(entry["url"], []).append(entry["seconds"])
+
+        warm = {}
+        for entry in self.first_navigations:
+            warm.setdefault(entry["url"], []).append(entry["seconds"])
+
+        summary = {}
+        for url, times in warm.items():
+            summary[url] = {
+                "warm_avg": round(sum(times) / len(times), 2),
+                "cold_avg": round(sum(cold[url]) / len(cold[url]), 2) if url in cold else None,
+                "samples": len(times),
+            }
+            logger.info(f"🔥 {url}: frío {summary[url]['cold_avg']}s vs "
+                        f"caché precalentada {summary[url]['warm_avg']}s ({len(times)} sesiones)")
+        return summary
+
+    def cleanup(self):
+        """Borrar los clones creados por este proceso"""
+        for clone in self.clones:
+            shutil.rmtree(clone, ignore_errors=True)
+        self.clones = []
+
+    def _warm(self, browser_name, launch):
+        template = self.template_dir(browser_name)
+        shutil.rmtree(template, ignore_errors=True)
+        os.makedirs(template, exist_ok=True)
+
+        logger.info(f"🔥 Calentando perfil plantilla de {browser_name.upper()}: {template}")
+        cold_navigations = []
+        driver = launch(template)
+        try:
+            for url in self.urls:
+                start = time.time()
+                driver.get(url)
+                cold_navigations.append({"url": url, "seconds": round(time.time() - start, 2)})
+        finally:
+            driver.quit()
+            unregister_driver_process(driver)
+
+        with open(self._marker_path(browser_name), "w", encoding="utf-8") as f:
+            json.dump({"run_id": self.run_id, "cold_navigations": cold_navigations}, f, indent=2)
+
+    def _clone(self, browser_name):
+        template = self.template_dir(browser_name)
+        clone = os.path.join(self.root, "clones", f"{browser_name}_{os.getpid()}_{len(self.clones)}")
+        shutil.rmtree(clone, ignore_errors=True)
+        os.makedirs(os.path.dirname(clone), exist_ok=True)
+
+        # Copy-on-write cuando el sistema de archivos lo soporta (btrfs, xfs, APFS)
+        if sys.platform.startswith("linux"):
+            subprocess.run(["cp", "-R", "--reflink=auto", template, clone], check=True)
+        else:
+            shutil.copytree(template, clone, ignore=shutil.ignore_patterns(*self.LOCK_FILES))
+
+        state = self.FIREFOX_STATE if browser_name == "firefox" else self.CHROMIUM_STATE
+        for relative in state + self.LOCK_FILES:
+            path = os.path.join(clone, relative)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif os.path.lexists(path):
+                os.remove(path)
+
+        self.clones.append(clone)
+        return clone
+
+    def _marker_path(self, browser_name):
+        return os.path.join(self.template_dir(browser_name), ".warm.json")
+
+    def _read_marker(self, browser_name):
+        try:
+            with open(self._marker_path(browser_name), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
@@ -14,6 +14,30 @@ class Config:
     IMPLICIT_WAIT = 5
     EXPLICIT_WAIT = 15
     PAGE_LOAD_TIMEOUT = 30
+    PAGE_LOAD_STRATEGY = "normal"  # normal | eager | none
+    DOM_QUIET_MS = 300  # Milisegundos sin mutaciones para considerar el DOM asentado
+    APP_IDLE_TIMEOUT = 10  # Máximo a esperar que Angular quede estable (--sync-mode=angular)
+    
+    # Red ociosa: performance logs de Chromium (dominio Network) para wait_for_network_idle
+    # (--network-idle-logs); sin ellos se usa Resource Timing
+    PERFORMANCE_LOGS = False
+    NETWORK_IDLE_MS = 500  # Milisegundos sin requests en vuelo para considerar la red ociosa
+    NETWORK_IDLE_LOOKBACK_MS = 500  # Actividad previa a la espera que cuenta (requests del click anterior)
+    NETWORK_IDLE_GRACE_MS = 2000  # Espera máxima al primer request que coincida antes de darla por ociosa
+    NETWORK_IDLE_STALE_AFTER = 30  # Requests sin eventos durante más segundos se descartan
+    # Regex (sin distinguir mayúsculas) de las APIs que marcan el fin de cada carga lenta
+    NETWORK_IDLE_PATTERNS = {
+        "flight_search": r"availability|/search|/flights?/",
+        "seatmap": r"seat",
+    }
+    
+    # Timeouts adaptativos (--adaptive-timeouts=enforce): percentil del historial × factor,
+    # acotado entre ADAPTIVE_TIMEOUT_MIN y el timeout fijo de cada sitio de llamada
+    ADAPTIVE_TIMEOUT_PERCENTILE = 99
+    ADAPTIVE_TIMEOUT_FACTOR = 2.0
+    ADAPTIVE_TIMEOUT_MIN = 2
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES = 10  # Éxitos registrados antes de acortar una espera
+    ADAPTIVE_TIMEOUT_WINDOW = 200  # Éxitos recientes considerados por espera
     
     # Directorios
     BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -22,6 +46,12 @@ class Config:
     VIDEO_DIR = os.path.join(BASE_DIR, "videos")
     LOG_DIR = os.path.join(BASE_DIR, "logs")
     DRIVER_DIR = os.path.join(BASE_DIR, "drivers")
+    DRIVER_PID_DIR = os.path.join(DRIVER_DIR, ".pids")
+    PROFILE_DIR = os.path.join(BASE_DIR, ".profiles")
+    
+    SESSION_STATE_DIR = os.path.join(BASE_DIR, ".session_state")
+    ADAPTIVE_TIMEOUTS_DB = os.path.join(BASE_DIR, ".wait_history", "waits.sqlite3")
+    DOM_SNAPSHOT_DIR = os.path.join(REPORT_DIR, "dom_snapshots")
     
     # Datos de prueba
     DEFAULT_ORIGIN = "BOG"  # Bogotá
@@ -32,6 +62,103 @@ class Config:
     DEFAULT_BROWSER = "chrome"
     HEADLESS = True  # Para ejecución rápida
     
+    # Pool de drivers (--reuse-driver): reciclar la sesión tras N tests
+    DRIVER_POOL_MAX_USES = 20
+    # Máximo de navegadores ociosos o pre-lanzados por worker (--prefetch-driver)
+    DRIVER_POOL_MAX_IDLE = 2
+    
+    # Resolución de drivers: segundos antes de reintentar webdriver-manager tras un fallo
+    DRIVER_RESOLVE_RETRY_AFTER = 3600
+    # Espera máxima de un worker mientras otro descarga el driver con webdriver-manager
+    DRIVER_INSTALL_TIMEOUT = 600
+    
+    # Watchdog de sesión (--session-watchdog): cada cuánto sondear y cuándo declararla colgada.
+    # WATCHDOG_HANG_AFTER debe superar el page load timeout (30s)
+    WATCHDOG_INTERVAL = 10
+    WATCHDOG_HANG_AFTER = 90
+    
+    # Perfil plantilla (--warm-profile): URLs visitadas para precalentar la caché HTTP
+    WARM_PROFILE_URLS = [BASE_URL_4, BASE_URL_5]
+    
+    # Perfil de red lean (--network-profile=lean): patrones de URL bloqueados
+    LEAN_NETWORK_BLOCKED_URLS = [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*facebook.net*",
+        "*hotjar.com*",
+        "*clarity.ms*",
+        "*dynatrace*",
+        "*zendesk*",
+        "*livechatinc.com*",
+        "*salesforceliveagent.com*",
+        "*fonts.googleapis.com*",
+        "*fonts.gstatic.com*",
+        "*.woff*",
+        "*.ttf*",
+    ]
+    LEAN_NETWORK_BLOCK_IMAGES = False
+    LEAN_NETWORK_IMAGE_URLS = ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*"]
+    
+    # Caché de login: segundos de validez del estado guardado si ninguna cookie vence antes
+    SESSION_STATE_TTL = 1800
+    # Espera máxima de un worker mientras otro hace el login por UI
+    SESSION_LOGIN_TIMEOUT = 300
+    
+    # Requests que no cuentan como pendientes para --sync-mode=angular (analítica, chats, beacons)
+    APP_SYNC_IGNORED_URLS = [
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "facebook",
+        "hotjar",
+        "clarity.ms",
+        "dynatrace",
+        "zendesk",
+        "livechatinc.com",
+        "salesforceliveagent.com",
+    ]
+    
+    # Verificación HTTP de enlaces (header/footer): conexiones paralelas y timeout por URL
+    LINK_CHECK_WORKERS = 8
+    LINK_CHECK_TIMEOUT = 15
+    
+    # Registro de localizadores: compilar a CSS los XPath de las páginas que tengan equivalente
+    COMPILE_LOCATORS = True
+    
+    # Nivel de evidencia (--evidence): off | on-failure | per-step | verbose
+    EVIDENCE_LEVEL = "verbose"
+    
+    # Screenshots pendientes de escribir a disco antes de bloquear el test (backpressure)
+    SCREENSHOT_QUEUE_SIZE = 16
+    
+    # Codificación de los screenshots que no son de fallo (--screenshot-format/-quality/-scale/-grayscale)
+    SCREENSHOT_FORMAT = "png"          # png | jpeg | webp
+    SCREENSHOT_QUALITY = 80            # Calidad JPEG/WebP (1-100)
+    SCREENSHOT_SCALE = 1.0             # Factor de reducción (0.5 = mitad de ancho y alto)
+    SCREENSHOT_GRAYSCALE = False
+    
+    # Deduplicación perceptual de screenshots consecutivos de un test
+    SCREENSHOT_DEDUPE = True
+    SCREENSHOT_DEDUPE_GRID = 64        # Columnas de la miniatura en escala de grises
+    SCREENSHOT_DEDUPE_TOLERANCE = 12   # Diferencia de gris por celda que cuenta como cambio
+    SCREENSHOT_HASH_SIZE = 8           # dHash de 8x8 = 64 bits
+    SCREENSHOT_DEDUPE_MAX_BITS = 10    # Bits distintos del hash para considerarlo casi igual
+    SCREENSHOT_DEDUPE_MAX_AREA = 0.5   # Fracción máxima de la imagen que ocupa el recorte
+    
+    # Video de evidencia: screencast de DevTools en Chromium/Edge, screenshots en el resto
+    VIDEO_MODE = "always"              # off | on-failure | always (--video)
+    VIDEO_BUFFER_SECONDS = 30          # Segundos que conserva el modo on-failure
+    VIDEO_FPS = 15
+    VIDEO_QUALITY = 70                 # Calidad JPEG de los frames del screencast
+    VIDEO_MAX_WIDTH = 1280
+    VIDEO_MAX_HEIGHT = 720
+    VIDEO_SCREENSHOT_INTERVAL = 1.0    # Segundos entre screenshots sin screencast
+    VIDEO_CHANGE_GRID = 64             # Columnas de la miniatura para detectar cambios
+    VIDEO_CHANGE_THRESHOLD = 8         # Diferencia de gris por celda para conservar un frame (0 = todos)
+    VIDEO_QUEUE_SIZE = 64              # Frames pendientes de codificar (modo always)
+    VIDEO_VFR = True                   # Con ffmpeg en el PATH: frame rate variable (cada frame se codifica una vez)
+    
     # Idiomas
     LANGUAGES = {
         "spanish": "Español",
@@ -0,0 +1,237 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from selenium.common.exceptions import WebDriverException
+from utils.config import Config
+from utils.logger import logger
+from utils.session_watchdog import unregister_driver_process
+
+class DriverPool:
+    """Pool de sesiones WebDriver reutilizables (una instancia por worker de xdist)"""
+
+    def __init__(self, factory, max_uses=Config.DRIVER_POOL_MAX_USES,
+                 max_idle=Config.DRIVER_POOL_MAX_IDLE):
+        # factory(browser_name) -> driver nuevo, ya configurado
+        self.factory = factory
+        self.max_uses = max_uses
+        self.max_idle = max_idle
+        self._idle = {}
+        self._pending = {}
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._executor = None
+        
+        # Métricas de arranque: tiempo de lanzamiento oculto en segundo plano vs esperado
+        self.launches = 0
+        self.hidden_launch_time = 0.0
+        self.waited_launch_time = 0.0
+
+    def acquire(self, browser_name):
+        """Entregar una sesión caliente del navegador o crear una nueva.
+
+        Las sesiones ociosas de otros navegadores se cierran: los tests van ordenados por
+        navegador, así que ya no se volverán a usar y solo ocuparían memoria.
+        """
+        browser_name = browser_name.lower()
+
+        with self._lock:
+            others = [(browser, d) for browser, drivers in self._idle.items()
+                      if browser != browser_name for d in drivers]
+            for browser in [browser for browser in self._idle if browser != browser_name]:
+                del self._idle[browser]
+        for other_browser, driver in others:
+            self._discard(driver, other_browser, f"los tests pasan a {browser_name.upper()}")
+
+        while True:
+            with self._lock:
+                idle = self._idle.get(browser_name, [])
+                driver = idle.pop() if idle else None
+
+            if driver is None:
+                break
+
+            if self.is_healthy(driver):
+                logger.info(f"♻️  Reutilizando sesión {browser_name.upper()} "
+                            f"(uso {self._uses.get(id(driver), 0) + 1}/{self.max_uses})")
+                return driver
+
+            self._discard(driver, browser_name, "sesión no responde")
+
+        # Navegador que ya se está lanzando en segundo plano
+        with self._lock:
+            pending = self._pending.get(browser_name, [])
+            future = pending.pop(0) if pending else None
+
+        if future is not None:
+            wait_start = time.time()
+            try:
+                driver, launch_time = future.result()
+            except Exception as e:
+                logger.warning(f"⚠️  Prefetch de {browser_name.upper()} falló: {e}")
+            else:
+                waited = time.time() - wait_start
+                self._record_launch(launch_time, waited)
+                logger.info(f"⚡ Sesión {browser_name.upper()} pre-lanzada "
+                            f"(oculto {max(launch_time - waited, 0):.1f}s, esperado {waited:.1f}s)")
+                return driver
+
+        start = time.time()
+        driver = self.factory(browser_name)
+        launch_time = time.time() - start
+        self._record_launch(launch_time, launch_time)
+        with self._lock:
+            self._uses[id(driver)] = 0
+        return driver
+
+    def prefetch(self, browser_name):
+        """Lanzar en segundo plano una sesión para el próximo test si hace falta"""
+        browser_name = browser_name.lower()
+
+        with self._lock:
+            if self._idle.get(browser_name) or self._pending.get(browser_name):
+                return False
+            if self._idle_count() >= self.max_idle:
+                logger.debug(f"Prefetch de {browser_name} omitido: límite de {self.max_idle} navegadores ociosos")
+                return False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_idle,
+                                                    thread_name_prefix="driver-prefetch")
+            future = self._executor.submit(self._launch, browser_name)
+            self._pending.setdefault(browser_name, []).append(future)
+
+        logger.info(f"🚀 Pre-lanzando sesión {browser_name.upper()} en segundo plano")
+        return True
+
+    def will_recycle(self, driver):
+        """True si la sesión se descartará al terminar el test actual"""
+        return self._uses.get(id(driver), 0) + 1 >= self.max_uses
+
+    def launch_report(self):
+        """Resumen del tiempo de arranque oculto vs esperado"""
+        return {
+            "launches": self.launches,
+            "hidden_seconds": round(self.hidden_launch_time, 2),
+            "waited_seconds": round(self.waited_launch_time, 2),
+        }
+
+    def release(self, driver, browser_name, healthy=True):
+        """Devolver una sesión al pool tras el test (o descartarla)"""
+        browser_name = browser_name.lower()
+
+        with self._lock:
+            uses = self._uses.get(id(driver), 0) + 1
+            self._uses[id(driver)] = uses
+
+        if not healthy:
+            self._discard(driver, browser_name, "señal de sesión no saludable")
+        elif uses >= self.max_uses:
+            self._discard(driver, browser_name, f"reciclada tras {uses} tests")
+        elif not self.reset(driver):
+            self._discard(driver, browser_name, "falló el reset de estado")
+        else:
+            with self._lock:
+                full = self._idle_count() >= self.max_idle
+                if not full:
+                    self._idle.setdefault(browser_name, []).append(driver)
+            if full:
+                self._discard(driver, browser_name, f"límite de {self.max_idle} navegadores ociosos")
+
+    def is_healthy(self, driver):
+        """Chequeo rápido de que la sesión sigue viva"""
+        try:
+            return bool(driver.window_handles)
+        except WebDriverException:
+            return False
+
+    def reset(self, driver):
+        """Limpiar estado entre tests: cookies, storage, ventanas extra y about:blank"""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+
+            # Storage del origen actual (about:blank/data: no tienen storage)
+            try:
+                driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+            except WebDriverException:
+                pass
+            driver.delete_all_cookies()
+
+            # En Chromium se limpian también los orígenes conocidos que no son el actual
+            if hasattr(driver, "execute_cdp_cmd"):
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                for origin in self._known_origins():
+                    driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                        "origin": origin,
+                        "storageTypes": "cookies,local_storage,indexeddb,websql,service_workers,cache_storage"
+                    })
+
+            driver.get("about:blank")
+            return True
+
+        except WebDriverException as e:
+            logger.warning(f"⚠️  Error reseteando sesión: {e}")
+            return False
+
+    def shutdown(self):
+        """Cerrar todas las sesiones ociosas y pre-lanzadas del pool"""
+        with self._lock:
+            idle = [(browser, d) for browser, drivers in self._idle.items() for d in drivers]
+            pending = [(browser, f) for browser, futures in self._pending.items() for f in futures]
+            self._idle.clear()
+            self._pending.clear()
+
+        for browser_name, future in pending:
+            try:
+                idle.append((browser_name, future.result()[0]))
+            except Exception:
+                pass
+
+        for browser_name, driver in idle:
+            self._discard(driver, browser_name, "fin de sesión de pruebas")
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+        if self.launches:
+            report = self.launch_report()
+            logger.info(f"🚀 Arranques de navegador: {report['launches']} | "
+                        f"oculto {report['hidden_seconds']}s | esperado {report['waited_seconds']}s")
+
+    def _launch(self, browser_name):
+        start = time.time()
+        driver = self.factory(browser_name)
+        with self._lock:
+            self._uses[id(driver)] = 0
+        return driver, time.time() - start
+
+    def _record_launch(self, launch_time, waited):
+        with self._lock:
+            self.launches += 1
+            self.waited_launch_time += waited
+            self.hidden_launch_time += max(launch_time - waited, 0)
+
+    def _idle_count(self):
+        return (sum(len(d) for d in self._idle.values())
+                + sum(len(f) for f in self._pending.values()))
+
+    def _discard(self, driver, browser_name, reason):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"Error cerrando driver descartado: {e}")
+        unregister_driver_process(driver)
+        logger.info(f"🗑️  Sesión {browser_name.upper()} descartada: {reason}")
+
+    @staticmethod
+    def _known_origins():
+        origins = set()
+        for url in (Config.BASE_URL_4, Config.BASE_URL_5, Config.LOGIN_URL):
+            parts = urlsplit(url)
+            origins.add(f"{parts.scheme}://{parts.netloc}")
+        return sorted(origins)
@@ -0,0 +1,164 @@
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from utils.config import Config
+from utils.file_lock import FileLock
+from utils.logger import logger
+
+class DriverResolver:
+    """Resolución de binarios de driver una sola vez por sesión, sin depender de la red"""
+
+    # Nombres de binario aceptados en Config.DRIVER_DIR / PATH
+    DRIVER_BINARIES = {
+        "chrome": ["chromedriver"],
+        "firefox": ["geckodriver"],
+        "edge": ["msedgedriver"],
+    }
+
+    # Ejecutables del navegador para detectar la versión instalada
+    BROWSER_BINARIES = {
+        "chrome": ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"],
+        "firefox": ["firefox"],
+        "edge": ["microsoft-edge", "microsoft-edge-stable", "msedge"],
+    }
+
+    # Claves de registro con la versión del navegador (Windows)
+    WINDOWS_VERSION_KEYS = {
+        "chrome": r"Software\Google\Chrome\BLBeacon",
+        "edge": r"Software\Microsoft\Edge\BLBeacon",
+    }
+
+    def __init__(self, driver_dir=Config.DRIVER_DIR, offline=False):
+        self.driver_dir = driver_dir
+        self.offline = offline
+        self.manifest_path = os.path.join(driver_dir, "manifest.json")
+        # La descarga de webdriver-manager se hace con el lock tomado (un solo worker instala);
+        # el resto espera hasta DRIVER_INSTALL_TIMEOUT y FileLock no lo da por abandonado
+        self._lock = FileLock(os.path.join(driver_dir, ".manifest.lock"), timeout=Config.DRIVER_INSTALL_TIMEOUT)
+        self._resolved = {}
+
+    def resolve(self, browser_name):
+        """Ruta del driver para el navegador, o None para usar el de Selenium/PATH"""
+        browser_name = browser_name.lower()
+        if browser_name in self._resolved:
+            return self._resolved[browser_name]
+
+        start = time.time()
+        version = self.browser_version(browser_name)
+        key = f"{browser_name}-{version.split('.')[0]}"
+
+        with self._lock:
+            manifest = self._read_manifest()
+            entry = manifest.get(key, {})
+            path = entry.get("path")
+
+            if not (path and os.path.isfile(path)):
+                path = self._find_local(browser_name)
+
+                if path:
+                    manifest[key] = {"path": path, "resolved_at": time.time()}
+                    self._write_manifest(manifest)
+                elif not self.offline and not self._recently_failed(entry):
+                    path = self._install_with_manager(browser_name)
+                    # Un fallo se recuerda para que otros workers no repitan la espera de red
+                    manifest[key] = ({"path": path, "resolved_at": time.time()} if path
+                                     else {"path": None, "failed_at": time.time()})
+                    self._write_manifest(manifest)
+
+        self._resolved[browser_name] = path
+        if path:
+            logger.info(f"🔧 Driver {browser_name.upper()} ({key}): {path} [{time.time() - start:.2f}s]")
+        else:
+            logger.warning(f"⚠️  Sin driver local para {browser_name.upper()} ({key}); "
+                           f"se usará el de Selenium/PATH")
+        return path
+
+    def browser_version(self, browser_name):
+        """Versión instalada del navegador, detectada sin red ('unknown' si no se puede)"""
+        if sys.platform == "win32":
+            version = self._windows_browser_version(browser_name)
+            if version:
+                return version
+
+        for binary in self.BROWSER_BINARIES.get(browser_name, []):
+            executable = shutil.which(binary)
+            if not executable:
+                continue
+            version = self._binary_version(executable)
+            if version:
+                return version
+
+        return "unknown"
+
+    def _find_local(self, browser_name):
+        """Buscar el driver en Config.DRIVER_DIR y luego en el PATH"""
+        suffix = ".exe" if sys.platform == "win32" else ""
+        for name in self.DRIVER_BINARIES.get(browser_name, []):
+            candidate = os.path.join(self.driver_dir, name + suffix)
+            if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                return candidate
+
+        for name in self.DRIVER_BINARIES.get(browser_name, [])[:1]:
+            on_path = shutil.which(name)
+            if on_path:
+                return on_path
+
+        return None
+
+    def _install_with_manager(self, browser_name):
+        """Último recurso con red: webdriver-manager (una vez por versión de navegador)"""
+        try:
+            if browser_name == "chrome":
+                from webdriver_manager.chrome import ChromeDriverManager
+                return ChromeDriverManager().install()
+            if browser_name == "firefox":
+                from webdriver_manager.firefox import GeckoDriverManager
+                return GeckoDriverManager().install()
+            if browser_name == "edge":
+                from webdriver_manager.microsoft import EdgeChromiumDriverManager
+                return EdgeChromiumDriverManager().install()
+        except Exception as e:
+            logger.warning(f"WebDriver Manager falló para {browser_name}: {e}")
+        return None
+
+    def _recently_failed(self, entry):
+        failed_at = entry.get("failed_at")
+        return bool(failed_at) and time.time() - failed_at < Config.DRIVER_RESOLVE_RETRY_AFTER
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    @staticmethod
+    def _binary_version(executable):
+        try:
+            output = subprocess.run([executable, "--version"], capture_output=True,
+                                    text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError):
+            return None
+        match = re.search(r"(\d+(?:\.\d+)+)", output)
+        return match.group(1) if match else None
+
+    def _windows_browser_version(self, browser_name):
+        key_path = self.WINDOWS_VERSION_KEYS.get(browser_name)
+        if not key_path:
+            return None
+        try:
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path) as key:
+                return winreg.QueryValueEx(key, "version")[0]
+        except OSError:
+            return None
@@ -0,0 +1,35 @@
+from utils.config import Config
+
+class EvidencePolicy:
+    """Nivel de evidencia global: qué screenshots se toman y si se resaltan/pausan las acciones
+
+    - off: nada (ni siquiera en fallos)
+    - on-failure: solo evidencia de fallos (timeouts, errores, test fallido)
+    - per-step: además checkpoints de los tests/páginas y un screenshot tras cada acción
+    - verbose: además screenshot antes de cada acción, resaltado y pausas visuales
+    """
+
+    LEVELS = ["off", "on-failure", "per-step", "verbose"]
+
+    # Nivel mínimo para cada tipo de screenshot
+    KINDS = {
+        "failure": "on-failure",
+        "step": "per-step",
+        "detail": "verbose",
+    }
+
+    def __init__(self, level=Config.EVIDENCE_LEVEL):
+        self.level = level
+
+    def allows(self, kind):
+        """True si el nivel actual incluye screenshots de tipo `kind` (failure, step, detail)"""
+        return self.LEVELS.index(self.level) >= self.LEVELS.index(self.KINDS[kind])
+
+    @property
+    def highlight(self):
+        """Resaltar elementos y pausar para que se vean en screenshots y video"""
+        return self.level == "verbose"
+
+
+# Compartido por páginas y helpers (conftest fija el nivel con --evidence)
+evidence_policy = EvidencePolicy()
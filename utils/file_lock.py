@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+import uuid
+
+class FileLock:
+    """Lock entre procesos basado en archivo (sirve para workers de xdist, también en Windows).
+
+    Mientras se tiene, un hilo renueva la fecha del archivo cada stale_after/4: solo se
+    considera abandonado (stale) el lock de un proceso que murió, no el de uno lento.
+    El archivo guarda un token único del dueño: solo él lo renueva y lo borra, y un lock
+    abandonado se rompe renombrándolo (atómico) para que dos procesos no lo rompan a la vez.
+    """
+
+    def __init__(self, path, timeout=60, stale_after=120):
+        self.path = path
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self._stop_heartbeat = threading.Event()
+        self._heartbeat = None
+        self._token = None
+
+    def acquire(self):
+        """Tomar el lock esperando como máximo `timeout` segundos"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        deadline = time.time() + self.timeout
+
+        token = f"{os.getpid()}:{uuid.uuid4().hex}"
+
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(fd, token.encode())
+                os.close(fd)
+                self._token = token
+                self._start_heartbeat()
+                return
+            except FileExistsError:
+                # Un worker que murió con el lock tomado no debe bloquear al resto
+                if self._is_stale(self.path):
+                    self._break_stale(token)
+                    continue
+                if time.time() > deadline:
+                    raise TimeoutError(f"No se pudo tomar el lock: {self.path}")
+                time.sleep(0.05)
+
+    def release(self):
+        """Liberar el lock"""
+        self._stop_heartbeat.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        # Si otro proceso lo rompió y lo tomó, el archivo ya no es nuestro
+        if self._owned():
+            self._remove(self.path)
+        self._token = None
+
+    def _start_heartbeat(self):
+        self._stop_heartbeat.clear()
+        self._heartbeat = threading.Thread(target=self._refresh, name="file-lock-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    def _refresh(self):
+        while not self._stop_heartbeat.wait(self.stale_after / 4):
+            if not self._owned():
+                return
+            try:
+                os.utime(self.path)
+            except OSError:
+                return
+
+    def _owned(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return f.read() == self._token
+        except OSError:
+            return False
+
+    def _break_stale(self, token):
+        """Apartar el lock abandonado con un rename atómico (solo un proceso lo consigue)"""
+        broken = f"{self.path}.{token.replace(':', '_')}.stale"
+        try:
+            os.rename(self.path, broken)
+        except OSError:
+            return
+        if self._is_stale(broken):
+            self._remove(broken)
+            return
+        # Entre la comprobación y el rename otro proceso lo rompió y tomó uno nuevo: devolverlo
+        try:
+            os.link(broken, self.path)
+        except OSError:
+            pass
+        self._remove(broken)
+
+    def _is_stale(self, path):
+        try:
+            return time.time() - os.path.getmtime(path) > self.stale_after
+        except OSError:
+            return False
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
@@ -0,0 +1,131 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import urllib3
+from utils.config import Config
+from utils.logger import logger
+
+class LinkVerifier:
+    """Verificación HTTP concurrente de enlaces: status, URL final, redirecciones y latencia"""
+
+    # Recolecta href/target de todos los XPaths en una sola llamada al navegador
+    COLLECT_SCRIPT = """
+        var xpaths = arguments[0];
+        var links = [];
+        for (var i = 0; i < xpaths.length; i++) {
+            var node = document.evaluate(xpaths[i], document, null,
+                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+            if (!node) { links.push(null); continue; }
+            // Textos del header/footer suelen ser <span> dentro del <a>
+            if (node.closest && node.closest('a')) { node = node.closest('a'); }
+            links.push({
+                href: node.href || '',
+                raw_href: node.getAttribute('href') || '',
+                target: node.getAttribute('target') || '',
+                text: (node.textContent || '').trim(),
+                has_onclick: node.hasAttribute('onclick')
+            });
+        }
+        return {links: links, page_url: location.href, user_agent: navigator.userAgent};
+    """
+
+    def __init__(self, max_workers=Config.LINK_CHECK_WORKERS, timeout=Config.LINK_CHECK_TIMEOUT,
+                 max_redirects=10, user_agent=None):
+        self.max_workers = max_workers
+        self.user_agent = user_agent
+        self.http = urllib3.PoolManager(
+            maxsize=max_workers,
+            timeout=urllib3.Timeout(total=timeout),
+            # Redirecciones hasta max_redirects; un solo reintento ante fallos de conexión
+            retries=urllib3.Retry(total=max_redirects + 1, redirect=max_redirects, connect=1, read=1,
+                                  other=0, raise_on_redirect=False, raise_on_status=False),
+        )
+
+    # ==================== RECOLECCIÓN EN EL DOM ====================
+
+    def collect_links(self, driver, links):
+        """Obtener href de cada enlace {nombre: (By.XPATH, xpath)} en un único execute_script"""
+        names = list(links)
+        data = driver.execute_script(self.COLLECT_SCRIPT, [links[name][1] for name in names])
+        self.user_agent = self.user_agent or data["user_agent"]
+
+        collected = {}
+        for name, link in zip(names, data["links"]):
+            if link is not None:
+                link["js_driven"] = self.is_js_driven(link)
+                link["page_url"] = data["page_url"]
+            collected[name] = link
+        return collected
+
+    @staticmethod
+    def is_js_driven(link):
+        """True si el enlace no tiene un destino HTTP navegable (requiere click real)"""
+        raw_href = (link.get("raw_href") or "").strip().lower()
+        return (link.get("has_onclick", False)
+                or raw_href in ("", "#")
+                or raw_href.startswith("#")
+                or raw_href.startswith("javascript:")
+                or not (link.get("href") or "").startswith("http"))
+
+    # ==================== VERIFICACIÓN HTTP ====================
+
+    def check(self, url):
+        """GET siguiendo redirecciones; nunca lanza excepción"""
+        headers = {"User-Agent": self.user_agent} if self.user_agent else {}
+        start = time.time()
+        try:
+            response = self.http.request("GET", url, headers=headers, redirect=True)
+            history = response.retries.history if response.retries else ()
+            result = {
+                "url": url,
+                "status": response.status,
+                "final_url": response.geturl() or url,
+                "redirects": len(history),
+                "latency_ms": round((time.time() - start) * 1000),
+                # Un 3xx final significa que se agotaron las redirecciones
+                "ok": 200 <= response.status < 300,
+            }
+            if 300 <= response.status < 400:
+                result["error"] = f"Redirecciones agotadas ({len(history)}) en {result['final_url']}"
+            return result
+        except urllib3.exceptions.HTTPError as e:
+            return {
+                "url": url,
+                "status": None,
+                "final_url": None,
+                "redirects": 0,
+                "latency_ms": round((time.time() - start) * 1000),
+                "ok": False,
+                "error": str(e),
+            }
+
+    def check_all(self, urls):
+        """Verificar varias URLs en paralelo con conexiones reutilizadas"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.check, urls))
+
+    def verify(self, driver, links):
+        """Recolectar enlaces y verificar por HTTP los que tienen destino navegable.
+
+        Los enlaces manejados por JavaScript quedan con method='click' para que
+        el test los pruebe con un click real.
+        """
+        collected = self.collect_links(driver, links)
+        http_links = {name: link for name, link in collected.items()
+                      if link is not None and not link["js_driven"]}
+        checks = dict(zip(http_links, self.check_all([link["href"] for link in http_links.values()])))
+
+        results = {}
+        for name, link in collected.items():
+            if link is None:
+                results[name] = {"link": name, "method": "missing", "ok": False}
+            elif link["js_driven"]:
+                results[name] = {"link": name, "method": "click", "href": link["raw_href"]}
+            else:
+                result = checks[name]
+                result.update({"link": name, "method": "http",
+                               "url_changed": result["final_url"] != link["page_url"]})
+                results[name] = result
+                logger.info(f"  {'✓' if result['ok'] else '✗'} {name}: {result['status']} → "
+                            f"{result['final_url']} ({result['redirects']} redirecciones, "
+                            f"{result['latency_ms']} ms)")
+        return results
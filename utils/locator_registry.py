@@ -0,0 +1,234 @@
+import functools
+import re
+from selenium.webdriver.common.by import By
+from utils.config import Config
+from utils.logger import logger
+
+# Estrategias de Selenium (By.XPATH, By.ID, ...) que identifican una tupla como localizador
+STRATEGIES = {value for name, value in vars(By).items() if name.isupper()}
+
+# Máximo de selectores CSS separados por coma al expandir `or`
+MAX_ALTERNATIVES = 8
+
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<descendant>//) | (?P<child>/) |
+        (?P<literal>'[^']*'|"[^"]*") |
+        (?P<number>\d+(?:\.\d+)?) |
+        (?P<attribute>@[A-Za-z_][\w.-]*) |
+        (?P<axis>[A-Za-z_][\w.-]*::) |
+        (?P<name>[A-Za-z_][\w.-]*) |
+        (?P<symbol>!=|[\[\](),=*.|])
+    )""", re.VERBOSE)
+
+SIMPLE_IDENTIFIER = re.compile(r"^[A-Za-z_][\w-]*$")
+
+
+class Untranslatable(Exception):
+    """El XPath usa algo sin equivalente CSS (texto, posición, ejes, funciones...)"""
+
+
+def is_locator(value):
+    """True para tuplas (By.*, str) como las que declaran las páginas"""
+    return (isinstance(value, tuple) and len(value) == 2
+            and value[0] in STRATEGIES and isinstance(value[1], str))
+
+
+def xpath_literal(text):
+    """Literal XPath 1.0 para `text` (con concat() si contiene comillas simples y dobles)"""
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    parts = text.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+@functools.lru_cache(maxsize=None)
+def xpath_to_css(xpath):
+    """CSS equivalente a `xpath` o None si no lo hay.
+
+    Soporta pasos `//` y `/` con nombre o `*`, y predicados con @attr, @attr='v',
+    contains(@attr, 'v'), starts-with(@attr, 'v'), `and` y `or` (expandido a selectores
+    separados por coma). text(), `.`, posiciones, ejes y demás funciones no se traducen.
+    """
+    try:
+        return _XPathTranslator(xpath).translate()
+    except Untranslatable:
+        return None
+
+
+class _XPathTranslator:
+    """Parser descendente del subconjunto de XPath con equivalente CSS exacto"""
+
+    def __init__(self, xpath):
+        self.tokens = self._tokenize(xpath)
+        self.position = 0
+
+    @staticmethod
+    def _tokenize(xpath):
+        tokens, position = [], 0
+        xpath = xpath.strip()
+        while position < len(xpath):
+            match = TOKEN_PATTERN.match(xpath, position)
+            if not match or match.end() == position:
+                raise Untranslatable(xpath[position:])
+            kind = match.lastgroup
+            tokens.append((kind, match.group(kind)))
+            position = match.end()
+        return tokens
+
+    def translate(self):
+        # Solo rutas absolutas desde cualquier punto del documento (`//...`)
+        if self._peek() != ("descendant", "//"):
+            raise Untranslatable("la ruta debe empezar por //")
+
+        alternatives = [""]
+        while self.position < len(self.tokens):
+            kind, _ = self._next()
+            if kind not in ("descendant", "child"):
+                raise Untranslatable("se esperaba / o //")
+            combinator = "" if not alternatives[0] else (" " if kind == "descendant" else " > ")
+            step = self._step()
+            alternatives = [prefix + combinator + option for prefix in alternatives for option in step]
+            if len(alternatives) > MAX_ALTERNATIVES:
+                raise Untranslatable("demasiadas alternativas")
+        return ", ".join(alternatives)
+
+    def _step(self):
+        kind, value = self._next()
+        if kind == "name":
+            tag = value
+        elif (kind, value) == ("symbol", "*"):
+            tag = ""
+        else:
+            raise Untranslatable(f"paso no soportado: {value}")
+
+        options = [tag]
+        while self._peek() == ("symbol", "["):
+            self._next()
+            predicate = self._or_expression()
+            self._expect("]")
+            options = [base + condition for base in options for condition in predicate]
+        return [option or "*" for option in options]
+
+    def _or_expression(self):
+        options = self._and_expression()
+        while self._peek() == ("name", "or"):
+            self._next()
+            options += self._and_expression()
+        return options
+
+    def _and_expression(self):
+        options = self._condition()
+        while self._peek() == ("name", "and"):
+            self._next()
+            options = [left + right for left in options for right in self._condition()]
+        return options
+
+    def _condition(self):
+        kind, value = self._next()
+        if (kind, value) == ("symbol", "("):
+            options = self._or_expression()
+            self._expect(")")
+            return options
+
+        if kind == "attribute":
+            attribute = value[1:]
+            if self._peek() == ("symbol", "="):
+                self._next()
+                literal = self._literal(allow_empty=True)
+                if attribute == "id" and SIMPLE_IDENTIFIER.match(literal):
+                    return [f"#{literal}"]
+                return [f"[{attribute}={self._css_string(literal)}]"]
+            return [f"[{attribute}]"]
+
+        operators = {"contains": "*=", "starts-with": "^="}
+        if kind == "name" and value in operators and self._peek() == ("symbol", "("):
+            self._next()
+            attribute_kind, attribute = self._next()
+            if attribute_kind != "attribute":
+                raise Untranslatable(f"{value}() sobre algo que no es un atributo")
+            self._expect(",")
+            # contains(@a, '') es cierto incluso sin atributo; en CSS no coincide nada
+            literal = self._literal(allow_empty=False)
+            self._expect(")")
+            return [f"[{attribute[1:]}{operators[value]}{self._css_string(literal)}]"]
+
+        raise Untranslatable(f"condición no soportada: {value}")
+
+    def _literal(self, allow_empty):
+        kind, value = self._next()
+        if kind != "literal":
+            raise Untranslatable("se esperaba un literal")
+        literal = value[1:-1]
+        if not literal and not allow_empty:
+            raise Untranslatable("literal vacío")
+        return literal
+
+    @staticmethod
+    def _css_string(literal):
+        return "'" + literal.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def _next(self):
+        token = self._peek()
+        if token == (None, None):
+            raise Untranslatable("XPath incompleto")
+        self.position += 1
+        return token
+
+    def _expect(self, symbol):
+        if self._next() != ("symbol", symbol):
+            raise Untranslatable(f"se esperaba {symbol}")
+
+
+class LocatorRegistry:
+    """Localizadores declarados por las páginas, con su forma compilada (CSS cuando existe)"""
+
+    def __init__(self, compile_xpath=Config.COMPILE_LOCATORS):
+        self.compile_xpath = compile_xpath
+        self.entries = {}
+
+    def register(self, owner, name, locator):
+        """Registrar `owner.name` y devolver el localizador a usar (compilado si procede)"""
+        compiled = self.compile(locator)
+        self.entries[f"{owner}.{name}"] = {
+            "owner": owner,
+            "name": name,
+            "original": locator,
+            "compiled": compiled,
+        }
+        return compiled if self.compile_xpath else locator
+
+    @staticmethod
+    def compile(locator):
+        """(By.CSS_SELECTOR, css) si el XPath tiene equivalente; si no, el localizador tal cual"""
+        by, value = locator
+        if by != By.XPATH:
+            return locator
+        css = xpath_to_css(value)
+        return (By.CSS_SELECTOR, css) if css else locator
+
+    def register_class(self, cls):
+        """Registrar los localizadores en MAYÚSCULAS de una clase de página"""
+        # Con módulo: home_page y home_page_OPTIMIZED declaran ambas un HomePage
+        owner = f"{cls.__module__}.{cls.__qualname__}"
+        for name, value in list(vars(cls).items()):
+            if name.isupper() and is_locator(value):
+                setattr(cls, name, self.register(owner, name, value))
+
+    def translated(self):
+        """Entradas cuyo XPath se compiló a CSS"""
+        return [entry for entry in self.entries.values() if entry["compiled"] != entry["original"]]
+
+    def log_summary(self):
+        xpaths = [e for e in self.entries.values() if e["original"][0] == By.XPATH]
+        logger.info(f"🧭 {len(self.entries)} localizadores registrados; "
+                    f"{len(self.translated())}/{len(xpaths)} XPath compilados a CSS")
+
+
+# Registro compartido por todas las páginas (BasePage.__init_subclass__)
+locator_registry = LocatorRegistry()
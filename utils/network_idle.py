@@ -0,0 +1,165 @@
+import json
+import re
+import time
+from selenium.common.exceptions import WebDriverException
+from utils.config import Config
+from utils.logger import logger
+
+class NetworkIdleMonitor:
+    """Espera a que no queden requests en vuelo (performance logs de Chromium o Resource Timing)"""
+
+    # Conexiones que nunca "terminan" y no deben bloquear la espera
+    LONG_LIVED_TYPES = {"WebSocket", "EventSource"}
+
+    # Performance logs en Chrome/Edge (conftest lo configura con --network-idle-logs)
+    performance_logs = Config.PERFORMANCE_LOGS
+
+    # Respaldo sin performance logs (Firefox): los recursos aparecen en Resource Timing al
+    # terminar, así que se mide el silencio desde el último; el shim de --sync-mode=angular
+    # aporta además los XHR/fetch en curso si está instalado.
+    RESOURCE_SCRIPT = """
+        var pattern = arguments[0] ? new RegExp(arguments[0], 'i') : null;
+        var since = arguments[1] - performance.timeOrigin;
+        var entries = performance.getEntriesByType('resource');
+        var count = 0, lastEnd = 0;
+        for (var i = 0; i < entries.length; i++) {
+            if (pattern && !pattern.test(entries[i].name)) { continue; }
+            if (entries[i].responseEnd < since) { continue; }
+            count++;
+            lastEnd = Math.max(lastEnd, entries[i].responseEnd);
+        }
+        return {count: count, quiet_ms: performance.now() - lastEnd,
+                pending: window.__appSync ? window.__appSync.pending : 0};
+    """
+
+    @staticmethod
+    def enable_logging(options, vendor="goog"):
+        """Activar performance logs (solo dominio Network) en opciones de Chrome/Edge"""
+        options.set_capability(f"{vendor}:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+        return options
+
+    @classmethod
+    def for_driver(cls, driver):
+        """Monitor único por sesión (guarda el estado de requests entre esperas)"""
+        monitor = getattr(driver, "network_monitor", None)
+        if monitor is None:
+            monitor = cls(driver)
+            driver.network_monitor = monitor
+        return monitor
+
+    def __init__(self, driver, ignored_urls=None):
+        self.driver = driver
+        self.ignored_urls = list(ignored_urls or Config.APP_SYNC_IGNORED_URLS)
+        self.inflight = {}
+        self.last_activity = {}
+        self.uses_logs = None
+
+    def wait_for_idle(self, idle_ms=Config.NETWORK_IDLE_MS, timeout=25, url_pattern=None):
+        """Esperar hasta que pasen idle_ms sin requests en vuelo que coincidan con url_pattern.
+
+        url_pattern es una regex (sin distinguir mayúsculas) compartida con el respaldo JS.
+        Solo cuenta la actividad desde NETWORK_IDLE_LOOKBACK_MS antes de la llamada (la que
+        disparó la acción previa); si aún no hay ninguna que coincida se espera hasta
+        NETWORK_IDLE_GRACE_MS a que empiece un request (p.ej. la búsqueda lanzada por un click).
+        Devuelve True al quedar ociosa la red y False al agotar el timeout.
+        """
+        if self.uses_logs is None:
+            self.uses_logs = self._drain()
+            if not self.uses_logs:
+                logger.debug("Performance logs no disponibles: esperando red con Resource Timing")
+
+        wait = self._wait_with_logs if self.uses_logs else self._wait_with_resource_timing
+        start = time.time()
+        since = start - Config.NETWORK_IDLE_LOOKBACK_MS / 1000
+        idle = wait(idle_ms, start + timeout, url_pattern, since)
+        elapsed = time.time() - start
+        if idle:
+            logger.info(f"🌐 Red ociosa{f' ({url_pattern})' if url_pattern else ''} tras {elapsed:.1f}s")
+        else:
+            logger.warning(f"⚠️  Red aún activa tras {elapsed:.1f}s{f' ({url_pattern})' if url_pattern else ''}")
+        return idle
+
+    # ==================== CHROMIUM: PERFORMANCE LOGS ====================
+
+    def _wait_with_logs(self, idle_ms, deadline, url_pattern, since):
+        pattern = re.compile(url_pattern, re.I) if url_pattern else None
+        grace_until = self._grace_until(deadline)
+        # last_activity guarda hasta NETWORK_IDLE_STALE_AFTER: un request que terminó antes de
+        # la acción no debe dar la red por ociosa antes de que empiece el nuevo
+        while True:
+            self._drain()
+            now = time.time()
+            pending = [url for url in self.inflight.values() if not pattern or pattern.search(url)]
+            last = max((ts for url, ts in self.last_activity.items()
+                        if ts >= since and (not pattern or pattern.search(url))), default=0)
+
+            seen = pending or last or now >= grace_until
+            if seen and not pending and (now - last) * 1000 >= idle_ms:
+                return True
+            if now >= deadline:
+                logger.debug(f"Requests en vuelo: {pending[:5]}")
+                return False
+            time.sleep(0.1)
+
+    def _drain(self):
+        """Consumir los eventos Network.* acumulados; False si el driver no tiene performance logs"""
+        try:
+            entries = self.driver.get_log("performance")
+        except (WebDriverException, AttributeError, ValueError):
+            return False
+
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method, params = message.get("method"), message.get("params", {})
+            timestamp = entry.get("timestamp", time.time() * 1000) / 1000
+
+            if method == "Network.requestWillBeSent":
+                url = params.get("request", {}).get("url", "")
+                if self._tracked(url, params.get("type")):
+                    self.inflight[params["requestId"]] = url
+                    self.last_activity[url] = timestamp
+            elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                url = self.inflight.pop(params.get("requestId"), None)
+                if url is not None:
+                    self.last_activity[url] = timestamp
+
+        # Requests huérfanos (p.ej. de un documento ya descargado) no bloquean para siempre
+        stale = time.time() - Config.NETWORK_IDLE_STALE_AFTER
+        self.inflight = {rid: url for rid, url in self.inflight.items() if self.last_activity[url] >= stale}
+        self.last_activity = {url: ts for url, ts in self.last_activity.items() if ts >= stale}
+        return True
+
+    @staticmethod
+    def _grace_until(deadline):
+        return min(time.time() + Config.NETWORK_IDLE_GRACE_MS / 1000, deadline)
+
+    def _tracked(self, url, resource_type):
+        if resource_type in self.LONG_LIVED_TYPES or url.startswith(("data:", "blob:")):
+            return False
+        return not any(ignored in url for ignored in self.ignored_urls)
+
+    # ==================== RESPALDO: RESOURCE TIMING ====================
+
+    def _wait_with_resource_timing(self, idle_ms, deadline, url_pattern, since):
+        previous = None
+        grace_until = self._grace_until(deadline)
+        while True:
+            try:
+                state = self.driver.execute_script(self.RESOURCE_SCRIPT, url_pattern, since * 1000)
+            except WebDriverException:
+                state = None
+
+            if state is not None:
+                stable = previous is not None and state["count"] == previous["count"]
+                seen = state["count"] or state["pending"] or time.time() >= grace_until
+                if seen and stable and not state["pending"] and state["quiet_ms"] >= idle_ms:
+                    return True
+            previous = state
+
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.1)
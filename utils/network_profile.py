@@ -0,0 +1,146 @@
+import json
+import os
+from urllib.parse import urlsplit
+from selenium.common.exceptions import WebDriverException
+from utils.config import Config
+from utils.file_lock import FileLock
+from utils.logger import logger
+
+class NetworkProfile:
+    """Perfil de red del navegador: 'off', 'baseline' (solo mide) o 'lean' (bloquea y mide)"""
+
+    MODES = ["off", "baseline", "lean"]
+
+    # Bytes y requests de la página según Resource Timing (incluye el documento)
+    PAGE_USAGE_SCRIPT = """
+        var nav = performance.getEntriesByType('navigation')[0];
+        var entries = performance.getEntriesByType('resource');
+        var bytes = nav ? (nav.transferSize || 0) : 0;
+        for (var i = 0; i < entries.length; i++) { bytes += entries[i].transferSize || 0; }
+        return {requests: entries.length + (nav ? 1 : 0), bytes: bytes};
+    """
+
+    def __init__(self, mode="off", block_images=Config.LEAN_NETWORK_BLOCK_IMAGES):
+        self.mode = mode
+        self.block_images = block_images
+        self.baseline_path = os.path.join(Config.REPORT_DIR, "network_baseline.json")
+        self.report_path = os.path.join(Config.REPORT_DIR, "network_savings.json")
+        self.pages = []
+        self._measured = {}
+        self._reference = None
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    @property
+    def blocked_patterns(self):
+        patterns = list(Config.LEAN_NETWORK_BLOCKED_URLS)
+        if self.block_images:
+            patterns += Config.LEAN_NETWORK_IMAGE_URLS
+        return patterns
+
+    # ==================== CONFIGURACIÓN DEL NAVEGADOR ====================
+
+    def apply_chrome_prefs(self, prefs):
+        """Preferencias de Chrome/Edge para el modo lean"""
+        if self.mode == "lean" and self.block_images:
+            prefs["profile.default_content_setting_values.images"] = 2
+
+    def apply_firefox_options(self, options):
+        """Equivalente en Firefox: protección de rastreo, sin fuentes web y sin imágenes"""
+        if self.mode != "lean":
+            return
+        options.set_preference("privacy.trackingprotection.enabled", True)
+        options.set_preference("privacy.trackingprotection.socialtracking.enabled", True)
+        options.set_preference("browser.display.use_document_fonts", 0)
+        if self.block_images:
+            options.set_preference("permissions.default.image", 2)
+
+    def attach(self, driver):
+        """Activar el perfil en una sesión ya creada"""
+        if not self.enabled:
+            return driver
+
+        if self.mode == "lean":
+            if hasattr(driver, "execute_cdp_cmd"):
+                # Chromium: bloqueo por patrón vía DevTools (persiste entre navegaciones)
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.blocked_patterns})
+                logger.info(f"🚫 Perfil de red lean: {len(self.blocked_patterns)} patrones bloqueados")
+            else:
+                logger.info("🚫 Perfil de red lean (Firefox): tracking protection, sin fuentes web"
+                            f"{' ni imágenes' if self.block_images else ''}")
+
+        driver.network_profile = self
+        return driver
+
+    # ==================== MEDICIÓN ====================
+
+    def record_page(self, driver, label=None):
+        """Registrar bytes/requests de la página actual y el ahorro frente a la línea base"""
+        try:
+            usage = driver.execute_script(self.PAGE_USAGE_SCRIPT)
+            url = driver.current_url
+        except WebDriverException as e:
+            logger.debug(f"No se pudo medir uso de red: {e}")
+            return None
+
+        key = self.page_key(url)
+        entry = {"page": key, "label": label or key, "mode": self.mode,
+                 "requests": usage["requests"], "bytes": usage["bytes"]}
+
+        if self.mode == "baseline":
+            self._measured[key] = {"requests": usage["requests"], "bytes": usage["bytes"]}
+        else:
+            baseline = self._load_reference().get(key)
+            if baseline:
+                entry["saved_requests"] = baseline["requests"] - usage["requests"]
+                entry["saved_bytes"] = baseline["bytes"] - usage["bytes"]
+                logger.info(f"🚫 {entry['label']}: {usage['requests']} requests / "
+                            f"{usage['bytes'] / 1024:.0f} KB (ahorro {entry['saved_requests']} requests, "
+                            f"{entry['saved_bytes'] / 1024:.0f} KB)")
+
+        self.pages.append(entry)
+        return entry
+
+    def save(self):
+        """Persistir línea base y reporte de ahorro (fusionando entre workers)"""
+        if not self.enabled or not self.pages:
+            return
+
+        os.makedirs(Config.REPORT_DIR, exist_ok=True)
+        with FileLock(os.path.join(Config.REPORT_DIR, ".network.lock")):
+            if self._measured:
+                baseline = self._read_json(self.baseline_path, {})
+                baseline.update(self._measured)
+                self._write_json(self.baseline_path, baseline)
+
+            report = self._read_json(self.report_path, [])
+            report.extend(self.pages)
+            self._write_json(self.report_path, report)
+
+        logger.info(f"📊 Uso de red por página guardado en: {self.report_path}")
+
+    @staticmethod
+    def page_key(url):
+        parts = urlsplit(url)
+        return f"{parts.netloc}{parts.path}"
+
+    def _load_reference(self):
+        if self._reference is None:
+            self._reference = self._read_json(self.baseline_path, {})
+        return self._reference
+
+    @staticmethod
+    def _read_json(path, default):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return default
+
+    @staticmethod
+    def _write_json(path, data):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
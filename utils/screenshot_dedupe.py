@@ -0,0 +1,94 @@
+import cv2
+import numpy as np
+from utils.config import Config
+
+# Resultado de comparar un screenshot con la referencia del test
+NEW = "new"
+DUPLICATE = "duplicate"
+NEAR_DUPLICATE = "near-duplicate"
+
+
+def thumbnail(png, width=Config.SCREENSHOT_DEDUPE_GRID):
+    """Miniatura en escala de grises (`width` columnas, misma proporción) y tamaño original"""
+    image = cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        raise ValueError("PNG no válido")
+    height = max(1, round(width * image.shape[0] / image.shape[1]))
+    small = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
+    return small.astype(np.int16), image.shape[:2]
+
+
+def dhash(small, hash_size=Config.SCREENSHOT_HASH_SIZE):
+    """Hash perceptual por diferencias (dHash) de una miniatura: entero de hash_size² bits"""
+    reduced = cv2.resize(small.astype(np.uint8), (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (reduced[:, 1:] > reduced[:, :-1]).flatten()
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+class ScreenshotHistory:
+    """Screenshots de un test: detecta los iguales o casi iguales a la última referencia.
+
+    - duplicate: ninguna celda de la miniatura cambia (no se guarda ni se adjunta la imagen)
+    - near-duplicate: hash parecido y cambio localizado (se guarda solo el recorte que cambió)
+    - new: se guarda completo y pasa a ser la referencia
+    """
+
+    def __init__(self, tolerance=Config.SCREENSHOT_DEDUPE_TOLERANCE,
+                 max_hash_distance=Config.SCREENSHOT_DEDUPE_MAX_BITS,
+                 max_area=Config.SCREENSHOT_DEDUPE_MAX_AREA):
+        self.tolerance = tolerance
+        self.max_hash_distance = max_hash_distance
+        self.max_area = max_area
+        self.reference = None
+        self.saved = 0
+        self.skipped = 0
+
+    def classify(self, name, png):
+        """(NEW | DUPLICATE | NEAR_DUPLICATE, nombre de la referencia, bbox en píxeles o None)"""
+        small, size = thumbnail(png)
+        image_hash = dhash(small)
+        reference = self.reference
+
+        if reference is None or reference["size"] != size or reference["small"].shape != small.shape:
+            return self._new(name, small, size, image_hash)
+
+        changed = np.abs(small - reference["small"]) > self.tolerance
+        if not changed.any():
+            self.skipped += 1
+            return DUPLICATE, reference["name"], None
+
+        distance = bin(image_hash ^ reference["hash"]).count("1")
+        bbox = self._bbox(changed, size)
+        x, y, w, h = bbox
+        if distance <= self.max_hash_distance and w * h <= self.max_area * size[0] * size[1]:
+            self.saved += 1
+            return NEAR_DUPLICATE, reference["name"], bbox
+
+        return self._new(name, small, size, image_hash)
+
+    def _new(self, name, small, size, image_hash):
+        self.reference = {"name": name, "small": small, "size": size, "hash": image_hash}
+        return NEW, None, None
+
+    @staticmethod
+    def _bbox(changed, size):
+        """Celdas cambiadas → (x, y, ancho, alto) en píxeles de la imagen original, con una celda de margen"""
+        rows = np.flatnonzero(changed.any(axis=1))
+        cols = np.flatnonzero(changed.any(axis=0))
+        cell_h = size[0] / changed.shape[0]
+        cell_w = size[1] / changed.shape[1]
+        top = max(0, int((rows[0] - 1) * cell_h))
+        left = max(0, int((cols[0] - 1) * cell_w))
+        bottom = min(size[0], int(np.ceil((rows[-1] + 2) * cell_h)))
+        right = min(size[1], int(np.ceil((cols[-1] + 2) * cell_w)))
+        return left, top, right - left, bottom - top
+
+
+def crop_png(png, bbox):
+    """Recorte `bbox` (x, y, ancho, alto) de un PNG, codificado como PNG"""
+    image = cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_UNCHANGED)
+    x, y, w, h = bbox
+    ok, encoded = cv2.imencode(".png", image[y:y + h, x:x + w])
+    if not ok:
+        raise ValueError("No se pudo codificar el recorte")
+    return encoded.tobytes()
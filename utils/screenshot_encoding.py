@@ -0,0 +1,68 @@
+import allure
+import cv2
+import numpy as np
+from utils.config import Config
+
+# Formato → (extensión, tipo de adjunto de Allure)
+FORMATS = {
+    "png": (".png", allure.attachment_type.PNG),
+    "jpeg": (".jpg", allure.attachment_type.JPG),
+    "webp": (".webp", None),  # Allure no define WEBP: se adjunta con mime image/webp
+}
+
+
+class ScreenshotEncoding:
+    """Codificación de los screenshots de evidencia (la de fallos se guarda siempre en PNG original)"""
+
+    def __init__(self, format=Config.SCREENSHOT_FORMAT, quality=Config.SCREENSHOT_QUALITY,
+                 scale=Config.SCREENSHOT_SCALE, grayscale=Config.SCREENSHOT_GRAYSCALE):
+        self.format = format
+        self.quality = quality
+        self.scale = scale
+        self.grayscale = grayscale
+
+    @property
+    def is_original(self):
+        """True si el PNG del navegador se guarda tal cual (sin decodificar)"""
+        return self.format == "png" and self.scale == 1 and not self.grayscale
+
+    @property
+    def extension(self):
+        return FORMATS[self.format][0]
+
+    def attach(self, data, name):
+        """Adjuntar a Allure con el tipo correspondiente al formato"""
+        attachment_type = FORMATS[self.format][1]
+        if attachment_type:
+            allure.attach(data, name=name, attachment_type=attachment_type)
+        else:
+            allure.attach(data, name=name, attachment_type=f"image/{self.format}", extension=self.format)
+
+    def encode(self, png):
+        """PNG del navegador → bytes en el formato, escala y color configurados"""
+        if self.is_original:
+            return png
+
+        flags = cv2.IMREAD_GRAYSCALE if self.grayscale else cv2.IMREAD_COLOR
+        image = cv2.imdecode(np.frombuffer(png, np.uint8), flags)
+        if image is None:
+            raise ValueError("PNG no válido")
+        if self.scale != 1:
+            image = cv2.resize(image, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+
+        params = {
+            "png": [cv2.IMWRITE_PNG_COMPRESSION, 6],
+            "jpeg": [cv2.IMWRITE_JPEG_QUALITY, self.quality, cv2.IMWRITE_JPEG_OPTIMIZE, 1],
+            "webp": [cv2.IMWRITE_WEBP_QUALITY, self.quality],
+        }[self.format]
+        ok, encoded = cv2.imencode(self.extension, image, params)
+        if not ok:
+            raise ValueError(f"No se pudo codificar el screenshot como {self.format}")
+        return encoded.tobytes()
+
+
+# Compartida por todos los ScreenshotManager (conftest la configura con --screenshot-*)
+screenshot_encoding = ScreenshotEncoding()
+
+# Evidencia de fallos: PNG del navegador sin recodificar
+original_png = ScreenshotEncoding(format="png", scale=1, grayscale=False)
@@ -1,35 +1,102 @@
 import os
+import queue
+import threading
 import allure
 from datetime import datetime
 from utils.config import Config
+from utils.evidence_policy import evidence_policy
+from utils.screenshot_dedupe import DUPLICATE, NEAR_DUPLICATE, crop_png
+from utils.screenshot_encoding import original_png, screenshot_encoding
 from utils.logger import logger
 
+class ScreenshotWriter:
+    """Escritura de PNG a disco en segundo plano con cola acotada (una por proceso/worker)"""
+
+    def __init__(self, max_pending=Config.SCREENSHOT_QUEUE_SIZE):
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def submit(self, filepath, data):
+        """Encolar la escritura; si la cola está llena bloquea hasta que haya sitio (backpressure)"""
+        self._ensure_thread()
+        self.queue.put((filepath, data))
+
+    def flush(self):
+        """Esperar a que se escriban todos los screenshots encolados"""
+        if self.thread is not None:
+            self.queue.join()
+
+    def _ensure_thread(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+                self.thread.start()
+
+    def _run(self):
+        while True:
+            filepath, data = self.queue.get()
+            try:
+                with open(filepath, 'wb') as f:
+                    f.write(data)
+            except Exception as e:
+                logger.error(f"❌ Error guardando screenshot {filepath}: {e}")
+            finally:
+                self.queue.task_done()
+
+
+# Compartido por todos los ScreenshotManager (conftest lo vacía al terminar cada test)
+screenshot_writer = ScreenshotWriter()
+
+
 class ScreenshotManager:
     """Gestor de screenshots automáticos"""
     
-    def __init__(self, driver):
+    def __init__(self, driver, writer=screenshot_writer, policy=evidence_policy, encoding=screenshot_encoding):
         self.driver = driver
+        self.writer = writer
+        self.policy = policy
+        self.encoding = encoding
         os.makedirs(Config.SCREENSHOT_DIR, exist_ok=True)
     
+    def take_screenshot(self, screenshot_name, kind="step"):
+        """Tomar screenshot si el nivel de evidencia incluye `kind` (failure, step, detail).
+        
+        Si no lo incluye devuelve None sin tocar el navegador ni crear el step de Allure.
+        """
+        if not self.policy.allows(kind):
+            return None
+        return self._capture(screenshot_name, kind)
+    
     @allure.step("Tomar screenshot: {screenshot_name}")
-    def take_screenshot(self, screenshot_name):
-        """Tomar screenshot y adjuntar a Allure"""
+    def _capture(self, screenshot_name, kind="step"):
+        """Tomar screenshot en memoria, adjuntarlo a Allure y guardarlo en segundo plano.
+        
+        El adjunto se hace en el hilo del test (Allure lo asocia al step en curso); el PNG
+        de screenshots/ puede no existir aún al volver: ver ScreenshotWriter.flush().
+        Los iguales a la referencia del test solo se enlazan y los casi iguales se guardan
+        recortados (ver ScreenshotHistory); la evidencia de fallos siempre va completa y en
+        el PNG original, el resto con la codificación de --screenshot-format.
+        """
         try:
+            encoding = original_png if kind == "failure" else self.encoding
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{screenshot_name}_{timestamp}.png"
+            filename = f"{screenshot_name}_{timestamp}{encoding.extension}"
             filepath = os.path.join(Config.SCREENSHOT_DIR, filename)
             
-            # Tomar screenshot
-            self.driver.save_screenshot(filepath)
+            # Tomar screenshot sin pasar por disco
+            data = self.driver.get_screenshot_as_png()
+            
+            if kind != "failure":
+                deduped = self._dedupe(screenshot_name, filename, data)
+                if deduped:
+                    return deduped
             
-            # Adjuntar a Allure
-            with open(filepath, 'rb') as f:
-                allure.attach(
-                    f.read(),
-                    name=screenshot_name,
-                    attachment_type=allure.attachment_type.PNG
-                )
+            # Recodificar una vez: el mismo contenido va a Allure y a disco
+            data = encoding.encode(data)
+            encoding.attach(data, screenshot_name)
             
+            self.writer.submit(filepath, data)
             logger.info(f"📸 Screenshot tomado: {filename}")
             return filepath
             
@@ -37,12 +104,41 @@ class ScreenshotManager:
             logger.error(f"❌ Error tomando screenshot: {e}")
             return None
     
+    def _dedupe(self, screenshot_name, filename, data):
+        """Ruta guardada si el screenshot es (casi) igual a la referencia; None para guardarlo completo"""
+        history = getattr(self.driver, "screenshot_history", None)
+        if history is None:
+            return None
+        try:
+            result, reference, bbox = history.classify(filename, data)
+        except Exception as e:
+            logger.debug(f"Deduplicación de screenshot no disponible: {e}")
+            return None
+        
+        if result == DUPLICATE:
+            allure.attach(f"Sin cambios respecto a {reference}", name=screenshot_name,
+                          attachment_type=allure.attachment_type.TEXT)
+            logger.info(f"📸 Screenshot omitido (igual a {reference}): {screenshot_name}")
+            return os.path.join(Config.SCREENSHOT_DIR, reference)
+        
+        if result == NEAR_DUPLICATE:
+            x, y, w, h = bbox
+            crop_name = f"{os.path.splitext(filename)[0]}_diff_{x}_{y}_{w}x{h}{self.encoding.extension}"
+            crop = self.encoding.encode(crop_png(data, bbox))
+            self.encoding.attach(crop, f"{screenshot_name} (región {x},{y} {w}x{h} sobre {reference})")
+            crop_path = os.path.join(Config.SCREENSHOT_DIR, crop_name)
+            self.writer.submit(crop_path, crop)
+            logger.info(f"📸 Screenshot recortado (cambio sobre {reference}): {crop_name}")
+            return crop_path
+        
+        return None
+    
     def take_screenshot_on_failure(self, test_name):
         """Tomar screenshot cuando un test falla"""
         screenshot_name = f"FAILURE_{test_name}"
-        return self.take_screenshot(screenshot_name)
+        return self.take_screenshot(screenshot_name, kind="failure")
     
     def take_screenshot_on_success(self, test_name):
         """Tomar screenshot cuando un test pasa"""
         screenshot_name = f"SUCCESS_{test_name}"
-        return self.take_screenshot(screenshot_name)
\ No newline at end of file
+        return self.take_screenshot(screenshot_name)
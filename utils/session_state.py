@@ -0,0 +1,197 @@
+import json
+import os
+import time
+from urllib.parse import urlsplit
+from selenium.common.exceptions import WebDriverException
+from utils.config import Config
+from utils.file_lock import FileLock
+from utils.logger import logger
+
+class SessionStateCache:
+    """Caché del estado de login (cookies + localStorage/sessionStorage) compartido entre workers"""
+
+    # Vuelca el storage del origen actual
+    DUMP_STORAGE_SCRIPT = """
+        function dump(storage) {
+            var data = {};
+            for (var i = 0; i < storage.length; i++) {
+                var key = storage.key(i);
+                data[key] = storage.getItem(key);
+            }
+            return data;
+        }
+        return {localStorage: dump(window.localStorage), sessionStorage: dump(window.sessionStorage)};
+    """
+
+    # Restaura el storage una sola vez por pestaña, antes de que corran los scripts de la app
+    RESTORE_STORAGE_SCRIPT = """
+        (function(state) {
+            if (location.origin !== state.origin || sessionStorage.getItem('__state_restored')) { return; }
+            Object.keys(state.localStorage).forEach(function(k) { localStorage.setItem(k, state.localStorage[k]); });
+            Object.keys(state.sessionStorage).forEach(function(k) { sessionStorage.setItem(k, state.sessionStorage[k]); });
+            sessionStorage.setItem('__state_restored', '1');
+        })(%s);
+    """
+
+    def __init__(self, state_dir=Config.SESSION_STATE_DIR, ttl=Config.SESSION_STATE_TTL):
+        self.state_dir = state_dir
+        self.ttl = ttl
+        self.logins = 0
+        self.restores = 0
+
+    def ensure_logged_in(self, driver, url, username, login, is_logged_in):
+        """Dejar la sesión autenticada en `url`, restaurando el estado guardado o haciendo login.
+
+        login() hace el login por UI (el driver ya está en `url`) y devuelve True cuando
+        la sesión quedó autenticada (cookies ya emitidas).
+        is_logged_in(driver) confirma con el servidor la sesión restaurada (p. ej. un
+        elemento que solo se renderiza autenticado): las cookies recién inyectadas siempre
+        están presentes, así que no sirven para saber si el sitio las acepta.
+        """
+        path = self._state_path(url, username)
+
+        # Restaurar y sondear sin lock: los workers solo se serializan cuando hay que hacer login
+        tried = self._load(path)
+        if tried and self._try_restore(driver, url, username, tried, is_logged_in):
+            return True
+
+        # Un solo worker hace el login; el resto espera y reutiliza su estado.
+        # FileLock renueva el lock mientras dura el login, así que no caduca aunque sea lento.
+        with FileLock(f"{path}.lock", timeout=Config.SESSION_LOGIN_TIMEOUT):
+            state = self._load(path)
+            if state and tried and state["saved_at"] == tried["saved_at"]:
+                # Nadie lo renovó mientras esperábamos: es el estado que el sitio ya rechazó
+                self.invalidate(url, username)
+            elif state and self._try_restore(driver, url, username, state, is_logged_in):
+                return True
+
+            driver.get(url)
+            if not login():
+                return False
+            self.logins += 1
+            self.save(driver, url, username)
+            return True
+
+    def save(self, driver, url, username):
+        """Serializar cookies y storage de la sesión actual"""
+        cookies = driver.get_cookies()
+        storage = driver.execute_script(self.DUMP_STORAGE_SCRIPT)
+
+        # Expira con la primera cookie persistente que venza, o por TTL
+        now = time.time()
+        expiries = [c["expiry"] for c in cookies if c.get("expiry") and c["expiry"] > now]
+        state = {
+            "origin": self._origin(url),
+            "username": username,
+            "saved_at": now,
+            "expires_at": min(expiries + [now + self.ttl]),
+            "cookies": cookies,
+            "localStorage": storage["localStorage"],
+            "sessionStorage": storage["sessionStorage"],
+        }
+
+        path = self._state_path(url, username)
+        os.makedirs(self.state_dir, exist_ok=True)
+        # Se lee sin lock: escribir aparte y reemplazar de forma atómica
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, path)
+        logger.info(f"🔑 Estado de login guardado: {len(cookies)} cookies, "
+                    f"{len(state['localStorage'])} claves localStorage")
+        return state
+
+    def invalidate(self, url, username):
+        """Descartar el estado guardado (fuerza un nuevo login)"""
+        try:
+            os.remove(self._state_path(url, username))
+        except FileNotFoundError:
+            pass
+
+    # ==================== RESTAURACIÓN ====================
+
+    def _try_restore(self, driver, url, username, state, is_logged_in):
+        """Restaurar `state` y confirmar con el servidor; si lo rechaza deja el navegador limpio"""
+        if not self._restore(driver, url, state):
+            return False
+        if is_logged_in(driver):
+            self.restores += 1
+            logger.info(f"🔑 Sesión de {username} restaurada desde caché "
+                        f"(expira en {state['expires_at'] - time.time():.0f}s)")
+            return True
+        logger.info(f"🔑 Estado de login de {username} rechazado por el sitio, repitiendo login")
+        self._clear(driver)
+        return False
+
+    def _restore(self, driver, url, state):
+        """Inyectar cookies y storage y navegar a `url`"""
+        try:
+            if hasattr(driver, "execute_cdp_cmd"):
+                # Chromium: todo se inyecta antes de la primera navegación
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd("Network.setCookies", {
+                    "cookies": [self._cdp_cookie(c, state["origin"]) for c in state["cookies"]]
+                })
+                script = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                    "source": self._storage_script(state)
+                })
+                driver.get(url)
+                driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument",
+                                       {"identifier": script["identifier"]})
+            else:
+                # Firefox: las cookies solo se pueden agregar estando en el dominio
+                driver.get(url)
+                for cookie in state["cookies"]:
+                    driver.add_cookie({k: v for k, v in cookie.items() if k != "sameSite" or v})
+                driver.execute_script(self._storage_script(state))
+                driver.refresh()
+            return True
+
+        except WebDriverException as e:
+            logger.warning(f"⚠️  No se pudo restaurar el estado de login: {e}")
+            return False
+
+    def _storage_script(self, state):
+        storage = {k: state[k] for k in ("origin", "localStorage", "sessionStorage")}
+        return self.RESTORE_STORAGE_SCRIPT % json.dumps(storage)
+
+    def _clear(self, driver):
+        try:
+            driver.delete_all_cookies()
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except WebDriverException:
+            pass
+
+    @staticmethod
+    def _cdp_cookie(cookie, origin):
+        cdp = {k: cookie[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly")
+               if k in cookie}
+        if cookie.get("expiry"):
+            cdp["expires"] = cookie["expiry"]
+        if cookie.get("sameSite"):
+            cdp["sameSite"] = cookie["sameSite"]
+        if "domain" not in cdp:
+            cdp["url"] = origin
+        return cdp
+
+    # ==================== PERSISTENCIA ====================
+
+    def _load(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if state.get("expires_at", 0) <= time.time() + 60:
+            logger.info("🔑 Estado de login expirado, se hará login de nuevo")
+            return None
+        return state
+
+    def _state_path(self, url, username):
+        host = urlsplit(url).netloc.replace(":", "_")
+        return os.path.join(self.state_dir, f"{host}_{username}.json")
+
+    @staticmethod
+    def _origin(url):
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
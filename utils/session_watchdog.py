@@ -0,0 +1,195 @@
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from selenium.common.exceptions import WebDriverException
+from utils.config import Config
+from utils.logger import logger
+
+class SessionHungError(WebDriverException):
+    """La sesión del navegador dejó de responder y el watchdog la terminó"""
+
+class SessionWatchdog:
+    """Vigila una sesión WebDriver por un canal lateral y mata sus procesos si se cuelga"""
+
+    def __init__(self, driver, interval=Config.WATCHDOG_INTERVAL,
+                 hang_after=Config.WATCHDOG_HANG_AFTER):
+        self.driver = driver
+        self.interval = interval
+        # Debe superar el comando legítimo más largo (page load timeout)
+        self.hang_after = hang_after
+        self.tripped = None
+        self._stop = threading.Event()
+        self._thread = None
+
+        server_url = getattr(driver.command_executor, "_url", "").rstrip("/")
+        self.status_url = f"{server_url}/status"
+        self.probe_url = f"{server_url}/session/{driver.session_id}/window"
+
+    def start(self):
+        """Iniciar la vigilancia en un hilo daemon"""
+        self._thread = threading.Thread(target=self._run, name="session-watchdog", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Detener la vigilancia (no toca la sesión)"""
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            process = driver_process(self.driver)
+            if process is not None and process.poll() is not None:
+                self._trip(f"el proceso del driver terminó (exit code {process.returncode})")
+                return
+
+            # Sonda barata contra la sesión; el driver la encola detrás del comando en curso
+            start = time.time()
+            try:
+                urllib.request.urlopen(self.probe_url, timeout=self.hang_after).read()
+            except urllib.error.HTTPError:
+                # El driver respondió (aunque sea con error): la sesión no está colgada
+                pass
+            except (urllib.error.URLError, OSError) as e:
+                if self._stop.is_set():
+                    return
+                driver_alive = self._driver_responds()
+                where = "navegador/renderer" if driver_alive else "driver"
+                self._trip(f"{where} sin respuesta durante {time.time() - start:.0f}s ({e})")
+                return
+
+    def _driver_responds(self):
+        try:
+            urllib.request.urlopen(self.status_url, timeout=5).read()
+            return True
+        except (urllib.error.URLError, OSError):
+            return False
+
+    def _trip(self, reason):
+        self.tripped = f"Sesión {self.driver.session_id} colgada: {reason}"
+        logger.error(f"🐕 Watchdog: {self.tripped}. Terminando árbol de procesos.")
+        process = driver_process(self.driver)
+        if process is not None:
+            kill_process_tree(process.pid)
+
+# ==================== PROCESOS DEL DRIVER ====================
+
+def driver_process(driver):
+    """Popen del binario del driver (chromedriver/geckodriver/msedgedriver), si existe"""
+    service = getattr(driver, "service", None)
+    return getattr(service, "process", None)
+
+def register_driver_process(driver):
+    """Anotar el pid del driver junto al pid del worker que lo lanzó (y su identidad)"""
+    process = driver_process(driver)
+    if process is None:
+        return
+    os.makedirs(Config.DRIVER_PID_DIR, exist_ok=True)
+    with open(_pid_file(process.pid), "w", encoding="utf-8") as f:
+        f.write(process_identity(process.pid) or "")
+
+def unregister_driver_process(driver):
+    """Borrar la anotación del driver al cerrarlo (quit normal o descarte del pool)"""
+    process = driver_process(driver)
+    if process is None:
+        return
+    try:
+        os.remove(_pid_file(process.pid))
+    except OSError:
+        pass
+
+def _pid_file(driver_pid):
+    return os.path.join(Config.DRIVER_PID_DIR, f"{os.getpid()}_{driver_pid}")
+
+def reap_orphaned_drivers():
+    """Matar drivers cuyo worker de xdist ya no existe (p.ej. worker caído)"""
+    if not os.path.isdir(Config.DRIVER_PID_DIR):
+        return 0
+
+    reaped = 0
+    for entry in os.listdir(Config.DRIVER_PID_DIR):
+        path = os.path.join(Config.DRIVER_PID_DIR, entry)
+        try:
+            owner_pid, driver_pid = (int(part) for part in entry.split("_"))
+            with open(path, encoding="utf-8") as f:
+                identity = f.read()
+        except (ValueError, OSError):
+            continue
+        if pid_alive(owner_pid):
+            continue
+        # El pid puede haberse reutilizado: solo se mata si sigue siendo el mismo proceso
+        if identity and process_identity(driver_pid) == identity:
+            kill_process_tree(driver_pid)
+            reaped += 1
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    if reaped:
+        logger.warning(f"🧹 {reaped} driver(s) huérfano(s) terminados")
+    return reaped
+
+def process_identity(pid):
+    """Instante de arranque y ejecutable de un proceso (None si no existe)"""
+    try:
+        if sys.platform == "win32":
+            output = subprocess.run(["tasklist", "/FI", f"PID eq {pid}", "/FO", "CSV", "/NH"],
+                                    capture_output=True, text=True, timeout=5).stdout
+            fields = output.strip().split('","')
+            return fields[0].strip('"') if len(fields) > 1 and fields[1] == str(pid) else None
+        output = subprocess.run(["ps", "-p", str(pid), "-o", "lstart=", "-o", "comm="],
+                                capture_output=True, text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.strip() or None
+
+def pid_alive(pid):
+    """True si el proceso existe"""
+    if sys.platform == "win32":
+        output = subprocess.run(["tasklist", "/FI", f"PID eq {pid}", "/NH"],
+                                capture_output=True, text=True).stdout
+        return str(pid) in output
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def kill_process_tree(pid):
+    """Matar un proceso y todos sus descendientes (navegador, renderers, etc.)"""
+    if sys.platform == "win32":
+        subprocess.run(["taskkill", "/PID", str(pid), "/T", "/F"], capture_output=True)
+        return
+
+    for target in [pid] + _descendants(pid):
+        try:
+            os.kill(target, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+def _descendants(pid):
+    try:
+        output = subprocess.run(["ps", "-A", "-o", "pid=", "-o", "ppid="],
+                                capture_output=True, text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return []
+
+    children = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) == 2:
+            children.setdefault(int(parts[1]), []).append(int(parts[0]))
+
+    found, stack = [], [pid]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child)
+    return found
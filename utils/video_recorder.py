@@ -1,80 +1,365 @@
+import base64
+import collections
 import cv2
-import pyautogui
 import numpy as np
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import trio
 from datetime import datetime
 import os
 import logging
+from utils.config import Config
 
 logger = logging.getLogger(__name__)
 
 class VideoRecorder:
-    """Grabador de video para evidencias"""
-    
-    def __init__(self, fps=15):
+    """Grabador de video para evidencias con frames del propio navegador.
+
+    Chromium/Edge envían los frames por DevTools (Page.startScreencast) en una conexión
+    propia; el resto de navegadores con screenshots periódicos. Solo se conservan los frames
+    que cambian respecto al anterior (diff de una miniatura en gris) con su instante y cada
+    uno dura hasta el siguiente para mantener el tiempo real:
+    - con ffmpeg en el PATH (VIDEO_VFR) cada frame se guarda una vez con su duración y
+      ffmpeg genera un MP4 de frame rate variable: una pantalla estática no se recodifica
+    - sin ffmpeg, cv2.VideoWriter a fps constantes repite el frame en cada tick
+
+    Modos (--video):
+    - always: se codifica todo el test mientras se ejecuta
+    - on-failure: solo se guardan en memoria los JPEG de los últimos VIDEO_BUFFER_SECONDS
+      y se codifican al detener la grabación si el test falló
+    - off: no se graba
+    """
+
+    MODES = ["off", "on-failure", "always"]
+
+    def __init__(self, driver=None, fps=Config.VIDEO_FPS, mode=Config.VIDEO_MODE,
+                 buffer_seconds=Config.VIDEO_BUFFER_SECONDS, vfr=Config.VIDEO_VFR):
+        self.driver = driver
         self.fps = fps
+        self.mode = mode
+        self.buffer_seconds = buffer_seconds
+        # Como mucho un frame por tick de `fps` (ver _buffer)
+        self.buffer = collections.deque(maxlen=int(buffer_seconds * fps) + 1)
         self.recording = False
         self.writer = None
         self.filename = None
-        
-    def start_recording(self, test_name):
-        """Iniciar grabación de pantalla"""
+        self.frames = queue.Queue(maxsize=Config.VIDEO_QUEUE_SIZE)
+        self.signature = None
+        self.frames_skipped = 0
+        self.frame_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        # El encoder no terminó a tiempo: deja de escribir (y cierra el writer al salir)
+        self.abort_event = threading.Event()
+        self.threads = []
+        self.frames_written = 0
+        self.size = None
+        self.stopped_at = None
+        self.vfr = vfr and shutil.which("ffmpeg") is not None
+        # Modo vfr: (JPEG, tick en que termina) de cada frame, en un directorio temporal
+        self.stills = []
+        self.stills_dir = None
+
+    def start_recording(self, test_name, driver=None):
+        """Iniciar grabación del navegador"""
+        if self.mode == "off":
+            return
         try:
-            # Crear directorio si no existe
-            os.makedirs("videos", exist_ok=True)
-            
-            # Obtener tamaño de pantalla
-            screen_size = pyautogui.size()
-            
-            # Configurar codec
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            self.driver = driver or self.driver
+            os.makedirs(Config.VIDEO_DIR, exist_ok=True)
+
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.filename = f"videos/{test_name}_{timestamp}.mp4"
-            
-            # Crear VideoWriter
-            self.writer = cv2.VideoWriter(
-                self.filename, 
-                fourcc, 
-                self.fps, 
-                screen_size
-            )
-            
+            self.filename = os.path.join(Config.VIDEO_DIR, f"{test_name}_{timestamp}.mp4")
+            self.frames = queue.Queue(maxsize=Config.VIDEO_QUEUE_SIZE)
+            self.signature = None
+            self.frames_written = 0
+            self.frames_skipped = 0
+            self.writer = None
+            self.stills = []
+            self.stills_dir = None
+            self.buffer.clear()
+            self.stop_event.clear()
+            self.abort_event.clear()
+
+            source = self._screencast if hasattr(self.driver, "execute_cdp_cmd") else self._poll_screenshots
+            self.threads = [threading.Thread(target=source, name="video-capture", daemon=True)]
+            if self.mode == "always":
+                self.threads.append(threading.Thread(target=self._encode, name="video-encoder", daemon=True))
+            for thread in self.threads:
+                thread.start()
+
             self.recording = True
             logger.info(f"🎥 Grabación iniciada: {self.filename}")
-            
+
         except Exception as e:
             logger.error(f"❌ Error iniciando grabación: {e}")
-    
+
     def capture_frame(self):
-        """Capturar un frame"""
-        if self.recording and self.writer:
+        """Capturar un frame ahora (screenshot desde el hilo que llama)"""
+        if self.recording:
             try:
-                # Capturar screenshot
-                screenshot = pyautogui.screenshot()
-                
-                # Convertir a array numpy
-                frame = np.array(screenshot)
-                
-                # Convertir RGB a BGR (OpenCV usa BGR)
-                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                
-                # Escribir frame
-                self.writer.write(frame)
-                
+                self._push(self.driver.get_screenshot_as_png())
             except Exception as e:
                 logger.error(f"❌ Error capturando frame: {e}")
-    
-    def stop_recording(self):
-        """Detener grabación"""
-        if self.recording and self.writer:
-            try:
-                self.recording = False
+
+    def stop_recording(self, keep=True):
+        """Detener grabación; devuelve la ruta del MP4 o None si no hay video.
+
+        En modo on-failure el buffer solo se codifica con keep=True (test fallido).
+        """
+        if not self.recording:
+            return None
+
+        self.recording = False
+        self.stopped_at = time.monotonic()
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout=10)
+
+        if any(thread.is_alive() for thread in self.threads if thread.name == "video-encoder"):
+            # Liberar el writer desde aquí haría que el encoder lo reabriera y truncara el MP4
+            self.abort_event.set()
+            logger.warning("⚠️  El encoder de video no terminó a tiempo: no se adjunta video")
+            return None
+
+        try:
+            if self.mode == "on-failure":
+                if not keep:
+                    self.buffer.clear()
+                    return None
+                self._encode_buffer()
+            if self.writer:
                 self.writer.release()
-                cv2.destroyAllWindows()
-                
-                logger.info(f"🎥 Grabación detenida: {self.filename}")
-                return self.filename
-                
+                self.writer = None
+            if self.stills:
+                self._mux()
+        except Exception as e:
+            logger.error(f"❌ Error deteniendo grabación: {e}")
+            self.frames_written = 0
+        finally:
+            if self.stills_dir:
+                shutil.rmtree(self.stills_dir, ignore_errors=True)
+                self.stills_dir = None
+
+        if not self.frames_written:
+            logger.warning("⚠️  Grabación sin frames: no se adjunta video")
+            return None
+
+        logger.info(f"🎥 Grabación detenida: {self.filename} ({self.frames_written} frames, "
+                    f"{self.frames_skipped} capturas sin cambios descartadas)")
+        return self.filename
+
+    # ==================== CAPTURA ====================
+
+    def _push(self, data, is_jpeg=False):
+        """Conservar el frame recibido (JPEG/PNG) con su instante si cambia respecto al anterior"""
+        now = time.monotonic()
+        if not self._changed(data):
+            self.frames_skipped += 1
+            return
+        if self.mode == "on-failure":
+            self._buffer(now, data if is_jpeg else self._to_jpeg(data))
+        else:
+            self.frames.put((now, data))
+
+    def _changed(self, data):
+        """Diff de una miniatura en gris con la del último frame conservado (VIDEO_CHANGE_THRESHOLD)"""
+        if not Config.VIDEO_CHANGE_THRESHOLD:
+            return True
+        # Los JPEG se decodifican ya reducidos (escalado en la DCT): mucho más barato que completo
+        image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_REDUCED_GRAYSCALE_4)
+        if image is None:
+            return True
+        height = max(1, round(Config.VIDEO_CHANGE_GRID * image.shape[0] / image.shape[1]))
+        signature = cv2.resize(image, (Config.VIDEO_CHANGE_GRID, height),
+                               interpolation=cv2.INTER_AREA).astype(np.int16)
+        if (self.signature is not None and self.signature.shape == signature.shape
+                and np.abs(signature - self.signature).max() <= Config.VIDEO_CHANGE_THRESHOLD):
+            return False
+        self.signature = signature
+        return True
+
+    def _buffer(self, now, jpeg):
+        """Añadir al buffer circular: un frame por tick de `fps` y solo los últimos buffer_seconds"""
+        with self.frame_lock:
+            if self.buffer and now - self.buffer[-1][0] < 1 / self.fps:
+                # Mismo tick: basta el estado más reciente
+                self.buffer[-1] = (self.buffer[-1][0], jpeg)
+            else:
+                self.buffer.append((now, jpeg))
+            # Se conserva el frame visible al inicio de la ventana aunque sea más antiguo
+            while len(self.buffer) > 1 and now - self.buffer[1][0] >= self.buffer_seconds:
+                self.buffer.popleft()
+
+    def _to_jpeg(self, png):
+        image = cv2.imdecode(np.frombuffer(png, np.uint8), cv2.IMREAD_COLOR)
+        if image is None:
+            raise ValueError("Frame no válido")
+        ok, encoded = cv2.imencode(".jpg", self._fit(image), [cv2.IMWRITE_JPEG_QUALITY, Config.VIDEO_QUALITY])
+        return encoded.tobytes()
+
+    def _screencast(self):
+        """Frames por DevTools; si el screencast no está disponible, screenshots periódicos"""
+        try:
+            trio.run(self._screencast_session)
+        except Exception as e:
+            if not self.stop_event.is_set():
+                logger.debug(f"Screencast no disponible ({e}); grabando con screenshots")
+                self._poll_screenshots()
+
+    async def _screencast_session(self):
+        async with self.driver.bidi_connection() as connection:
+            session, devtools = connection.session, connection.devtools
+            frames = session.listen(devtools.page.ScreencastFrame)
+            await session.execute(devtools.page.start_screencast(
+                format_="jpeg", quality=Config.VIDEO_QUALITY,
+                max_width=Config.VIDEO_MAX_WIDTH, max_height=Config.VIDEO_MAX_HEIGHT
+            ))
+            try:
+                while not self.stop_event.is_set():
+                    with trio.move_on_after(0.2):
+                        event = await frames.receive()
+                        self._push(base64.b64decode(event.data), is_jpeg=True)
+                        # Sin ack el navegador deja de enviar frames
+                        await session.execute(devtools.page.screencast_frame_ack(event.session_id))
+            finally:
+                with trio.move_on_after(1) as cleanup:
+                    cleanup.shield = True
+                    await session.execute(devtools.page.stop_screencast())
+
+    def _poll_screenshots(self):
+        """Screenshots cada VIDEO_SCREENSHOT_INTERVAL (comparten la sesión de WebDriver con el test)"""
+        while not self.stop_event.is_set():
+            try:
+                self._push(self.driver.get_screenshot_as_png())
             except Exception as e:
-                logger.error(f"❌ Error deteniendo grabación: {e}")
-        
-        return None
\ No newline at end of file
+                logger.debug(f"Frame omitido: {e}")
+            self.stop_event.wait(Config.VIDEO_SCREENSHOT_INTERVAL)
+
+    # ==================== CODIFICACIÓN ====================
+
+    def _encode(self):
+        """Codificar cada frame conservado al llegar el siguiente (o al parar), ocupando su duración real"""
+        start, image = None, None
+        while True:
+            if self.abort_event.is_set():
+                break
+            try:
+                moment, data = self.frames.get(timeout=0.5)
+            except queue.Empty:
+                if self.stop_event.is_set():
+                    break
+                continue
+            decoded = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+            if decoded is None:
+                continue
+            start = start or moment
+            self._hold(image, start, moment)
+            image = self._fit(decoded)
+
+        if image is not None:
+            self._hold(image, start, self.stopped_at + 1 / self.fps)
+        # El writer es de este hilo: cerrarlo aquí evita que stop_recording lo libere a mitad de escritura
+        if self.writer:
+            self.writer.release()
+            self.writer = None
+        if self.abort_event.is_set() and self.stills_dir:
+            shutil.rmtree(self.stills_dir, ignore_errors=True)
+
+    def _encode_buffer(self):
+        """Codificar el buffer circular (últimos buffer_seconds hasta la parada)"""
+        with self.frame_lock:
+            frames = list(self.buffer)
+            self.buffer.clear()
+        if not frames:
+            return
+
+        start = max(frames[0][0], self.stopped_at - self.buffer_seconds)
+        image = None
+        for moment, data in frames:
+            decoded = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+            if decoded is None:
+                continue
+            self._hold(image, start, max(moment, start))
+            image = self._fit(decoded)
+        if image is not None:
+            self._hold(image, start, self.stopped_at + 1 / self.fps)
+
+    def _hold(self, image, start, until):
+        """Repetir `image` hasta el tick de `until`: el video dura lo mismo que la grabación"""
+        # round(): (110.6 - 108.5) * 10 da 20.999... y truncar perdería un frame
+        ticks = int(round((until - start) * self.fps, 6))
+        if self.vfr:
+            # Una sola imagen que dura hasta `ticks` (ffmpeg la mantiene en pantalla)
+            if image is not None and self.frames_written < ticks and self._still(image, ticks):
+                self.frames_written = ticks
+            return
+        while image is not None and self.frames_written < ticks:
+            if not self._write(image):
+                return
+
+    def _fit(self, image):
+        """Reducir a VIDEO_MAX_WIDTH x VIDEO_MAX_HEIGHT (dimensiones pares para el códec)"""
+        height, width = image.shape[:2]
+        scale = min(1, Config.VIDEO_MAX_WIDTH / width, Config.VIDEO_MAX_HEIGHT / height)
+        size = (int(width * scale) // 2 * 2, int(height * scale) // 2 * 2)
+        if size != (width, height):
+            image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+        return image
+
+    def _still(self, image, ticks):
+        if self.abort_event.is_set():
+            return False
+        try:
+            if self.stills_dir is None:
+                self.stills_dir = tempfile.mkdtemp(prefix="video_")
+                self.size = image.shape[1::-1]
+            if image.shape[1::-1] != self.size:
+                image = cv2.resize(image, self.size, interpolation=cv2.INTER_AREA)
+            path = os.path.join(self.stills_dir, f"{len(self.stills):06d}.jpg")
+            cv2.imwrite(path, image, [cv2.IMWRITE_JPEG_QUALITY, 95])
+            self.stills.append((path, ticks))
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error guardando frame: {e}")
+            return False
+
+    def _mux(self):
+        """MP4 de frame rate variable con ffmpeg (demuxer concat con la duración de cada frame)"""
+        lines, previous = [], 0
+        for path, ticks in self.stills:
+            lines += [f"file '{path}'", f"duration {(ticks - previous) / self.fps:.6f}"]
+            previous = ticks
+        # concat ignora la duración del último archivo si no se repite al final
+        lines.append(f"file '{self.stills[-1][0]}'")
+        list_path = os.path.join(self.stills_dir, "frames.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+        subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "concat", "-safe", "0",
+                        "-i", list_path, "-vsync", "vfr", "-c:v", "mpeg4", "-q:v", "5",
+                        "-pix_fmt", "yuv420p", self.filename],
+                       capture_output=True, timeout=120, check=True)
+        logger.debug(f"Video VFR: {len(self.stills)} frames distintos para {self.frames_written} ticks")
+
+    def _write(self, image):
+        if self.abort_event.is_set():
+            return False
+        try:
+            if self.writer is None:
+                height, width = image.shape[:2]
+                fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+                self.writer = cv2.VideoWriter(self.filename, fourcc, self.fps, (width, height))
+                self.size = (width, height)
+            if image.shape[1::-1] != self.size:
+                # Cambio de tamaño de ventana a mitad del test
+                image = cv2.resize(image, self.size, interpolation=cv2.INTER_AREA)
+            self.writer.write(image)
+            self.frames_written += 1
+            return True
+        except Exception as e:
+            logger.error(f"❌ Error escribiendo frame: {e}")
+            return False
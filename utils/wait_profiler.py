@@ -0,0 +1,367 @@
+import functools
+import importlib
+import inspect
+import json
+import os
+import pkgutil
+import sys
+import threading
+import time
+import allure
+import allure_commons
+from selenium.webdriver.support.wait import WebDriverWait
+from utils.config import Config
+from utils.logger import logger
+
+class WaitProfiler:
+    """Contabiliza sleeps y esperas explícitas de pages/* y action_chains_helper por allure.step
+
+    Los sleeps hechos dentro de una espera contabilizada (sondeo de WebDriverWait, de
+    wait_for_first/probe o de una condición) forman parte de esa espera, no son sobra aparte.
+    """
+
+    # Módulos instrumentados (su `time.sleep` pasa por el profiler)
+    MODULES = ["utils.action_chains_helper"]
+    PACKAGES = ["pages"]
+
+    # Capas genéricas: el sitio que se reporta es el método de página que las llamó
+    GENERIC_FILES = ("base_page.py", "action_chains_helper.py")
+
+    # Bucles de sondeo de BasePage con time.sleep entre intentos: devuelven el elemento
+    # (o (localizador, elemento)) y None si se agota el timeout
+    POLLING_WAITS = ["wait_for_first", "probe"]
+
+    # Esperas de BasePage que devuelven True al quedar ociosa la red/la app (tipo de evento)
+    IDLE_WAITS = {"wait_for_network_idle": "network_idle", "wait_for_app_idle": "app_idle"}
+
+    def __init__(self, output_dir=None, top=10):
+        self.output_dir = output_dir or os.path.join(Config.REPORT_DIR, "waits")
+        self.top = top
+        self.enabled = False
+        self.test_name = None
+        self.events = []
+        self.session_sites = {}
+        self._steps = []
+        self._local = threading.local()
+        # (objeto, atributo, valor original) de cada parche, para uninstall
+        self._patches = []
+
+    # ==================== INSTALACIÓN ====================
+
+    def install(self):
+        """Instrumentar time.sleep de las páginas, WebDriverWait, las esperas de BasePage y los steps"""
+        if self.enabled:
+            return
+        self.enabled = True
+
+        proxy = _TimeProxy(self)
+        for module in self._instrumented_modules():
+            if getattr(module, "time", None) is time:
+                self._patch(module, "time", proxy)
+
+        profiler = self
+        original_until = WebDriverWait.until
+        original_until_not = WebDriverWait.until_not
+
+        def until(wait, method, message=""):
+            return profiler._timed_wait("wait", original_until, wait, method, message)
+
+        def until_not(wait, method, message=""):
+            return profiler._timed_wait("wait_not", original_until_not, wait, method, message)
+
+        self._patch(WebDriverWait, "until", until)
+        self._patch(WebDriverWait, "until_not", until_not)
+
+        from pages.base_page import BasePage
+        original_settled = BasePage.wait_for_dom_settled
+
+        def wait_for_dom_settled(page, timeout=2, quiet_ms=Config.DOM_QUIET_MS, root=None):
+            return profiler._timed_settle(original_settled, page, timeout, quiet_ms, root)
+
+        self._patch(BasePage, "wait_for_dom_settled", wait_for_dom_settled)
+
+        for name in self.POLLING_WAITS:
+            self._patch(BasePage, name, self._polling_wait(getattr(BasePage, name)))
+        for name, kind in self.IDLE_WAITS.items():
+            self._patch(BasePage, name, self._idle_wait(kind, getattr(BasePage, name)))
+        allure_commons.plugin_manager.register(_StepTracker(self), "wait_profiler_steps")
+        logger.info("⏱️  Perfilado de esperas activo")
+
+    def uninstall(self):
+        """Deshacer la instrumentación (time de las páginas, WebDriverWait, BasePage y steps)"""
+        if not self.enabled:
+            return
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+        self._patches = []
+        allure_commons.plugin_manager.unregister(name="wait_profiler_steps")
+        self.enabled = False
+
+    def _patch(self, owner, name, replacement):
+        self._patches.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, replacement)
+
+    def _instrumented_modules(self):
+        names = list(self.MODULES)
+        for package_name in self.PACKAGES:
+            package = importlib.import_module(package_name)
+            names += [f"{package_name}.{m.name}" for m in pkgutil.iter_modules(package.__path__)]
+
+        modules = []
+        for name in names:
+            try:
+                modules.append(importlib.import_module(name))
+            except Exception as e:
+                logger.debug(f"No se pudo instrumentar {name}: {e}")
+        return modules
+
+    # ==================== CICLO POR TEST ====================
+
+    def start_test(self, test_name):
+        self.test_name = test_name
+        self.events = []
+        self._steps = []
+
+    def finish_test(self):
+        """Guardar el JSON del test, adjuntarlo a Allure y devolver el resumen"""
+        if not self.enabled or self.test_name is None:
+            return None
+
+        summary = self.summary()
+        os.makedirs(self.output_dir, exist_ok=True)
+        safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in self.test_name)
+        path = os.path.join(self.output_dir, f"{safe_name}.json")
+        body = json.dumps(summary, indent=2, ensure_ascii=False)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(body)
+        allure.attach(body, name="Perfil de esperas", attachment_type=allure.attachment_type.JSON)
+
+        for data in summary["top_call_sites"]:
+            total = self.session_sites.setdefault(data["site"], {"count": 0, "idle": 0.0, "excess": 0.0})
+            total["count"] += data["count"]
+            total["idle"] += data["idle"]
+            total["excess"] += data["excess"]
+
+        logger.info(f"⏱️  Esperas: {summary['total_idle']}s ociosos, {summary['total_needed']}s "
+                    f"necesarios ({summary['total_excess']}s de sobra) → {path}")
+        self.test_name = None
+        return summary
+
+    def summary(self):
+        """Totales del test: por tipo, por step y sitios de llamada con más espera de sobra"""
+        def bucket():
+            return {"count": 0, "idle": 0.0, "needed": 0.0, "excess": 0.0}
+
+        def add(target, event):
+            target["count"] += 1
+            target["idle"] += event["idle"]
+            target["needed"] += event["needed"]
+            target["excess"] += event["idle"] - event["needed"]
+
+        totals, by_kind, by_step, by_site = bucket(), {}, {}, {}
+        for event in self.events:
+            add(totals, event)
+            add(by_kind.setdefault(event["kind"], bucket()), event)
+            add(by_step.setdefault(event["step"] or "(fuera de steps)", bucket()), event)
+            site = by_site.setdefault(event["site"], bucket())
+            add(site, event)
+            site["kind"] = event["kind"]
+
+        def rounded(data):
+            return {k: round(v, 3) if isinstance(v, float) else v for k, v in data.items()}
+
+        top_sites = sorted(by_site.items(), key=lambda item: item[1]["excess"], reverse=True)
+        return {
+            "test": self.test_name,
+            "total_idle": round(totals["idle"], 3),
+            "total_needed": round(totals["needed"], 3),
+            "total_excess": round(totals["excess"], 3),
+            "by_kind": {k: rounded(v) for k, v in by_kind.items()},
+            "by_step": {k: rounded(v) for k, v in by_step.items()},
+            "top_call_sites": [dict(site=site, **rounded(data)) for site, data in top_sites[:self.top]],
+        }
+
+    def log_session_summary(self):
+        """Sitios de llamada con más espera de sobra en todo el worker"""
+        worst = sorted(self.session_sites.items(), key=lambda item: item[1]["excess"], reverse=True)
+        for site, data in worst[:self.top]:
+            logger.info(f"⏱️  {site}: {data['excess']:.1f}s de sobra en {data['count']} esperas")
+
+    # ==================== REGISTRO ====================
+
+    def record(self, kind, idle, needed, site):
+        if self.test_name is None:
+            return
+        self.events.append({
+            "kind": kind,
+            "idle": idle,
+            "needed": min(needed, idle),
+            "site": site,
+            "step": " › ".join(title for _, title in self._steps) or None,
+        })
+
+    def sleep(self, seconds):
+        """time.sleep instrumentado: todo el tiempo cuenta como ocioso (nada se estaba esperando)"""
+        site = self._call_site()
+        time.sleep(seconds)
+        if site and not self._nested():
+            self.record("sleep", seconds, 0.0, site)
+
+    def _timed_wait(self, kind, original, wait, method, message):
+        if self._nested():
+            return original(wait, method, message)
+
+        site = self._call_site()
+        polls = []
+
+        def timed_method(driver):
+            poll_start = time.time()
+            result = method(driver)
+            polls.append((poll_start, time.time()))
+            return result
+
+        start = time.time()
+        self._local.depth = 1
+        try:
+            result = original(wait, timed_method, message)
+            # La condición se cumplió en algún momento del último sondeo
+            needed = polls[-1][1] - start if polls else 0.0
+            return result
+        except Exception:
+            needed = 0.0
+            raise
+        finally:
+            self._local.depth = 0
+            if site:
+                self.record(kind, time.time() - start, needed, site)
+
+    def _timed_settle(self, original, page, timeout, quiet_ms, root):
+        if self._nested():
+            return original(page, timeout, quiet_ms, root)
+
+        site = self._call_site()
+        start = time.time()
+        self._local.depth = 1
+        try:
+            settled = original(page, timeout, quiet_ms, root)
+        finally:
+            self._local.depth = 0
+        elapsed = time.time() - start
+        if site:
+            # Asentado: el último cambio ocurrió quiet_ms antes de responder
+            needed = max(elapsed - quiet_ms / 1000, 0.0) if settled else 0.0
+            self.record("dom_settled", elapsed, needed, site)
+        return settled
+
+    def _polling_wait(self, original):
+        profiler = self
+
+        @functools.wraps(original)
+        def polling_wait(page, *args, **kwargs):
+            return profiler._timed_poll(original, page, *args, **kwargs)
+
+        return polling_wait
+
+    def _timed_poll(self, original, page, *args, **kwargs):
+        if self._nested():
+            return original(page, *args, **kwargs)
+
+        site = self._call_site()
+        start = time.time()
+        self._local.depth = 1
+        try:
+            result = original(page, *args, **kwargs)
+        finally:
+            self._local.depth = 0
+        elapsed = time.time() - start
+        if site:
+            # Encontrado: el último sondeo fue el que lo vio y se devolvió enseguida
+            element = result[1] if isinstance(result, tuple) else result
+            self.record("poll", elapsed, elapsed if element is not None else 0.0, site)
+        return result
+
+    def _idle_wait(self, kind, original):
+        profiler = self
+
+        @functools.wraps(original)
+        def idle_wait(page, *args, **kwargs):
+            return profiler._timed_idle(kind, original, page, *args, **kwargs)
+
+        return idle_wait
+
+    def _timed_idle(self, kind, original, page, *args, **kwargs):
+        if self._nested():
+            return original(page, *args, **kwargs)
+
+        site = self._call_site()
+        start = time.time()
+        self._local.depth = 1
+        try:
+            idle = original(page, *args, **kwargs)
+        finally:
+            self._local.depth = 0
+        elapsed = time.time() - start
+        if site:
+            # Ociosa: hizo falta esperar hasta que empezó la ventana de silencio
+            arguments = inspect.signature(original).bind(page, *args, **kwargs)
+            arguments.apply_defaults()
+            quiet = arguments.arguments.get("idle_ms", Config.DOM_QUIET_MS) / 1000
+            self.record(kind, elapsed, max(elapsed - quiet, 0.0) if idle else 0.0, site)
+        return idle
+
+    def _nested(self):
+        return getattr(self._local, "depth", 0) > 0
+
+    def _call_site(self):
+        """Primer frame de pages/* o action_chains_helper, saltando las capas genéricas"""
+        frame = sys._getframe(2)
+        innermost = None
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            relative = os.path.relpath(filename, Config.BASE_DIR)
+            if relative.startswith("pages" + os.sep) or relative.endswith("action_chains_helper.py"):
+                site = f"{relative}:{frame.f_lineno} {frame.f_code.co_name}"
+                if not relative.endswith(self.GENERIC_FILES):
+                    return site
+                innermost = innermost or site
+            frame = frame.f_back
+        return innermost
+
+    # ==================== STEPS ====================
+
+    def step_started(self, uuid, title):
+        self._steps.append((uuid, title))
+
+    def step_stopped(self, uuid):
+        for i in range(len(self._steps) - 1, -1, -1):
+            if self._steps[i][0] == uuid:
+                del self._steps[i:]
+                return
+
+
+class _TimeProxy:
+    """Módulo `time` para las páginas: delega todo salvo sleep"""
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def sleep(self, seconds):
+        self._profiler.sleep(seconds)
+
+    def __getattr__(self, name):
+        return getattr(time, name)
+
+
+class _StepTracker:
+    """Plugin de allure_commons que sigue el allure.step en curso"""
+
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    @allure_commons.hookimpl
+    def start_step(self, uuid, title, params):
+        self.profiler.step_started(uuid, title)
+
+    @allure_commons.hookimpl
+    def stop_step(self, uuid, exc_type, exc_val, exc_tb):
+        self.profiler.step_stopped(uuid)